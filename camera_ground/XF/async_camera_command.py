@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+File   : async_camera_command.py
+Author : FantasyWilly   
+Email  : bc697522h04@gmail.com  
+SPDX-License-Identifier: Apache-2.0
+
+開發公司:
+    • 先飛科技 (XF)
+
+功能總覽:
+    • 根據 [廠家手冊] 編寫 控制命令 (asyncio 版, 對應 camera_command)
+    • 指令函式由 command_registry 的指令表產生 (固定指令 直接發送預先組好的封包)
+    • 依名稱 / 指令代碼 發送 [dispatch]
+    • 一連串指令 1 次寫出 [send_batch] (例如 回中 → 停止放大縮小 → 拍照)
+
+遵循:
+    • Google Python Style Guide (含區段標題)
+    • PEP 8 (行寬 ≤ 88, snake_case, 2 空行區段分隔)
+"""
+
+# ------------------------------------------------------------------------------------ #
+# Imports
+# ------------------------------------------------------------------------------------ #
+# 標準庫
+from typing import Callable, Dict, List, Optional, Union
+
+# 專案內部模組
+from async_gcu_controller import AsyncGCUController
+from camera_decoder import GcuTelemetry
+from command_registry import (
+    COMMAND_SPECS, batch_failed, lookup, make_async_command, prepare_batch,
+)
+from gcu_logging import get_logger
+
+
+_log = get_logger('async_camera_command')
+
+# 名稱 → 指令函式 (由 command_registry.COMMAND_SPECS 產生)
+COMMAND_FUNCTIONS: Dict[str, Callable] = {
+    spec.name: make_async_command(spec, _log) for spec in COMMAND_SPECS
+}
+
+
+# ------------------------------------------------------------------------------------ #
+# 無特別指令 (command = 0x00)
+# ------------------------------------------------------------------------------------ #
+# -------------------------------- (empty) 空命令 ------------------------------------- #
+empty = COMMAND_FUNCTIONS['empty']
+
+# -------------------------- (control_gimbal) 控制雲台角度 ----------------------------- #
+control_gimbal = COMMAND_FUNCTIONS['control_gimbal']
+
+
+# ------------------------------------------------------------------------------------ #
+# 有特別指令 (command = 0x01, 0x02...)
+# ------------------------------------------------------------------------------------ #
+# ------------------------------ (calibration) 校準 ----------------------------------- #
+calibration = COMMAND_FUNCTIONS['calibration']
+
+# --------------------------------- (reset) 回中 -------------------------------------- #
+reset = COMMAND_FUNCTIONS['reset']
+
+# --------------------------------- (lock) 鎖定 --------------------------------------- #
+lock = COMMAND_FUNCTIONS['lock']
+
+# -------------------------------- (follow) 跟隨 -------------------------------------- #
+follow = COMMAND_FUNCTIONS['follow']
+
+# --------------------------------- (down) 向下 --------------------------------------- #
+down = COMMAND_FUNCTIONS['down']
+
+# ----------------------------- (track) 跟蹤模式 - [開 & 關] --------------------------- #
+track_in  = COMMAND_FUNCTIONS['track_in']
+track_out = COMMAND_FUNCTIONS['track_out']
+
+# ------------------------------ (point_control) 指點平移 ----------------------------- #
+point_controll = COMMAND_FUNCTIONS['point_controll']
+
+# --------------------------------- (photo) 拍照 ------------------------------------- #
+photo = COMMAND_FUNCTIONS['photo']
+
+# --------------------------------- (video) 錄影 -------------------------------------- #
+video = COMMAND_FUNCTIONS['video']
+
+# ------------------------------- (zoom_in) 連續放大 ---------------------------------- #
+zoom_in = COMMAND_FUNCTIONS['zoom_in']
+
+# ------------------------------ (zoom_out) 連續縮小 ---------------------------------- #
+zoom_out = COMMAND_FUNCTIONS['zoom_out']
+
+# ----------------------------- (zoom_stop) 停止放大縮小 ------------------------------- #
+zoom_stop = COMMAND_FUNCTIONS['zoom_stop']
+
+# --------------------------------- (focus) 聚焦 -------------------------------------- #
+focus = COMMAND_FUNCTIONS['focus']
+
+# ------------------------------ (OSD) OSD畫面 - [開 & 關] ---------------------------- #
+osd_on  = COMMAND_FUNCTIONS['osd_on']
+osd_off = COMMAND_FUNCTIONS['osd_off']
+
+# ----------------------------- (Laser) 雷射測距 - [開 & 關] --------------------------- #
+laser_on  = COMMAND_FUNCTIONS['laser_on']
+laser_off = COMMAND_FUNCTIONS['laser_off']
+
+
+# ------------------------------------------------------------------------------------ #
+# 依名稱 / 指令代碼 發送
+# ------------------------------------------------------------------------------------ #
+async def dispatch(
+    controller: AsyncGCUController,
+    key: Union[str, int],
+    *args,
+    parameters: bytes = None,
+    **kwargs,
+) -> None:
+    """
+    - 說明 [dispatch] 依名稱 ('photo') 或 指令代碼 (0x20) 發送指令
+        • 同代碼有多個指令時 以 parameters & 參數個數區分 (見 command_registry.lookup)
+
+    args:
+        • controller (AsyncGCUController)    - 已連線的 GCU 控制器
+        • key (str | int)       - 指令名稱 或 指令代碼
+        • *args, **kwargs       - 指令參數 (pitch, yaw / x0, y0, x1, y1)
+        • parameters (bytes)    - 控制參數 (依指令代碼查詢時 用來區分, default: None)
+    """
+    spec = lookup(key, parameters, len(args) + len(kwargs))
+    await COMMAND_FUNCTIONS[spec.name](controller, *args, **kwargs)
+
+
+# ------------------------------------------------------------------------------------ #
+# 一連串指令 1 次寫出
+# ------------------------------------------------------------------------------------ #
+async def send_batch(
+    controller: AsyncGCUController, *commands
+) -> Optional[List[Optional[GcuTelemetry]]]:
+    """
+    - 說明 [send_batch] 一連串指令 1 次寫出, 依序取得每個指令的回覆
+        • send_batch(controller, 'reset', 'zoom_stop', 'photo')
+        • send_batch(controller, ('track_in', x0, y0, x1, y1), 0x20)
+
+    args:
+        • controller (AsyncGCUController)    - 已連線的 GCU 控制器
+        • *commands             - 名稱 / 指令代碼, 或 (名稱, *參數)
+
+    returns:
+        • results (list | None) - 每個指令的解碼結果, 發送失敗 → None
+    """
+    names, packets = prepare_batch(controller, commands, _log)
+    try:
+        return await controller.send_batch(packets)
+    except Exception as e:
+        batch_failed(_log, names, e)
+        return None
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+File   : async_gcu_controller.py
+Author : FantasyWilly
+Email  : bc697522h04@gmail.com
+SPDX-License-Identifier: Apache-2.0
+
+開發公司:
+    • 先飛科技 (XF)
+
+功能總覽:
+    • asyncio 版 GCUController (asyncio.open_connection)
+    • 發送控制命令 (可同時多個指令在途, 依序對應回覆)
+    • 非同步迭代 解碼後的雲台資訊
+
+遵循:
+    • Google Python Style Guide (含區段標題)
+    • PEP 8 (行寬 ≤ 88, snake_case, 2 空行區段分隔)
+"""
+
+# ------------------------------------------------------------------------------------ #
+# Imports
+# ------------------------------------------------------------------------------------ #
+# 標準庫
+import asyncio
+import collections
+import logging
+from typing import AsyncIterator, List, Optional, Sequence
+
+# 專案內部模組
+from camera_protocol import PREFIX_SIZE, build_packet, expects_reply
+from camera_decoder import GcuDecodeError, GcuTelemetry, decode_telemetry
+from gcu_logging import get_logger, log_event
+from gcu_stream import GcuFrameBuffer
+
+
+_log = get_logger('async_gcu_controller')
+
+
+# ------------------------------------------------------------------------------------ #
+# [AsyncGCUController] asyncio 版 連接 發送指令和接收響應
+# ------------------------------------------------------------------------------------ #
+class AsyncGCUController:
+    """
+    - 說明 [AsyncGCUController]
+        1. 接收 IP, Port 參數
+        2. 以 asyncio.open_connection 管理 TCP 連線
+        3. 發送 控制命令 (await 取得回覆), 同一連線可同時有多個指令在途
+        4. 接收 Task 依序對應回覆, 並將解碼結果推送給 [telemetry] 訂閱者
+
+    args:
+        • ip (str)          - 目標主機 IP
+        • port (int)        - 目標主機 Port
+        • width (int)       - 畫面像素 (寬)
+        • height (int)      - 畫面像素 (高)
+        • timeout (float)   - 連線 & 等待回覆 超時時間 (default: 5s)
+    """
+
+    def __init__(
+        self,
+        ip: str,
+        port: int,
+        width: int,
+        height: int,
+        timeout: float = 5.0,
+    ) -> None:
+
+        # 接收參數
+        self.ip      = ip
+        self.port    = port
+        self.width   = width
+        self.height  = height
+        self.timeout = timeout
+
+        # 連線物件
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._read_task: Optional[asyncio.Task] = None
+
+        # 返回封包重組
+        self._frame_buffer = GcuFrameBuffer()
+
+        # 依發送順序 等待回覆的 Future
+        self._pending: collections.deque = collections.deque()
+
+        # [telemetry] 訂閱者
+        self._subscribers: List[asyncio.Queue] = []
+
+        # 沒有對應指令的回覆數量
+        self.unsolicited_replies = 0
+
+    # ----------------------------------- 開啟 TCP連接 -------------------------------- #
+    async def connect(self) -> None:
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.ip, self.port), self.timeout
+        )
+        self._frame_buffer.clear()
+        self._read_task = asyncio.create_task(self._read_loop())
+        log_event(
+            _log, logging.INFO, 'connect', "已連接到 GCU: %s:%s", self.ip, self.port,
+            ip=self.ip, port=self.port,
+        )
+
+    # ----------------------------------- 關閉 TCP連接 -------------------------------- #
+    async def disconnect(self) -> None:
+        if self._read_task is not None:
+            self._read_task.cancel()
+            try:
+                await self._read_task
+            except asyncio.CancelledError:
+                pass
+            self._read_task = None
+
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except OSError:
+                pass
+            self._writer = None
+
+        self._close_waiters(ConnectionError("連接已關閉"))
+        log_event(
+            _log, logging.INFO, 'disconnect', "連接已關閉", ip=self.ip, port=self.port
+        )
+
+    async def __aenter__(self) -> "AsyncGCUController":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.disconnect()
+
+    # ----------------------------------- 發送 控制命令 -------------------------------- #
+    async def send_command(
+        self,
+        command: int,
+        parameters: bytes = b'',
+        enable_request: bool = None,
+        pitch: float = None, yaw: float = None,
+        x0: int = None, y0: int = None, x1: int = None, y1: int = None
+    ) -> bytes:
+
+        """
+        args:
+            • command (int)         - 16 進位
+            • parameters (bytes)    - 16 進位
+            • enable_request (bool) - 是否須返回 GCU 數據格式   (default: True)
+            • pitch, yaw (float)    - 控制台角度               (default: None)
+            • x0, y0, x1, y1 (int)  - 框選方框四角點            (default: None)
+
+        returns:
+            • response (bytes)      - 返回 GCU 數據格式
+        """
+
+        packet = build_packet(
+            command,
+            parameters,
+            enable_request,
+            pitch=pitch, yaw=yaw,
+            x0=x0, y0=y0, x1=x1, y1=y1,
+            width=self.width, height=self.height
+        )
+        response = await self._exchange(packet)
+        self._decode_response(response, command)
+        return response
+
+    # ----------------------------------- 發送 預先組好的封包 ---------------------------- #
+    async def send_packet(self, packet: bytes) -> bytes:
+        """
+        - 說明 [send_packet] 發送已組好的完整封包 (例如 command_registry.PREBUILT_PACKETS)
+        """
+        response = await self._exchange(packet)
+        self._decode_response(response, packet[PREFIX_SIZE])
+        return response
+
+    # ----------------------------------- 發送 多個封包 (1 次寫出) ------------------------ #
+    async def send_batch(self, packets: Sequence[bytes]) -> List[Optional[GcuTelemetry]]:
+        """
+        - 說明 [send_batch] 多個指令 1 次寫出 (writelines), 依序取得每個指令的回覆
+
+        returns:
+            • results (list)    - 每個指令的解碼結果 (GcuTelemetry, 解碼失敗 → None)
+        """
+        packets = list(packets)
+        if not packets:
+            return []
+        if self._writer is None or self._read_task is None or self._read_task.done():
+            raise ConnectionError("尚未連接到 GCU")
+
+        # 登記等待者 與 寫入 之間沒有 await, 順序必定一致 (不要求回覆的封包 不登記)
+        loop = asyncio.get_running_loop()
+        futures = [
+            loop.create_future() if expects_reply(packet) else None for packet in packets
+        ]
+        self._pending.extend(future for future in futures if future is not None)
+        self._writer.writelines(packets)
+        await self._writer.drain()
+
+        results = []
+        for packet, future in zip(packets, futures):
+            if future is None:
+                results.append(None)
+                continue
+            response = await asyncio.wait_for(future, self.timeout)
+            results.append(self._decode_response(response, packet[PREFIX_SIZE]))
+        return results
+
+    # ---------------------------------  不斷 發送空命令 ------------------------------- #
+    async def loop_send_command(
+        self,
+        command: int,
+        parameters: bytes = b'',
+        enable_request: bool = True,
+    ) -> bytes:
+        return await self.send_command(command, parameters, enable_request)
+
+    # ----------------------------------- 訂閱 雲台資訊 -------------------------------- #
+    async def telemetry(self, maxsize: int = 64) -> AsyncIterator[GcuTelemetry]:
+        """
+        - 說明 [telemetry] 非同步迭代 每一筆解碼成功的回覆
+            • 消費太慢時 丟棄最舊的一筆 (不阻塞接收 Task)
+            • 連線關閉後 迭代結束
+
+        args:
+            • maxsize (int) - 佇列長度 (default: 64)
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self._subscribers.append(queue)
+        try:
+            while True:
+                telemetry = await queue.get()
+                if telemetry is None:
+                    return
+                yield telemetry
+        finally:
+            if queue in self._subscribers:
+                self._subscribers.remove(queue)
+
+    # ------------------------------------------------------------------------------------ #
+    # 內部流程
+    # ------------------------------------------------------------------------------------ #
+    # ---------------------------------- 發送 & 等待回覆 ------------------------------- #
+    async def _exchange(self, packet: bytes) -> bytes:
+        if self._writer is None or self._read_task is None or self._read_task.done():
+            raise ConnectionError("尚未連接到 GCU")
+
+        # 不要求回覆的封包 GCU 不會回覆 → 不登記等待者
+        if not expects_reply(packet):
+            self._writer.write(packet)
+            await self._writer.drain()
+            return b''
+
+        # 登記等待者 與 寫入 之間沒有 await, 順序必定一致
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(future)
+        self._writer.write(packet)
+        await self._writer.drain()
+
+        # 逾時會取消 future, 但仍保留在佇列中以消耗之後到達的回覆
+        return await asyncio.wait_for(future, self.timeout)
+
+    # ---------------------------------- 接收 Task ----------------------------------- #
+    async def _read_loop(self) -> None:
+        frame_buffer = self._frame_buffer
+        try:
+            while True:
+                data = await self._reader.read(4096)
+                if not data:
+                    raise ConnectionError("GCU 已關閉連線")
+                for response in frame_buffer.parse(data):
+                    self._dispatch(response)
+        except (OSError, ConnectionError) as e:
+            log_event(
+                _log, logging.ERROR, 'reader_stopped',
+                "[AsyncGCUController] 接收中止: %s", e,
+            )
+            self._close_waiters(e)
+
+    def _dispatch(self, response: bytes) -> None:
+        # 1. 依發送順序 對應到最早的等待者
+        if self._pending:
+            future = self._pending.popleft()
+            if not future.done():
+                future.set_result(response)
+        else:
+            self.unsolicited_replies += 1
+
+        # 2. 推送給訂閱者
+        if not self._subscribers:
+            return
+        try:
+            telemetry = decode_telemetry(response)
+        except GcuDecodeError:
+            return
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(telemetry)
+
+    # ---------------------------------- 解碼本次指令回覆 ------------------------------- #
+    def _decode_response(self, response: bytes, command: int) -> Optional[GcuTelemetry]:
+        if not response:
+            return None
+        try:
+            return decode_telemetry(response)
+        except GcuDecodeError as e:
+            log_event(
+                _log, logging.WARNING, 'decode_error', "解碼失敗: %s", e, code=command
+            )
+            return None
+
+    def _close_waiters(self, error: BaseException) -> None:
+        while self._pending:
+            future = self._pending.popleft()
+            if not future.done():
+                future.set_exception(error)
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(None)
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+File   : benchmark.py
+Author : FantasyWilly
+Email  : bc697522h04@gmail.com
+SPDX-License-Identifier: Apache-2.0
+
+開發公司:
+    • 先飛科技 (XF)
+
+功能總覽:
+    • 編解碼效能: build_packet (camera_command 全部指令), calculate_crc,
+      decode_gcu_response, decode_telemetry
+    • 端到端效能: GCUController.send_command 對本機 GCU 模擬器的 吞吐量 & 延遲百分位
+    • 結果輸出為 JSON (方便比較不同版本)
+
+使用方式:
+    python3 benchmark.py --output bench.json
+
+遵循:
+    • Google Python Style Guide (含區段標題)
+    • PEP 8 (行寬 ≤ 88, snake_case, 2 空行區段分隔)
+"""
+
+# ------------------------------------------------------------------------------------ #
+# Imports
+# ------------------------------------------------------------------------------------ #
+# 標準庫
+import argparse
+import json
+import platform
+import sys
+import time
+from concurrent.futures import wait
+from typing import Callable, Dict, List
+
+# 專案內部模組
+from camera_protocol import build_packet, calculate_crc
+from camera_decoder import decode_gcu_response, decode_telemetry
+from command_registry import COMMAND_SPECS
+from gcu_controller import GCUController
+from gcu_simulator import GcuSimulator
+
+
+# ------------------------------------------------------------------------------------ #
+# 基準參數
+# ------------------------------------------------------------------------------------ #
+FRAME_WIDTH  = 1920
+FRAME_HEIGHT = 1080
+
+# camera_command 中 各指令的呼叫參數
+COMMAND_ARGS = {
+    'control_gimbal': {'pitch': 5.0, 'yaw': -5.0},
+    'track_in':       {'x0': 800, 'y0': 400, 'x1': 1120, 'y1': 680},
+    'track_out':      {'x0': 800, 'y0': 400, 'x1': 1120, 'y1': 680},
+    'point_controll': {'x0': 800, 'y0': 400, 'x1': 1120, 'y1': 680},
+}
+
+
+# ------------------------------------------------------------------------------------ #
+# 計時工具
+# ------------------------------------------------------------------------------------ #
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    count = len(ordered)
+
+    def pick(q: float) -> float:
+        return ordered[min(count - 1, int(q * count))]
+
+    return {
+        'count': count,
+        'mean':  sum(ordered) / count,
+        'p50':   pick(0.50),
+        'p90':   pick(0.90),
+        'p99':   pick(0.99),
+        'max':   ordered[-1],
+    }
+
+
+def time_call(func: Callable[[], object], iterations: int, repeat: int = 5) -> dict:
+    """
+    - 說明 [time_call] 重複 repeat 輪, 每輪呼叫 iterations 次, 取最快一輪
+
+    returns:
+        • result (dict) - 每次呼叫耗時 (ns) 與 每秒次數
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        best = min(best, time.perf_counter() - started)
+    return {
+        'iterations': iterations,
+        'ns_per_call': best / iterations * 1e9,
+        'calls_per_sec': iterations / best,
+    }
+
+
+# ------------------------------------------------------------------------------------ #
+# 收集 每個指令的 build_packet 參數
+# ------------------------------------------------------------------------------------ #
+def collect_command_kwargs() -> Dict[str, dict]:
+    # 每個指令的 build_packet 參數 (由 command_registry 的指令表產生)
+    return {
+        spec.name: dict(
+            command=spec.code,
+            parameters=spec.parameters,
+            enable_request=True,
+            **COMMAND_ARGS.get(spec.name, {}),
+        )
+        for spec in COMMAND_SPECS
+    }
+
+
+# ------------------------------------------------------------------------------------ #
+# 基準測試
+# ------------------------------------------------------------------------------------ #
+def bench_codec(iterations: int) -> dict:
+    results = {'build_packet': {}}
+
+    # 1. build_packet (camera_command 全部指令)
+    for name, kwargs in sorted(collect_command_kwargs().items()):
+        results['build_packet'][name] = time_call(
+            lambda kwargs=kwargs: build_packet(
+                width=FRAME_WIDTH, height=FRAME_HEIGHT, **kwargs
+            ),
+            iterations,
+        )
+
+    # 2. calculate_crc (控制封包長度 & 返回封包長度)
+    packet = build_packet(0x20, b'\x01', True)
+    reply = GcuSimulator().state.to_response()
+    results['calculate_crc'] = {
+        f'{len(packet) - 2}_bytes': time_call(
+            lambda: calculate_crc(packet[:-2]), iterations
+        ),
+        f'{len(reply) - 2}_bytes': time_call(
+            lambda: calculate_crc(reply[:-2]), iterations
+        ),
+    }
+
+    # 3. 解碼
+    results['decode_gcu_response'] = time_call(
+        lambda: decode_gcu_response(reply), iterations
+    )
+    results['decode_telemetry'] = time_call(
+        lambda: decode_telemetry(reply), iterations
+    )
+    return results
+
+
+def bench_round_trip(round_trips: int, window: int) -> dict:
+    simulator = GcuSimulator()
+    simulator.start_in_thread()
+    host, port = simulator.host, simulator.port
+
+    results = {}
+    try:
+        # 1. 非管線模式: 每個指令 1 次往返
+        controller = GCUController(host, port, FRAME_WIDTH, FRAME_HEIGHT)
+        controller.connect()
+        latencies = []
+        started = time.perf_counter()
+        for _ in range(round_trips):
+            sent = time.perf_counter()
+            controller.send_command(0x00, b'', True)
+            latencies.append(time.perf_counter() - sent)
+        elapsed = time.perf_counter() - started
+        controller.disconnect()
+
+        results['blocking'] = {
+            'commands_per_sec': round_trips / elapsed,
+            'latency_s': percentiles(latencies),
+        }
+
+        # 2. 管線模式: 同時 window 個指令在途
+        controller = GCUController(
+            host, port, FRAME_WIDTH, FRAME_HEIGHT, pipelined=True
+        )
+        controller.connect()
+        latencies = []
+        in_flight = set()
+        started = time.perf_counter()
+        for _ in range(round_trips):
+            if len(in_flight) >= window:
+                done, in_flight = wait(in_flight, return_when='FIRST_COMPLETED')
+            sent = time.perf_counter()
+            future = controller.submit_command(0x00, b'', True)
+            future.add_done_callback(
+                lambda _, sent=sent: latencies.append(time.perf_counter() - sent)
+            )
+            in_flight.add(future)
+        wait(in_flight)
+        elapsed = time.perf_counter() - started
+        controller.disconnect()
+
+        results['pipelined'] = {
+            'window': window,
+            'commands_per_sec': round_trips / elapsed,
+            'latency_s': percentiles(latencies),
+        }
+    finally:
+        simulator.stop_thread()
+    return results
+
+
+# ------------------------------------------------------------------------------------ #
+# 主程式
+# ------------------------------------------------------------------------------------ #
+def main() -> None:
+    parser = argparse.ArgumentParser(description="GCU 協議 編解碼 & 往返 效能測試")
+    parser.add_argument('--output', default='-', help="JSON 輸出路徑 (default: stdout)")
+    parser.add_argument('--iterations', type=int, default=20000)
+    parser.add_argument('--round-trips', type=int, default=2000)
+    parser.add_argument('--window', type=int, default=8)
+    args = parser.parse_args()
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': sys.version.split()[0],
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+        },
+        'codec': bench_codec(args.iterations),
+        'round_trip': bench_round_trip(args.round_trips, args.window),
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output == '-':
+        print(text)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+        print(f"結果已寫入: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+File   : camera_batch_decoder.py
+Author : FantasyWilly
+Email  : bc697522h04@gmail.com
+SPDX-License-Identifier: Apache-2.0
+
+開發公司:
+    • 先飛科技 (XF)
+
+功能總覽:
+    • 大量 GCU 返回封包 (0x8A 0x5E) 一次解碼成 NumPy 陣列 (離線分析用)
+    • 輸入: 固定間距的連續緩衝區 或 每個封包的起始位移
+    • 以 structured dtype 直接映射欄位, 向量化檢查 協議頭 & 長度 → 有效遮罩
+    • 直接解碼 gcu_capture 紀錄檔中的所有返回封包
+
+遵循:
+    • Google Python Style Guide (含區段標題)
+    • PEP 8 (行寬 ≤ 88, snake_case, 2 空行區段分隔)
+"""
+
+# ------------------------------------------------------------------------------------ #
+# Imports
+# ------------------------------------------------------------------------------------ #
+# 標準庫
+from typing import NamedTuple, Sequence
+
+# 第三方套件
+import numpy as np
+
+# 專案內部模組
+from camera_decoder import RESPONSE_MIN_LENGTH
+from camera_protocol import verify_crc
+from gcu_capture import RX, GcuCapture
+
+
+# ------------------------------------------------------------------------------------ #
+# 返回封包 structured dtype (欄位位置同 camera_decoder.TELEMETRY_STRUCT)
+# ------------------------------------------------------------------------------------ #
+_HEADER_VALUE = 0x5E8A
+
+_FIELDS = {
+    'names':   ['header', 'length', 'yaw', 'roll', 'pitch', 'targetdist', 'zoom'],
+    'formats': ['<u2',    '<u2',    '<i2', '<i2',  '<i2',   '<u4',        '<u2'],
+    'offsets': [0,        2,        16,    18,     20,      43,           59],
+}
+
+# 解碼需要的最少位元組 (zoom 結束於 byte 61)
+_FIELDS_SPAN = 61
+
+
+def frame_dtype(stride: int = RESPONSE_MIN_LENGTH) -> np.dtype:
+    """
+    - 說明 [frame_dtype] 回傳每筆長度為 stride 的返回封包 structured dtype
+    """
+    if stride < _FIELDS_SPAN:
+        raise ValueError(f"stride 不可小於 {_FIELDS_SPAN}")
+    return np.dtype(dict(_FIELDS, itemsize=stride))
+
+
+# ------------------------------------------------------------------------------------ #
+# [TelemetryBatch] 批次解碼結果
+# ------------------------------------------------------------------------------------ #
+class TelemetryBatch(NamedTuple):
+    """
+    - 說明 [TelemetryBatch] 每個欄位 1 個陣列 (長度 = 封包數), 無效封包的值不可信
+
+    args:
+        • rollangle (ndarray)   - roll  角度 (°, float64)
+        • pitchangle (ndarray)  - pitch 角度 (°, float64)
+        • yawangle (ndarray)    - yaw   角度 (°, float64)
+        • targetdist (ndarray)  - 目標測距   (m, float64)
+        • zoom (ndarray)        - 相機倍率   (float64)
+        • valid (ndarray)       - 協議頭 & 長度 (& CRC) 皆正確 (bool)
+    """
+    rollangle: np.ndarray
+    pitchangle: np.ndarray
+    yawangle: np.ndarray
+    targetdist: np.ndarray
+    zoom: np.ndarray
+    valid: np.ndarray
+
+
+def _to_batch(frames: np.ndarray, valid: np.ndarray) -> TelemetryBatch:
+    valid &= frames['header'] == _HEADER_VALUE
+    valid &= frames['length'] >= RESPONSE_MIN_LENGTH
+    return TelemetryBatch(
+        frames['roll']       * 0.01,
+        frames['pitch']      * 0.01,
+        frames['yaw']        * 0.01,
+        frames['targetdist'] * 0.1,
+        frames['zoom']       * 0.1,
+        valid,
+    )
+
+
+def _check_crc(buffer, offsets: np.ndarray, batch: TelemetryBatch) -> None:
+    # CRC 為逐位元組運算 無法向量化, 只檢查通過協議頭 & 長度的封包
+    view = memoryview(buffer)
+    valid = batch.valid
+    for i in np.flatnonzero(valid):
+        start = int(offsets[i])
+        length = int.from_bytes(view[start + 2:start + 4], 'little')
+        if start + length > len(view) or not verify_crc(view[start:start + length]):
+            valid[i] = False
+
+
+# ------------------------------------------------------------------------------------ #
+# 固定間距 連續緩衝區
+# ------------------------------------------------------------------------------------ #
+def decode_strided(
+    buffer,
+    stride: int = RESPONSE_MIN_LENGTH,
+    count: int = -1,
+    offset: int = 0,
+    check_crc: bool = False,
+) -> TelemetryBatch:
+    """
+    - 說明 [decode_strided] 緩衝區中 每 stride 個位元組 1 個返回封包
+        • 直接以 structured dtype 映射緩衝區 (不複製), 1 次換算所有欄位
+
+    args:
+        • buffer (bytes-like)   - bytes, bytearray, memoryview, mmap 皆可
+        • stride (int)          - 每筆封包間距 (default: 72)
+        • count (int)           - 封包數 (default: -1 → 緩衝區能容納的最多筆數)
+        • offset (int)          - 第 1 筆封包位置 (default: 0)
+        • check_crc (bool)      - 是否檢查 CRC (較慢, default: False)
+
+    returns:
+        • batch (TelemetryBatch)
+    """
+    if count < 0:
+        count = (len(buffer) - offset) // stride
+    frames = np.frombuffer(buffer, dtype=frame_dtype(stride), count=count, offset=offset)
+    batch = _to_batch(frames, np.ones(count, dtype=bool))
+    if check_crc:
+        _check_crc(buffer, offset + stride * np.arange(count), batch)
+    return batch
+
+
+# ------------------------------------------------------------------------------------ #
+# 任意位移
+# ------------------------------------------------------------------------------------ #
+def decode_offsets(
+    buffer,
+    offsets: Sequence[int],
+    check_crc: bool = False,
+) -> TelemetryBatch:
+    """
+    - 說明 [decode_offsets] 依每個封包的起始位移解碼 (封包長度可不同)
+        • 以 fancy indexing 一次取出所有封包的欄位區段, 再映射為 structured dtype
+        • 位移超出緩衝區的封包 → valid = False
+
+    args:
+        • buffer (bytes-like)       - bytes, bytearray, memoryview, mmap 皆可
+        • offsets (Sequence[int])   - 每個封包的起始位移
+        • check_crc (bool)          - 是否檢查 CRC (較慢, default: False)
+
+    returns:
+        • batch (TelemetryBatch)
+    """
+    raw = np.frombuffer(buffer, dtype=np.uint8)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    valid = (offsets >= 0) & (offsets + RESPONSE_MIN_LENGTH <= raw.size)
+
+    # 超出範圍的位移 改指向 0 (結果由 valid 遮罩排除)
+    safe = np.where(valid, offsets, 0)
+    if raw.size < _FIELDS_SPAN:
+        spans = np.zeros((offsets.size, _FIELDS_SPAN), dtype=np.uint8)
+    else:
+        spans = raw[safe[:, None] + np.arange(_FIELDS_SPAN)]
+    frames = spans.view(frame_dtype(_FIELDS_SPAN)).ravel()
+
+    batch = _to_batch(frames, valid)
+    if check_crc:
+        _check_crc(buffer, safe, batch)
+    return batch
+
+
+# ------------------------------------------------------------------------------------ #
+# gcu_capture 紀錄檔
+# ------------------------------------------------------------------------------------ #
+def decode_capture(
+    capture: GcuCapture,
+    start: float = None,
+    end: float = None,
+    check_crc: bool = False,
+):
+    """
+    - 說明 [decode_capture] 解碼紀錄檔中所有返回封包 (RX)
+
+    args:
+        • capture (GcuCapture)  - 已開啟的紀錄檔
+        • start, end (float)    - 相對於紀錄開始的秒數 (default: None → 不限)
+        • check_crc (bool)      - 是否檢查 CRC (較慢, default: False)
+
+    returns:
+        • timestamps (ndarray)  - 收到時間 (相對於紀錄開始的秒數)
+        • batch (TelemetryBatch)
+    """
+    timestamps = []
+    offsets = []
+    for timestamp, _, offset, _ in capture.offsets(start, end, RX):
+        timestamps.append(timestamp)
+        offsets.append(offset)
+
+    batch = decode_offsets(capture.buffer, offsets, check_crc)
+    return np.asarray(timestamps) - capture.start, batch
@@ -12,6 +12,9 @@ SPDX-License-Identifier: Apache-2.0
 
 功能總覽:
     • 根據 [廠家手冊] 編寫 控制命令
+    • 指令函式由 command_registry 的指令表產生 (固定指令 直接發送預先組好的封包)
+    • 依名稱 / 指令代碼 發送 [dispatch]
+    • 一連串指令 1 次寫出 [send_batch] (例如 回中 → 停止放大縮小 → 拍照)
 
 遵循:
     • Google Python Style Guide (含區段標題)
@@ -21,265 +24,133 @@ SPDX-License-Identifier: Apache-2.0
 # ------------------------------------------------------------------------------------ #
 # Imports
 # ------------------------------------------------------------------------------------ #
+# 標準庫
+from typing import Callable, Dict, List, Optional, Union
+
 # 專案內部模組
-from lib.gcu_controller import GCUController
+from gcu_controller import GCUController
+from camera_decoder import GcuTelemetry
+from command_registry import (
+    COMMAND_SPECS, batch_failed, lookup, make_command, prepare_batch,
+)
+from gcu_logging import get_logger
+
+
+_log = get_logger('camera_command')
+
+# 名稱 → 指令函式 (由 command_registry.COMMAND_SPECS 產生)
+COMMAND_FUNCTIONS: Dict[str, Callable] = {
+    spec.name: make_command(spec, _log) for spec in COMMAND_SPECS
+}
 
 
 # ------------------------------------------------------------------------------------ #
 # 無特別指令 (command = 0x00)
 # ------------------------------------------------------------------------------------ #
 # -------------------------------- (empty) 空命令 ------------------------------------- #
-def empty(controller: GCUController) -> None:
-    print("發送 [指令] : [empty] - 空指令")
-    try:
-        controller.send_command(
-            command=0x00,
-            parameters=b'',
-            enable_request=True
-        )
-    except Exception as e:
-        print("[empty] 發送指令時出現錯誤:", e)
+empty = COMMAND_FUNCTIONS['empty']
 
 # -------------------------- (control_gimbal) 控制雲台角度 ----------------------------- #
-def control_gimbal(controller: GCUController, pitch: float, yaw: float) -> None:
-    print(f"發送 [指令] : [control_gimbal] - 控制雲台, pitch: {pitch}°, yaw: {yaw}°")
-    try:
-        controller.send_command(
-            command=0x00,
-            parameters=b'',
-            enable_request=True,
-            pitch=pitch,                # 傳入俯仰角參數(單位：度)
-            yaw=yaw                     # 傳入偏航角參數(單位：度)
-        )
-    except Exception as e:
-        print("[control_gimbal] 發送指令時出現錯誤:", e)
+control_gimbal = COMMAND_FUNCTIONS['control_gimbal']
 
 
 # ------------------------------------------------------------------------------------ #
 # 有特別指令 (command = 0x01, 0x02...)
 # ------------------------------------------------------------------------------------ #
 # ------------------------------ (calibration) 校準 ----------------------------------- #
-def calibration(controller: GCUController) -> None:
-    print("發送 [指令] : [calibration] - 校準")
-    try:
-        controller.send_command(
-            command=0x01,
-            parameters=b'',
-            enable_request=True
-        )
-    except Exception as e:
-        print("[reset] 發送指令時出現錯誤:", e)
+calibration = COMMAND_FUNCTIONS['calibration']
 
 # --------------------------------- (reset) 回中 -------------------------------------- #
-def reset(controller: GCUController) -> None:
-    print("發送 [指令] : [reset] - 回中")
-    try:
-        controller.send_command(
-            command=0x03,
-            parameters=b'',
-            enable_request=True
-        )
-    except Exception as e:
-        print("[reset] 發送指令時出現錯誤:", e)
+reset = COMMAND_FUNCTIONS['reset']
 
 # --------------------------------- (lock) 鎖定 --------------------------------------- #
-def lock(controller: GCUController) -> None:
-    print("發送 [指令] : [lock] - 鎖定")
-    try:
-        controller.send_command(
-            command=0x11,
-            parameters=b'',
-            enable_request=True
-        )
-    except Exception as e:
-        print("[lock] 發送指令時出現錯誤:", e)
+lock = COMMAND_FUNCTIONS['lock']
 
 # -------------------------------- (follow) 跟隨 -------------------------------------- #
-def follow(controller: GCUController) -> None:
-    print("發送 [指令] : [follow] - 跟隨")
-    try:
-        controller.send_command(
-            command=0x12,
-            parameters=b'',
-            enable_request=True
-        )
-    except Exception as e:
-        print("[follow] 發送指令時出現錯誤:", e)
+follow = COMMAND_FUNCTIONS['follow']
 
 # --------------------------------- (down) 向下 --------------------------------------- #
-def down(controller: GCUController) -> None:
-    print("發送 [指令] : [down] - 向下")
-    try:
-        controller.send_command(
-            command=0x13,
-            parameters=b'',
-            enable_request=True
-        )
-    except Exception as e:
-        print("[down] 發送指令時出現錯誤:", e)
+down = COMMAND_FUNCTIONS['down']
 
 # ----------------------------- (track) 跟蹤模式 - [開 & 關] --------------------------- #
-def track_in(controller: GCUController, x0: int, y0: int, x1: int, y1: int) -> None:
-    print(f"[INFO] : [track_in] 進入跟蹤模式")
-    try:
-        controller.send_command(
-            command=0x17,
-            parameters=b'\x01\x01',
-            enable_request=True,
-            x0=x0,
-            y0=y0,
-            x1=x1,
-            y1=y1
-        )
-    except Exception as e:
-        print("[track_in] 發送指令時出現錯誤:", e)
-
-def track_out(controller: GCUController, x0: int, y0: int, x1: int, y1: int) -> None:
-    print(f"[INFO] : [track_out] 退出跟蹤模式")
-    try:
-        controller.send_command(
-            command=0x17,
-            parameters=b'\x01\x00',
-            enable_request=True,
-            x0=x0,
-            y0=y0,
-            x1=x1,
-            y1=y1
-        )
-    except Exception as e:
-        print("[track_out] 發送指令時出現錯誤:", e)
+track_in  = COMMAND_FUNCTIONS['track_in']
+track_out = COMMAND_FUNCTIONS['track_out']
 
 # ------------------------------ (point_control) 指點平移 ----------------------------- #
-def point_controll(controller: GCUController, x0: int, y0: int, x1: int, y1: int) -> None:
-    print(f"發送 [指令] : [point_control] - 控制畫面向")
-    try:
-        controller.send_command(
-            command=0x1A,
-            parameters=b'\x01',
-            enable_request=True,
-            x0=x0,
-            y0=y0,
-            x1=x1,
-            y1=y1
-        )
-    except Exception as e:
-        print("[track_in] 發送指令時出現錯誤:", e)
+point_controll = COMMAND_FUNCTIONS['point_controll']
 
 # --------------------------------- (photo) 拍照 ------------------------------------- #
-def photo(controller: GCUController) -> None:
-    print("發送 [指令] : [photo] - 拍照")
-    try:
-        controller.send_command(
-            command=0x20,
-            parameters=b'\x01',
-            enable_request=True
-        )
-    except Exception as e:
-        print("[photo] 發送指令時出現錯誤:", e)
+photo = COMMAND_FUNCTIONS['photo']
 
 # --------------------------------- (video) 錄影 -------------------------------------- #
-def video(controller: GCUController) -> None:
-    print("發送 [指令] : [video] - 錄影")
-    try:
-        controller.send_command(
-            command=0x21,
-            parameters=b'\x01',
-            enable_request=True
-        )
-    except Exception as e:
-        print("[video] 發送指令時出現錯誤:", e)
+video = COMMAND_FUNCTIONS['video']
 
 # ------------------------------- (zoom_in) 連續放大 ---------------------------------- #
-def zoom_in(controller: GCUController) -> None:
-    print("發送 [指令] : [zoom_in] - 連續放大")
-    try:
-        controller.send_command(
-            command=0x22,
-            parameters=b'\x01',
-            enable_request=True
-        )
-    except Exception as e:
-        print("[zoom_in] 發送指令時出現錯誤:", e)
-
+zoom_in = COMMAND_FUNCTIONS['zoom_in']
 
 # ------------------------------ (zoom_out) 連續縮小 ---------------------------------- #
-def zoom_out(controller: GCUController) -> None:
-    print("發送 [指令] : [zoom_out] - 連續縮小")
-    try:
-        controller.send_command(
-            command=0x23,
-            parameters=b'\x01',
-            enable_request=True
-        )
-    except Exception as e:
-        print("[zoom_out] 發送指令時出現錯誤:", e)
+zoom_out = COMMAND_FUNCTIONS['zoom_out']
 
 # ----------------------------- (zoom_stop) 停止放大縮小 ------------------------------- #
-def zoom_stop(controller: GCUController) -> None:
-    print("發送 [指令] : [zoom_stop] - 停止放大縮小")
-    try:
-        controller.send_command(
-            command=0x24,
-            parameters=b'\x01',
-            enable_request=True
-        )
-    except Exception as e:
-        print("[zoom_stop] 發送指令時出現錯誤:", e)
+zoom_stop = COMMAND_FUNCTIONS['zoom_stop']
 
 # --------------------------------- (focus) 聚焦 -------------------------------------- #
-def focus(controller: GCUController) -> None:
-    print("發送 [指令] : [focus] - 聚焦")
-    try:
-        controller.send_command(
-            command=0x26,
-            parameters=b'\x01',
-            enable_request=True
-        )
-    except Exception as e:
-        print("[focus] 發送指令時出現錯誤:", e)
+focus = COMMAND_FUNCTIONS['focus']
 
 # ------------------------------ (OSD) OSD畫面 - [開 & 關] ---------------------------- #
-def osd_on(controller: GCUController) -> None:
-    print("發送 [指令] : [OSD - On] - OSD開啟")
-    try:
-        controller.send_command(
-            command=0x73,
-            parameters=b'\x01',
-            enable_request=True
-        )
-    except Exception as e:
-        print("[focus] 發送指令時出現錯誤:", e)
-
-def osd_off(controller: GCUController) -> None:
-    print("發送 [指令] : [OSD - Off] - OSD關閉")
-    try:
-        controller.send_command(
-            command=0x73,
-            parameters=b'\x00',
-            enable_request=True
-        )
-    except Exception as e:
-        print("[focus] 發送指令時出現錯誤:", e)
+osd_on  = COMMAND_FUNCTIONS['osd_on']
+osd_off = COMMAND_FUNCTIONS['osd_off']
 
 # ----------------------------- (Laser) 雷射測距 - [開 & 關] --------------------------- #
-def laser_on(controller: GCUController) -> None:
-    print("發送 [指令] : [Laser - On] - 測距開啟")
-    try:
-        controller.send_command(
-            command=0x81,
-            parameters=b'\x02',
-            enable_request=True
-        )
-    except Exception as e:
-        print("[focus] 發送指令時出現錯誤:", e)
+laser_on  = COMMAND_FUNCTIONS['laser_on']
+laser_off = COMMAND_FUNCTIONS['laser_off']
 
-def laser_off(controller: GCUController) -> None:
-    print("發送 [指令] : [Laser - Off] - 測距關閉")
-    try:
-        controller.send_command(
-            command=0x81,
-            parameters=b'\x00',
-            enable_request=True
-        )
-    except Exception as e:
-        print("[focus] 發送指令時出現錯誤:", e)
\ No newline at end of file
+
+# ------------------------------------------------------------------------------------ #
+# 依名稱 / 指令代碼 發送
+# ------------------------------------------------------------------------------------ #
+def dispatch(
+    controller: GCUController,
+    key: Union[str, int],
+    *args,
+    parameters: bytes = None,
+    **kwargs,
+) -> None:
+    """
+    - 說明 [dispatch] 依名稱 ('photo') 或 指令代碼 (0x20) 發送指令
+        • 同代碼有多個指令時 以 parameters & 參數個數區分 (見 command_registry.lookup)
+
+    args:
+        • controller (GCUController)    - 已連線的 GCU 控制器
+        • key (str | int)       - 指令名稱 或 指令代碼
+        • *args, **kwargs       - 指令參數 (pitch, yaw / x0, y0, x1, y1)
+        • parameters (bytes)    - 控制參數 (依指令代碼查詢時 用來區分, default: None)
+    """
+    spec = lookup(key, parameters, len(args) + len(kwargs))
+    COMMAND_FUNCTIONS[spec.name](controller, *args, **kwargs)
+
+
+# ------------------------------------------------------------------------------------ #
+# 一連串指令 1 次寫出
+# ------------------------------------------------------------------------------------ #
+def send_batch(
+    controller: GCUController, *commands
+) -> Optional[List[Optional[GcuTelemetry]]]:
+    """
+    - 說明 [send_batch] 一連串指令 1 次寫出, 依序取得每個指令的回覆
+        • send_batch(controller, 'reset', 'zoom_stop', 'photo')
+        • send_batch(controller, ('track_in', x0, y0, x1, y1), 0x20)
+
+    args:
+        • controller (GCUController)    - 已連線的 GCU 控制器
+        • *commands             - 名稱 / 指令代碼, 或 (名稱, *參數)
+
+    returns:
+        • results (list | None) - 每個指令的解碼結果, 發送失敗 → None
+    """
+    names, packets = prepare_batch(controller, commands, _log)
+    try:
+        return controller.send_batch(packets)
+    except Exception as e:
+        batch_failed(_log, names, e)
+        return None
@@ -12,7 +12,7 @@ SPDX-License-Identifier: Apache-2.0
 
 功能總覽: 
     • 接收 資料
-    • 解碼 資料
+    • 解碼 資料 (預編譯 struct, 單次 unpack_from)
 
 遵循:
     • Google Python Style Guide (含區段標題)
@@ -24,86 +24,119 @@ SPDX-License-Identifier: Apache-2.0
 # ------------------------------------------------------------------------------------ #
 # 標準庫
 import struct
+from typing import NamedTuple
+
+
+# ------------------------------------------------------------------------------------ #
+# 返回封包 固定結構
+# ------------------------------------------------------------------------------------ #
+RESPONSE_HEADER     = b'\x8A\x5E'     # 返回協議頭
+RESPONSE_MIN_LENGTH = 72                # 最短可解析長度
+
+# 協議頭 以 little-endian U16 讀出後的值 (0x8A 0x5E → 0x5E8A)
+_HEADER_VALUE = 0x5E8A
+
+# 一次解出所有欄位 (little-endian, 無對齊):
+#   [0 ~ 1]   協議頭 (U16)
+#   [16 ~ 17] yaw    (S16, 相對)
+#   [18 ~ 19] roll   (S16, 絕對)
+#   [20 ~ 21] pitch  (S16, 絕對)
+#   [43 ~ 46] 目標測距 targetdist (U32)
+#   [59 ~ 60] 相機倍率 zoom (U16)
+TELEMETRY_STRUCT = struct.Struct('<H14xhhh21xI12xH')
+
+
+# ------------------------------------------------------------------------------------ #
+# 解碼錯誤
+# ------------------------------------------------------------------------------------ #
+class GcuDecodeError(ValueError):
+    """GCU 返回數據 解碼失敗"""
+
+
+class PacketLengthError(GcuDecodeError):
+    """封包長度不足, 無法解析"""
+
+
+class HeaderError(GcuDecodeError):
+    """協議頭錯誤 (非 0x8A 0x5E)"""
+
+
+# ------------------------------------------------------------------------------------ #
+# [GcuTelemetry] 解碼後的雲台資訊
+# ------------------------------------------------------------------------------------ #
+class GcuTelemetry(NamedTuple):
+    """
+    - 說明 [GcuTelemetry] 單筆 GCU 返回數據 (namedtuple, 無 __dict__)
+
+    args:
+        • rollangle (float)     - roll  角度 (°, 分辨率 0.01)
+        • pitchangle (float)    - pitch 角度 (°, 分辨率 0.01)
+        • yawangle (float)      - yaw   角度 (°, 分辨率 0.01)
+        • targetdist (float)    - 目標測距   (m, 分辨率 0.1)
+        • zoom (float)          - 相機倍率   (分辨率 0.1)
+    """
+    rollangle: float
+    pitchangle: float
+    yawangle: float
+    targetdist: float
+    zoom: float
+
+
+# ------------------------------- GCU 返回數據解碼 (零拷貝) ------------------------------ #
+def decode_telemetry(response: bytes, offset: int = 0) -> GcuTelemetry:
+    """
+    - 說明 [decode_telemetry] 解碼相機回傳數據
+        1. 直接在原始緩衝區上 unpack_from (bytes, bytearray, memoryview 皆可, 不切片)
+        2. 檢查 長度 & 協議頭
+        3. 單次解出 roll, pitch, yaw, targetdist, zoom
+
+    args:
+        • response (bytes)  - 包含返回封包的緩衝區
+        • offset (int)      - 封包在緩衝區中的起始位置 (default `0`)
+
+    returns:
+        • telemetry (GcuTelemetry) - 解析後的資訊
+
+    raises:
+        • PacketLengthError - 封包長度不足
+        • HeaderError       - 協議頭錯誤
+    """
+
+    # ---------------------------- 1. 檢查長度 & 協議頭 -------------------------------- #
+    if len(response) - offset < RESPONSE_MIN_LENGTH:
+        raise PacketLengthError('封包長度不足,無法解析')
+
+    header, yaw_raw, roll_raw, pitch_raw, targetdist_raw, zoom_raw = (
+        TELEMETRY_STRUCT.unpack_from(response, offset)
+    )
+    if header != _HEADER_VALUE:
+        raise HeaderError(f'協議頭錯誤: {header & 0xFF:02X}{header >> 8:02X}')
+
+    # ------------------------------- 2. 換算分辨率 ------------------------------------ #
+    return GcuTelemetry(
+        roll_raw       * 0.01,
+        pitch_raw      * 0.01,
+        yaw_raw        * 0.01,
+        targetdist_raw * 0.1,
+        zoom_raw       * 0.1,
+    )
 
 
 # ------------------------------- GCU 返回數據解碼 ------------------------------------- #
 def decode_gcu_response(response: bytes) -> dict:
     """    
-    - 說明 (def) [decode_gcu_response] 解碼相機回傳數據
-        1. 接收 16 進制數值
-        2. 解碼 16 進制數值
+    - 說明 (def) [decode_gcu_response] 解碼相機回傳數據 (相容舊介面)
+        1. 呼叫 [decode_telemetry]
+        2. 解碼失敗時 以 'error' 欄位回傳錯誤訊息
 
     args:
-        • ip (str)          - 目標主機 IP
-        • port (int)        - 目標主機 Port
-        • timeout (float)   - Socket 超時時間 (預設 5 秒)
+        • response (bytes)  - GCU 返回數據
 
     returns:
-        • data              - 解析後的資訊 (roll, yaw, pitch)
+        • data (dict)       - 解析後的資訊 (rollangle, pitchangle, yawangle,
+                              targetdist, zoom) 或 {'error': 錯誤訊息}
     """
-    
-    # 初始化字典
-    data = {}
-
-    # ---------------------------- 1. 檢查協議頭是否正確 -------------------------------- #
-    # 先檢查至少要有 72 bytes 或更多 (視協議長度)
-    if len(response) < 72:
-        data['error'] = '封包長度不足,無法解析'
-        return data
-
-    # 檢查協議頭 (是否為 0x8A 0x5E)
-    header1, header2 = response[0], response[1]
-    if not (header1 == 0x8A and header2 == 0x5E):
-        data['error'] = f'協議頭錯誤: {header1:02X}{header2:02X}'
-        return data
-
-    # ----------------------- 2-1. 解碼相機 (roll, pitch, yaw) ------------------------ #
-    # 嘗試讀取 roll/pitch/yaw (Byte18~19, 20~21, 22~23)
-    roll_bytes  = response[18:20]   # 2 bytes   (絕對 - ROLL)
-    pitch_bytes = response[20:22]   # 2 bytes   (絕對 - PITCH)
-    yaw_bytes   = response[16:18]   # 2 bytes   (相對 - YAW)
-
-    # 有號 16-bit (S16): struct.unpack("<h") => littel-endian 16位元有正負數
-    roll_raw  = struct.unpack("<h", roll_bytes)[0]
-    pitch_raw = struct.unpack("<h", pitch_bytes)[0]
-    yaw_raw   = struct.unpack("<h", yaw_bytes)[0]
-
-    # 分辨率 0.01
-    rollangle  = roll_raw  * 0.01
-    pitchangle = pitch_raw * 0.01
-    yawangle   = yaw_raw   * 0.01
-
-    # 添加 進 data 列表
-    data['rollangle']  = rollangle
-    data['pitchangle'] = pitchangle
-    data['yawangle']   = yawangle
-
-    # -------------------------- 2-2. 解碼相機 (targetdist) --------------------------- #
-    # 嘗試讀取 目標測距 (Byte43~46)
-    targetdist_bytes  = response[43:47]   # 4 bytes
-
-    # 無號 32-bit (U32)：struct.unpack('<I') => little-endian 32 位元無號整數
-    targetdist_raw, = struct.unpack('<I', targetdist_bytes)
-
-    # 分辨率 0.1
-    targetdist = targetdist_raw * 0.1
-
-    # 添加 進 data 列表
-    data['targetdist'] = targetdist
-
-    # ----------------------- 2-3. 解碼相機 (相機倍率 ratio) --------------------------- #
-    # 嘗試讀取 相機倍率 ratio (Byte59~60)
-    zoom_bytes =response[59:61]
-
-    # 無號 16-bit (U16): struct.unpack("<H") => littel-endian 16位元無正負數
-    zoom_raw = struct.unpack("<H", zoom_bytes)[0]
-
-    # 分辨率 0.1
-    zoom = zoom_raw * 0.1
-
-    # 添加 進 data 列表
-    data['zoom'] = zoom
-
-    # ------------------------- 3. 最終回傳 Data 資料 ---------------------------------- #
-    # 回傳 data 資料
-    return data
+    try:
+        return decode_telemetry(response)._asdict()
+    except GcuDecodeError as e:
+        return {'error': str(e)}
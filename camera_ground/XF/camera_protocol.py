@@ -13,6 +13,8 @@ SPDX-License-Identifier: Apache-2.0
 功能總覽: 
     • CRC 計算
     • 根據 [廠家手冊] 編寫 完整封包資訊
+    • 封包模板快取 (固定指令預先組好, 浮動指令只修改變動欄位)
+    • CRC 查表計算 (可從已保存的 CRC 狀態續算, 批次校驗)
     • 發送空命令 (回傳當前雲台資訊)
 
 遵循:
@@ -24,7 +26,120 @@ SPDX-License-Identifier: Apache-2.0
 # Imports
 # ------------------------------------------------------------------------------------ #
 # 標準庫
+import binascii
 import struct
+from typing import Iterable, List, NamedTuple
+
+
+# ------------------------------------------------------------------------------------ #
+# 封包固定結構
+# ------------------------------------------------------------------------------------ #
+HEADER       = b'\xA8\xE5'          # 協議頭
+VERSION      = b'\x02'              # 協議版本
+FRAME_SIZE   = 32                   # 主幀 / 副幀 大小
+PREFIX_SIZE  = 69                   # 開頭(5) + 主幀(32) + 副幀(32)
+
+# 主幀 byte 25 (封包 byte 30) = 0x01 → 要求 GCU 回覆
+ENABLE_REQUEST_OFFSET = 5 + 25
+
+# 角度控制 (roll, pitch, yaw, 結尾標誌 0x04) → 寫入 [5 ~ 11]
+_ANGLE_STRUCT  = struct.Struct('<hhhB')
+_ANGLE_OFFSET  = 5
+
+# 框選座標 (x0, y0, x1, y1) → 接在 控制參數 之後
+_BOX_STRUCT    = struct.Struct('<HHHH')
+
+# 需要帶框選座標的指令: (0x17) 追蹤模式, (0x1A) 指點平移
+_BOX_COMMANDS = {
+    0x17: (b'\x01\x01', b'\x01\x00'),
+    0x1A: (b'\x01',),
+}
+
+
+# ------------------------------------------------------------------------------------ #
+# 封包模板快取
+# ------------------------------------------------------------------------------------ #
+# 快取上限 (避免任意參數組合造成快取無限增長)
+_TEMPLATE_CACHE_MAX = 256
+
+# 固定指令: (command, parameters, enable_request) → 完整封包 (bytes, 不可變)
+_fixed_packets: dict = {}
+
+# 浮動指令: (種類, command, parameters, enable_request) → [_PacketTemplate]
+_variable_templates: dict = {}
+
+
+class _PacketTemplate(NamedTuple):
+    skeleton: bytes         # 封包骨架 (浮動欄位補 0, CRC 占位)
+    offset: int             # 第一個浮動欄位的位置
+    prefix_crc: int         # 骨架 [0 ~ offset) 的 CRC 狀態 (每包只需續算其後的部分)
+
+
+# ---------------------------------- 組裝 封包骨架 ------------------------------------- #
+def _assemble_packet(
+    command: int,
+    parameters: bytes,
+    enable_request: bool,
+    extra_size: int = 0,
+) -> bytearray:
+    """
+    - 說明 [_assemble_packet] 組裝封包骨架 (浮動欄位補 0, CRC 占位)
+
+    args:
+        • command (int)         - 指令代碼
+        • parameters (bytes)    - 指令的參數
+        • enable_request (bool) - 是否需要啟用 GCU 返回數據
+        • extra_size (int)      - 參數後方 預留的浮動欄位長度 (default `0`)
+
+    returns:
+        • packet (bytearray)    - 已填入真實長度, 尚未計算 CRC 的封包
+    """
+
+    # 主幀（固定 32 bytes）[5 ~ 36]
+    main_frame = bytearray(FRAME_SIZE)
+    if enable_request:
+        main_frame[ENABLE_REQUEST_OFFSET - 5] = 0x01
+
+    # 副幀（固定 32 bytes）[37 ~ 68]
+    sub_frame = bytes(FRAME_SIZE)
+
+    packet = bytearray(
+        HEADER +
+        b'\x00\x00' +                           # 包長度占位符
+        VERSION +
+        main_frame +
+        sub_frame +
+        command.to_bytes(1, 'little') +         # 控制命令 [69]
+        parameters +                            # 控制參數 [70 ~ 未知]
+        bytes(extra_size) +                     # 浮動欄位占位符
+        b'\x00\x00'                             # CRC 占位符
+    )
+
+    # 封包總長度 (含 CRC 校驗碼)
+    packet[2:4] = len(packet).to_bytes(2, 'little')
+    return packet
+
+# ---------------------------------- 寫入 CRC 校驗碼 ----------------------------------- #
+def _seal_packet(packet: bytearray, offset: int = 0, crc: int = 0) -> bytes:
+    # 從 [offset] 開始 接續已保存的 CRC 狀態
+    crc_value = calculate_crc(memoryview(packet)[offset:-2], crc)
+    packet[-2:] = crc_value.to_bytes(2, 'big')
+    return bytes(packet)
+
+# ---------------------------------- 取得 浮動指令骨架 ---------------------------------- #
+def _get_template(key: tuple, offset: int, extra_size: int) -> _PacketTemplate:
+    template = _variable_templates.get(key)
+    if template is None:
+        _, command, parameters, enable_request = key
+        skeleton = bytes(_assemble_packet(command, parameters, enable_request, extra_size))
+        template = _PacketTemplate(
+            skeleton=skeleton,
+            offset=offset,
+            prefix_crc=calculate_crc(skeleton[:offset]),
+        )
+        if len(_variable_templates) < _TEMPLATE_CACHE_MAX:
+            _variable_templates[key] = template
+    return template
 
 
 # --------------------------------- 發送完整指令封包 架構 -------------------------------- #
@@ -39,9 +154,10 @@ def build_packet(
     
     """
     - 說明 [build_packet] 構建相機指令封包框架
-        1. 協議頭
-        2. 接收 控制命令, 控制參數等...
-        3. 計算 CRC 校驗碼 
+        1. 固定指令 (photo, zoom_stop, empty ...) → 直接回傳快取的完整封包
+        2. 角度控制 (0x00 + pitch/yaw)            → 複製骨架, 只修改角度欄位
+        3. 框選指令 (0x17, 0x1A + 座標)            → 複製骨架, 只修改座標欄位
+        4. 計算 CRC 校驗碼
 
     args:
         • command (int)         - 指令代碼 (0x01, 0x20, ...)
@@ -55,107 +171,105 @@ def build_packet(
         • packet (bytes)        - 組好的完整封包 (包含 2 byte CRC)
     """
 
-    # ------------------------------ Step1. 大致框架區--------------------------------- #
-    # 開頭（固定 5 bytes）[0 ~ 4]
-    header = b'\xA8\xE5'            # 協議頭
-    length_bytes = b'\x00\x00'      # 包長度占位符（後續填充實際值）
-    version = b'\x02'               # 協議版本
-
-    # 主幀（固定 32 bytes）[5 ~ 36]
-    if enable_request:
-        main_frame  = bytearray(b'\x00' * 32)
-        main_frame[25] = 0x01
-    else:
-        main_frame  = bytearray(b'\x00' * 32)
-
-    # 副幀（固定 32 bytes）[37 ~ 68]
-    sub_frame   = bytearray(b'\x00' * 32)
-
-    # 控制命令（浮動 bytes）[69 ~ 未知]
-    command_to_bytes = command.to_bytes(1, 'little')
-    if parameters is None:
-        parameters = b''
-
-    # A. 初步封裝 [大致框架]
-    payload = bytearray(
-        header + 
-        length_bytes + 
-        version + 
-        main_frame + 
-        sub_frame
-    )
+    # ------------------------------ Step1. 參數正規化 --------------------------------- #
+    parameters     = bytes(parameters) if parameters else b''
+    enable_request = bool(enable_request)
 
-    # ------------------------------ Step2. 指令編寫區 --------------------------------- #
-    # 無指令(0x00) → 角度控制：roll(5–7)、yaw(7–9)、pitch(9–11)、結尾標誌 0x04
+    # ------------------------- Step2. 角度控制 (command = 0x00) ----------------------- #
+    # 無指令(0x00) → 角度控制：roll(5–7)、pitch(7–9)、yaw(9–11)、結尾標誌 0x04
     if command == 0x00 and (pitch is not None or yaw is not None):
-        pitch_value = int(pitch * 100)
-        yaw_value = int(yaw * 100)
-
-        # little-endian 2 字節
-        payload[5:7]    = struct.pack('<h', 0)    # roll 保留 0
-        payload[7:9]    = struct.pack('<h', pitch_value)
-        payload[9:11]   = struct.pack('<h', yaw_value)
-        payload[11]     = 0x04
-
-    # 指令 (0x17) 追蹤模式, (0x1A) 指點平移
-    valid_params == None
-    if command == 0x17:
-        valid_params = (b'\x01\x01', b'\x01\x00')
-    elif command == 0x1A:
-        valid_params = (b'\x01',)
+        template = _get_template(
+            ('angle', command, parameters, enable_request), _ANGLE_OFFSET, 0
+        )
+        packet = bytearray(template.skeleton)
+        _ANGLE_STRUCT.pack_into(
+            packet, _ANGLE_OFFSET,
+            0,                                  # roll 保留 0
+            int((pitch or 0.0) * 100),
+            int((yaw or 0.0) * 100),
+            0x04,
+        )
+        return _seal_packet(packet, template.offset, template.prefix_crc)
 
+    # ---------------------- Step3. 框選指令 (command = 0x17, 0x1A) -------------------- #
+    valid_params = _BOX_COMMANDS.get(command)
     if valid_params and parameters in valid_params and None not in (x0, y0, x1, y1):
+        template = _get_template(
+            ('box', command, parameters, enable_request),
+            PREFIX_SIZE + 1 + len(parameters),
+            _BOX_STRUCT.size,
+        )
+        packet = bytearray(template.skeleton)
 
         # 解析率轉換 (左上[0,0], 右下[10000,10000])
-        x0 = int(x0 / width  * 10000)
-        y0 = int(y0 / height * 10000)
-        x1 = int(x1 / width  * 10000)
-        y1 = int(y1 / height * 10000)
-
-        # 將四個坐標統一轉為整數列表
-        coords = [int(x0), int(y0), int(x1), int(y1)]
-        
-        # 為每個整數生成 2 字節小端表示，並保存到列表
-        byte_chunks = []
-        for c in coords:
-            byte_chunks.append(c.to_bytes(2, byteorder='little'))
-        
-        # 把原本的 parameters 與所有坐標的 bytes 連接起來
-        parameters = parameters + b''.join(byte_chunks)
-
-    # B. 二次封裝 [大致框架] + [指令控制]
-    payload += command_to_bytes + parameters
-
-    # ---------------------------- Step3. 封包總長度計算 -------------------------------- #
-    # 計算總長度 (加上CRC 校驗碼 +2)
-    total_length = len(payload) + 2
-    length_bytes = total_length.to_bytes(2, 'little')
-
-    # C. 三次封裝 [大致框架] + [指令控制] + [修改真實長度]
-    payload[2:4] = length_bytes
-
-    # ---------------------------- Step4. 最終效驗碼計算 -------------------------------- #
-    # 計算 CRC 校驗碼
-    crc_value = calculate_crc(payload)
-    crc_bytes = crc_value.to_bytes(2, 'big')
-
-    # D. 最終封裝 [大致框架] + [指令控制] + [修改真實長度] + [CRC效驗碼]
-    payload += crc_bytes
-
-    return bytes(payload)
+        _BOX_STRUCT.pack_into(
+            packet, template.offset,
+            int(x0 / width  * 10000),
+            int(y0 / height * 10000),
+            int(x1 / width  * 10000),
+            int(y1 / height * 10000),
+        )
+        return _seal_packet(packet, template.offset, template.prefix_crc)
+
+    # ------------------------------ Step4. 固定指令 ----------------------------------- #
+    key = (command, parameters, enable_request)
+    packet = _fixed_packets.get(key)
+    if packet is None:
+        packet = _seal_packet(_assemble_packet(command, parameters, enable_request))
+        if len(_fixed_packets) < _TEMPLATE_CACHE_MAX:
+            _fixed_packets[key] = packet
+    return packet
+
+# ---------------------------------- 是否要求回覆 ------------------------------------- #
+def expects_reply(packet: bytes) -> bool:
+    """
+    - 說明 [expects_reply] 封包是否要求 GCU 回覆 (enable_request = 0 → GCU 不回覆)
+    """
+    return len(packet) > ENABLE_REQUEST_OFFSET and packet[ENABLE_REQUEST_OFFSET] == 0x01
 
 # ----------------------------------- 計算 CRC 校驗碼 ---------------------------------- #
-def calculate_crc(data: bytes) -> int:
-    crc = 0
-    crc_table = [
-        0x0000, 0x1021, 0x2042, 0x3063,
-        0x4084, 0x50A5, 0x60C6, 0x70E7,
-        0x8108, 0x9129, 0xA14A, 0xB16B,
-        0xC18C, 0xD1AD, 0xE1CE, 0xF1EF,
-    ]
-
-    # 高4位和低4位分別進行 CRC 計算
-    for byte in data:
-        crc = ((crc << 4) ^ crc_table[(crc >> 12) ^ (byte >> 4)]) & 0xFFFF
-        crc = ((crc << 4) ^ crc_table[(crc >> 12) ^ (byte & 0x0F)]) & 0xFFFF
-    return crc
+def calculate_crc(data: bytes, crc: int = 0) -> int:
+    """
+    - 說明 [calculate_crc] CRC-16 (多項式 0x1021, 初值 0, 高位先行)
+        1. 使用 binascii.crc_hqx (C 實作, 預先計算的 256 項查表, 每 byte 查表一次)
+        2. 可傳入先前保存的 CRC 狀態 接續計算
+
+    args:
+        • data (bytes)  - 欲計算的資料 (bytes, bytearray, memoryview)
+        • crc (int)     - 接續計算的 CRC 狀態 (default `0`)
+
+    returns:
+        • crc (int)     - 16 位元 CRC 值
+    """
+    return binascii.crc_hqx(data, crc)
+
+# ---------------------------------- 批次計算 CRC 校驗碼 -------------------------------- #
+def calculate_crc_batch(frames: Iterable[bytes], crc: int = 0) -> List[int]:
+    """
+    - 說明 [calculate_crc_batch] 一次計算多個封包的 CRC (日誌校驗用)
+
+    args:
+        • frames (Iterable[bytes])  - 欲計算的資料 (不含 CRC 欄位)
+        • crc (int)                 - 每筆資料共用的起始 CRC 狀態 (default `0`)
+
+    returns:
+        • crcs (List[int])          - 依序對應每筆資料的 CRC 值
+    """
+    crc_hqx = binascii.crc_hqx
+    return [crc_hqx(frame, crc) for frame in frames]
+
+# ---------------------------------- 檢查 封包 CRC 校驗碼 ------------------------------- #
+def verify_crc(packet: bytes) -> bool:
+    """
+    - 說明 [verify_crc] 檢查完整封包結尾的 2 byte CRC (big-endian) 是否正確
+
+    args:
+        • packet (bytes)    - 完整封包 (包含 2 byte CRC)
+
+    returns:
+        • valid (bool)      - CRC 是否正確
+    """
+    if len(packet) < 2:
+        return False
+    crc_value = binascii.crc_hqx(memoryview(packet)[:-2], 0)
+    return crc_value == (packet[-2] << 8 | packet[-1])
@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+File   : command_registry.py
+Author : FantasyWilly
+Email  : bc697522h04@gmail.com
+SPDX-License-Identifier: Apache-2.0
+
+開發公司:
+    • 先飛科技 (XF)
+
+功能總覽:
+    • 根據 [廠家手冊] 的控制命令 以 1 張表描述 (名稱, 指令代碼, 參數, 種類, 斷線策略)
+    • 固定指令 (無角度 / 框選) 在匯入時 預先組好完整封包
+    • 依名稱 或 指令代碼 (+ 參數) 查詢指令
+    • 一連串指令 轉為封包 (GCUController.send_batch 1 次寫出)
+    • 產生 camera_command / async_camera_command 的指令函式
+    • 斷線重送策略 (gcu_transport.DEFAULT_REPLAY_POLICY) 由此表產生
+    • 指令優先等級 (command_scheduler 排程 & gcu_shaper 頻寬分配)
+
+遵循:
+    • Google Python Style Guide (含區段標題)
+    • PEP 8 (行寬 ≤ 88, snake_case, 2 空行區段分隔)
+"""
+
+# ------------------------------------------------------------------------------------ #
+# Imports
+# ------------------------------------------------------------------------------------ #
+# 標準庫
+import inspect
+import logging
+from typing import (
+    Any, Callable, Dict, Iterable, List, NamedTuple, Sequence, Tuple, Union,
+)
+
+# 專案內部模組
+from camera_protocol import PREFIX_SIZE, build_packet
+from gcu_logging import log_event
+
+
+# ------------------------------------------------------------------------------------ #
+# 指令種類 & 斷線時 尚未完成的指令 處理策略
+# ------------------------------------------------------------------------------------ #
+KIND_FIXED = 'fixed'        # 固定封包 (無變動欄位)
+KIND_ANGLE = 'angle'        # 角度控制 (pitch, yaw)
+KIND_BOX   = 'box'          # 框選座標 (x0, y0, x1, y1)
+
+REPLAY = 'replay'           # 重連後 重新發送
+DROP   = 'drop'             # 直接丟棄 (回報 CommandDroppedError)
+
+# 每種指令 除了 controller 以外的參數
+_KIND_ARGS = {
+    KIND_FIXED: (),
+    KIND_ANGLE: ('pitch', 'yaw'),
+    KIND_BOX:   ('x0', 'y0', 'x1', 'y1'),
+}
+
+
+# ------------------------------------------------------------------------------------ #
+# 優先等級 (數字越小 越先發送; command_scheduler 排程 & gcu_shaper 頻寬分配 共用)
+# ------------------------------------------------------------------------------------ #
+PRIORITY_SAFETY     = 0     # 停止 / 回中 (插隊)
+PRIORITY_CONTROL    = 1     # 模式切換 (含退出跟蹤), 拍照, 錄影, 開關 (不可遺失)
+PRIORITY_MOTION     = 2     # 雲台角度, 連續放大縮小, 跟蹤框 (過時即無意義)
+PRIORITY_BACKGROUND = 3     # 空命令 / 心跳 / 資訊輪詢
+
+PRIORITY_NAMES = ('safety', 'control', 'motion', 'background')
+
+# 指令名稱 → 優先等級 (未列出 → PRIORITY_CONTROL)
+DEFAULT_PRIORITIES = {
+    'reset':          PRIORITY_SAFETY,
+    'zoom_stop':      PRIORITY_SAFETY,
+    'control_gimbal': PRIORITY_MOTION,
+    'zoom_in':        PRIORITY_MOTION,
+    'zoom_out':       PRIORITY_MOTION,
+    'track_in':       PRIORITY_MOTION,
+    'track_out':      PRIORITY_CONTROL,     # 退出跟蹤 = 模式切換, 不可因逾時 / 插隊遺失
+    'point_controll': PRIORITY_MOTION,
+    'empty':          PRIORITY_BACKGROUND,
+}
+
+
+# ------------------------------------------------------------------------------------ #
+# [CommandSpec] 指令描述
+# ------------------------------------------------------------------------------------ #
+class CommandSpec(NamedTuple):
+    """
+    - 說明 [CommandSpec] 1 個控制命令
+
+    args:
+        • name (str)        - 函式名稱 (camera_command.<name>)
+        • code (int)        - 指令代碼 (封包 byte 69)
+        • parameters (bytes)- 控制參數
+        • kind (str)        - KIND_FIXED / KIND_ANGLE / KIND_BOX
+        • replay (str)      - 斷線時的處理策略 REPLAY / DROP
+        • label (str)       - 記錄訊息中的名稱
+        • description (str) - 說明
+    """
+    name: str
+    code: int
+    parameters: bytes
+    kind: str
+    replay: str
+    label: str
+    description: str
+
+
+def arity_of(spec: CommandSpec) -> int:
+    """除 controller 以外的參數個數 (fixed: 0, angle: 2, box: 4)"""
+    return len(_KIND_ARGS[spec.kind])
+
+
+COMMAND_SPECS: Tuple[CommandSpec, ...] = (
+    # 無特別指令 (command = 0x00): 空命令 / 角度控制 (過時即無意義)
+    CommandSpec('empty',          0x00, b'',         KIND_FIXED, DROP,   'empty',          '空指令'),
+    CommandSpec('control_gimbal', 0x00, b'',         KIND_ANGLE, DROP,   'control_gimbal', '控制雲台'),
+
+    # 雲台模式
+    CommandSpec('calibration',    0x01, b'',         KIND_FIXED, REPLAY, 'calibration',    '校準'),
+    CommandSpec('reset',          0x03, b'',         KIND_FIXED, REPLAY, 'reset',          '回中'),
+    CommandSpec('lock',           0x11, b'',         KIND_FIXED, REPLAY, 'lock',           '鎖定'),
+    CommandSpec('follow',         0x12, b'',         KIND_FIXED, REPLAY, 'follow',         '跟隨'),
+    CommandSpec('down',           0x13, b'',         KIND_FIXED, REPLAY, 'down',           '向下'),
+
+    # 框選 (畫面已改變 → 不重送)
+    CommandSpec('track_in',       0x17, b'\x01\x01', KIND_BOX,   DROP,   'track_in',       '進入跟蹤模式'),
+    CommandSpec('track_out',      0x17, b'\x01\x00', KIND_BOX,   DROP,   'track_out',      '退出跟蹤模式'),
+    CommandSpec('point_controll', 0x1A, b'\x01',     KIND_BOX,   DROP,   'point_control',  '控制畫面向'),
+
+    # 相機 (拍照不可重複執行, 錄影為開關切換, 連續放大縮小 過時即無意義)
+    CommandSpec('photo',          0x20, b'\x01',     KIND_FIXED, DROP,   'photo',          '拍照'),
+    CommandSpec('video',          0x21, b'\x01',     KIND_FIXED, DROP,   'video',          '錄影'),
+    CommandSpec('zoom_in',        0x22, b'\x01',     KIND_FIXED, DROP,   'zoom_in',        '連續放大'),
+    CommandSpec('zoom_out',       0x23, b'\x01',     KIND_FIXED, DROP,   'zoom_out',       '連續縮小'),
+    CommandSpec('zoom_stop',      0x24, b'\x01',     KIND_FIXED, REPLAY, 'zoom_stop',      '停止放大縮小'),
+    CommandSpec('focus',          0x26, b'\x01',     KIND_FIXED, REPLAY, 'focus',          '聚焦'),
+
+    # 開關
+    CommandSpec('osd_on',         0x73, b'\x01',     KIND_FIXED, REPLAY, 'OSD - On',       'OSD開啟'),
+    CommandSpec('osd_off',        0x73, b'\x00',     KIND_FIXED, REPLAY, 'OSD - Off',      'OSD關閉'),
+    CommandSpec('laser_on',       0x81, b'\x02',     KIND_FIXED, REPLAY, 'Laser - On',     '測距開啟'),
+    CommandSpec('laser_off',      0x81, b'\x00',     KIND_FIXED, REPLAY, 'Laser - Off',    '測距關閉'),
+)
+
+
+# ------------------------------------------------------------------------------------ #
+# 查詢表 (匯入時建立)
+# ------------------------------------------------------------------------------------ #
+# 名稱 → 指令
+COMMANDS: Dict[str, CommandSpec] = {spec.name: spec for spec in COMMAND_SPECS}
+
+# 指令代碼 → 同代碼的所有指令 (依表中順序)
+COMMANDS_BY_CODE: Dict[int, Tuple[CommandSpec, ...]] = {}
+for _spec in COMMAND_SPECS:
+    COMMANDS_BY_CODE[_spec.code] = COMMANDS_BY_CODE.get(_spec.code, ()) + (_spec,)
+del _spec
+
+# 固定指令 名稱 → 完整封包 (enable_request = True)
+PREBUILT_PACKETS: Dict[str, bytes] = {
+    spec.name: build_packet(spec.code, spec.parameters, True)
+    for spec in COMMAND_SPECS
+    if spec.kind == KIND_FIXED
+}
+
+
+# 指令代碼 → 優先等級 (同代碼取最高等級; 0x00 另依角度欄位區分, 見 packet_priority)
+_PRIORITY_BY_CODE: Dict[int, int] = {}
+for _spec in COMMAND_SPECS:
+    _PRIORITY_BY_CODE[_spec.code] = min(
+        _PRIORITY_BY_CODE.get(_spec.code, PRIORITY_BACKGROUND),
+        DEFAULT_PRIORITIES.get(_spec.name, PRIORITY_CONTROL),
+    )
+del _spec
+
+# 角度控制封包: byte 11 為結尾標誌 0x04 (空命令為 0)
+_ANGLE_FLAG_OFFSET = 11
+
+
+def lookup(
+    key: Union[str, int],
+    parameters: bytes = None,
+    arity: int = None,
+) -> CommandSpec:
+    """
+    - 說明 [lookup] 依名稱 或 指令代碼 查詢指令
+        • 同 1 個指令代碼有多個指令時 (0x00, 0x17, 0x73, 0x81), 以 parameters 區分
+        • 仍無法區分時 (0x00: empty / control_gimbal), 以 arity (參數個數) 區分
+
+    args:
+        • key (str | int)       - 名稱 ('photo') 或 指令代碼 (0x20)
+        • parameters (bytes)    - 控制參數 (default: None → 不限)
+        • arity (int)           - 除 controller 以外的參數個數 (default: None → 不限)
+
+    returns:
+        • spec (CommandSpec)
+
+    raises:
+        • KeyError              - 沒有符合的指令, 或符合的指令不只 1 個
+    """
+    if isinstance(key, str):
+        spec = COMMANDS.get(key)
+        if spec is None:
+            raise KeyError(f"未知的指令: {key!r}")
+        return spec
+
+    candidates = [
+        spec for spec in COMMANDS_BY_CODE.get(key, ())
+        if (parameters is None or spec.parameters == bytes(parameters))
+        and (arity is None or arity_of(spec) == arity)
+    ]
+    if len(candidates) != 1:
+        names = ', '.join(spec.name for spec in candidates) or '無'
+        raise KeyError(f"指令代碼 0x{key:02X} 無法對應到唯一指令 (符合: {names})")
+    return candidates[0]
+
+
+def packet_priority(packet: bytes) -> int:
+    """
+    - 說明 [packet_priority] 依封包內容 判斷優先等級 (controller 發送路徑使用)
+        • 0x00: 有角度欄位 → control_gimbal 的等級, 否則 → empty 的等級 (心跳)
+        • 同代碼有多個指令 (0x17 track_in / track_out ...) → 依控制參數 區分
+        • 其他: 該指令代碼的等級, 未知指令 → PRIORITY_CONTROL
+    """
+    if len(packet) <= PREFIX_SIZE:
+        return PRIORITY_CONTROL
+    code = packet[PREFIX_SIZE]
+    if code == 0x00:
+        name = 'control_gimbal' if packet[_ANGLE_FLAG_OFFSET] else 'empty'
+        return DEFAULT_PRIORITIES[name]
+    specs = COMMANDS_BY_CODE.get(code, ())
+    if len(specs) > 1:
+        for spec in specs:
+            if spec.parameters and packet.startswith(spec.parameters, PREFIX_SIZE + 1):
+                return DEFAULT_PRIORITIES.get(spec.name, PRIORITY_CONTROL)
+    return _PRIORITY_BY_CODE.get(code, PRIORITY_CONTROL)
+
+
+def replay_policy() -> Dict[int, str]:
+    """
+    - 說明 [replay_policy] 指令代碼 → REPLAY / DROP (同代碼的指令 策略必須相同)
+    """
+    policy: Dict[int, str] = {}
+    for spec in COMMAND_SPECS:
+        if policy.setdefault(spec.code, spec.replay) != spec.replay:
+            raise ValueError(f"指令代碼 0x{spec.code:02X} 的斷線策略不一致")
+    return policy
+
+
+def build_command_packet(
+    spec: CommandSpec, args: Sequence = (), width: int = None, height: int = None
+) -> bytes:
+    """
+    - 說明 [build_command_packet] 組出指令封包 (固定指令 → 直接回傳預先組好的封包)
+
+    args:
+        • spec (CommandSpec)    - 指令
+        • args (Sequence)       - 角度 (pitch, yaw) / 框選 (x0, y0, x1, y1)
+        • width, height (int)   - 影像畫素 (框選指令換算座標用)
+    """
+    if len(args) != arity_of(spec):
+        raise TypeError(f"{spec.name} 需要 {arity_of(spec)} 個參數, 收到 {len(args)} 個")
+    if spec.kind == KIND_FIXED:
+        return PREBUILT_PACKETS[spec.name]
+    if spec.kind == KIND_ANGLE:
+        pitch, yaw = args
+        return build_packet(spec.code, spec.parameters, True, pitch=pitch, yaw=yaw)
+    x0, y0, x1, y1 = args
+    return build_packet(
+        spec.code, spec.parameters, True,
+        x0=x0, y0=y0, x1=x1, y1=y1, width=width, height=height,
+    )
+
+
+def batch_packets(
+    commands: Iterable, width: int = None, height: int = None
+) -> Tuple[List[CommandSpec], List[bytes]]:
+    """
+    - 說明 [batch_packets] 將一連串指令 轉為封包 (send_batch 用)
+
+    args:
+        • commands (Iterable)   - 每個元素為 名稱 / 指令代碼 ('photo', 0x24),
+                                  或 (名稱, *參數) ('track_in', x0, y0, x1, y1)
+        • width, height (int)   - 影像畫素 (框選指令換算座標用)
+
+    returns:
+        • (specs, packets)      - 依序對應的指令 & 封包
+    """
+    specs, packets = [], []
+    for item in commands:
+        key, args = (item[0], tuple(item[1:])) if isinstance(item, tuple) else (item, ())
+        spec = lookup(key, arity=len(args))
+        specs.append(spec)
+        packets.append(build_command_packet(spec, args, width, height))
+    return specs, packets
+
+
+def prepare_batch(
+    controller, commands: Iterable, logger: logging.Logger
+) -> Tuple[List[str], List[bytes]]:
+    """
+    - 說明 [prepare_batch] send_batch 共用: 轉為封包 & 記錄發送事件
+
+    returns:
+        • (names, packets)      - 依序對應的指令名稱 & 封包
+    """
+    specs, packets = batch_packets(commands, controller.width, controller.height)
+    names = [spec.name for spec in specs]
+    log_event(
+        logger, logging.INFO, 'command_batch',
+        "發送 [指令] : [batch] - %s", ' → '.join(names),
+        names=names, codes=[spec.code for spec in specs],
+    )
+    return names, packets
+
+
+def batch_failed(logger: logging.Logger, names: List[str], e: Exception) -> None:
+    """send_batch 共用: 記錄發送失敗"""
+    log_event(
+        logger, logging.ERROR, 'command_error',
+        "[send_batch] 發送指令時出現錯誤: %s", e, names=names,
+    )
+
+
+# ------------------------------------------------------------------------------------ #
+# 產生 指令函式
+# ------------------------------------------------------------------------------------ #
+def _describe(spec: CommandSpec) -> str:
+    args = ', '.join(('controller',) + _KIND_ARGS[spec.kind])
+    return f"{spec.description} (0x{spec.code:02X}) - {spec.name}({args})"
+
+
+def _signature(spec: CommandSpec) -> inspect.Signature:
+    names = ('controller',) + _KIND_ARGS[spec.kind]
+    return inspect.Signature([
+        inspect.Parameter(name, inspect.Parameter.POSITIONAL_OR_KEYWORD) for name in names
+    ])
+
+
+def _finish(function: Callable, spec: CommandSpec) -> Callable:
+    function.__name__ = function.__qualname__ = spec.name
+    function.__doc__ = _describe(spec)
+    function.__signature__ = _signature(spec)
+    function.spec = spec
+    return function
+
+
+def command_call(
+    spec: CommandSpec, args: Sequence = (), kwargs: Dict[str, Any] = None
+) -> Tuple[int, bytes, Dict[str, Any]]:
+    """
+    - 說明 [command_call] 指令參數 → send_command 的 (指令代碼, 控制參數, 欄位)
+        • 位置 / 關鍵字參數 依指令種類 對應到 pitch, yaw / x0, y0, x1, y1
+
+    args:
+        • spec (CommandSpec)    - 指令
+        • args (Sequence)       - 位置參數 (不含 controller)
+        • kwargs (dict)         - 關鍵字參數 (default: None)
+
+    returns:
+        • (code, parameters, fields)
+
+    raises:
+        • TypeError             - 參數個數 / 名稱 不符
+    """
+    names = _KIND_ARGS[spec.kind]
+    if not kwargs and len(args) == len(names):
+        return spec.code, spec.parameters, dict(zip(names, args))
+    fields = dict(_signature(spec).bind(None, *args, **(kwargs or {})).arguments)
+    del fields['controller']
+    return spec.code, spec.parameters, fields
+
+
+def _command_parts(
+    spec: CommandSpec, logger: logging.Logger
+) -> Tuple[Callable, Callable, Callable]:
+    """
+    - 說明 [_command_parts] make_command / make_async_command 共用的部分
+        • prepare(args, kwargs) → 記錄發送事件, 回傳 command_call 的結果
+        • send(controller, call) → 發送 (固定指令 直接發送 PREBUILT_PACKETS 中的封包)
+                                   AsyncGCUController 時回傳協程 (由呼叫端 await)
+        • failed(e)             → 記錄發送失敗
+    """
+    message = f"發送 [指令] : [{spec.label}] - {spec.description}"
+    error_message = f"[{spec.name}] 發送指令時出現錯誤: %s"
+    packet = PREBUILT_PACKETS.get(spec.name)
+
+    def prepare(args: Sequence, kwargs: Dict[str, Any]) -> Tuple[int, bytes, Dict]:
+        call = command_call(spec, args, kwargs)
+        fields = call[2]
+        if spec.kind == KIND_ANGLE:
+            log_event(
+                logger, logging.INFO, 'command',
+                message + ", pitch: %s°, yaw: %s°", fields['pitch'], fields['yaw'],
+                name=spec.name, code=spec.code, **fields,
+            )
+        elif spec.kind == KIND_BOX:
+            log_event(
+                logger, logging.INFO, 'command', message,
+                name=spec.name, code=spec.code, box=tuple(fields.values()),
+            )
+        else:
+            log_event(logger, logging.INFO, 'command', message, name=spec.name, code=spec.code)
+        return call
+
+    def send(controller, call: Tuple[int, bytes, Dict]):
+        if packet is not None:
+            return controller.send_packet(packet)
+        code, parameters, fields = call
+        return controller.send_command(
+            command=code, parameters=parameters, enable_request=True, **fields
+        )
+
+    def failed(e: Exception) -> None:
+        log_event(
+            logger, logging.ERROR, 'command_error', error_message, e,
+            name=spec.name, code=spec.code,
+        )
+
+    return prepare, send, failed
+
+
+def make_command(spec: CommandSpec, logger: logging.Logger) -> Callable:
+    """
+    - 說明 [make_command] 產生 1 個指令函式 (GCUController 版)
+        • 固定指令: 直接發送 PREBUILT_PACKETS 中的封包 (不重新組裝)
+        • 角度 / 框選: 交給 send_command 填入變動欄位
+        • 參數不符 → TypeError; 發送失敗只記錄錯誤, 不拋出例外 (同原本的 camera_command)
+    """
+    prepare, send, failed = _command_parts(spec, logger)
+
+    def command(controller, *args, **kwargs) -> None:
+        call = prepare(args, kwargs)
+        try:
+            send(controller, call)
+        except Exception as e:
+            failed(e)
+
+    return _finish(command, spec)
+
+
+def make_async_command(spec: CommandSpec, logger: logging.Logger) -> Callable:
+    """
+    - 說明 [make_async_command] 產生 1 個指令協程函式 (AsyncGCUController 版, 同 make_command)
+    """
+    prepare, send, failed = _command_parts(spec, logger)
+
+    async def command(controller, *args, **kwargs) -> None:
+        call = prepare(args, kwargs)
+        try:
+            await send(controller, call)
+        except Exception as e:
+            failed(e)
+
+    return _finish(command, spec)
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+File   : command_scheduler.py
+Author : FantasyWilly
+Email  : bc697522h04@gmail.com
+SPDX-License-Identifier: Apache-2.0
+
+開發公司:
+    • 先飛科技 (XF)
+
+功能總覽:
+    • 在 GCUController 之前 依優先等級排程控制命令 (單一發送執行緒)
+    • 每個等級 1 個有上限的佇列 (滿了丟棄最舊的一筆)
+    • 每個指令帶有期限, 超過期限仍未發送 → 直接丟棄 (不晚送)
+    • 停止 / 回中 (zoom_stop, reset) 插隊, 並丟棄已排隊的 移動 & 背景指令
+    • 佇列深度 & 各種丟棄次數 供監控
+    • 與 CoalescingCommandSender 相同的介面 (submit, control_gimbal), 可直接替換
+
+遵循:
+    • Google Python Style Guide (含區段標題)
+    • PEP 8 (行寬 ≤ 88, snake_case, 2 空行區段分隔)
+"""
+
+# ------------------------------------------------------------------------------------ #
+# Imports
+# ------------------------------------------------------------------------------------ #
+# 標準庫
+import collections
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional, Union
+
+# 專案內部模組
+import camera_command as cm
+from command_registry import (
+    DEFAULT_PRIORITIES, PRIORITY_CONTROL, PRIORITY_MOTION, PRIORITY_NAMES, lookup,
+)
+from gcu_controller import GCUController
+from gcu_logging import get_logger, log_event
+from gcu_metrics import LatencyHistogram
+
+
+_log = get_logger('command_scheduler')
+
+
+# ------------------------------------------------------------------------------------ #
+# 插隊指令 & 各等級設定 (優先等級 定義於 command_registry)
+# ------------------------------------------------------------------------------------ #
+# 會插隊 & 清除 移動 / 背景 佇列的指令
+PREEMPTING_COMMANDS = frozenset({'reset', 'zoom_stop'})
+
+# 各等級 佇列上限 & 預設期限 (秒, None → 不限)
+DEFAULT_QUEUE_LIMITS = (8, 64, 16, 4)
+DEFAULT_DEADLINES    = (None, 2.0, 0.25, 0.5)
+
+
+# ------------------------------------------------------------------------------------ #
+# 佇列項目 & 各等級統計
+# ------------------------------------------------------------------------------------ #
+class _Entry:
+
+    __slots__ = ('name', 'function', 'args', 'deadline', 'queued_at')
+
+    def __init__(
+        self, name: str, function: Callable, args: list, deadline: Optional[float]
+    ) -> None:
+        self.name      = name
+        self.function  = function
+        self.args      = args
+        self.deadline  = deadline
+        self.queued_at = time.monotonic()
+
+
+class _ClassStats:
+
+    __slots__ = (
+        'submitted', 'sent', 'expired', 'overflow', 'preempted', 'coalesced',
+        'max_depth', 'queue_wait',
+    )
+
+    def __init__(self) -> None:
+        self.submitted = 0      # 放入佇列
+        self.sent      = 0      # 已發送
+        self.expired   = 0      # 超過期限 丟棄
+        self.overflow  = 0      # 佇列已滿 丟棄最舊的一筆
+        self.preempted = 0      # 被停止 / 回中 清除
+        self.coalesced = 0      # 角度指令 合併到尚未發送的一筆
+        self.max_depth = 0
+        self.queue_wait = LatencyHistogram()
+
+
+# ------------------------------------------------------------------------------------ #
+# [PriorityCommandScheduler] 優先等級 發送執行緒
+# ------------------------------------------------------------------------------------ #
+class PriorityCommandScheduler:
+    """
+    - 說明 [PriorityCommandScheduler]
+        1. 呼叫端只將指令放入對應等級的佇列 立即返回
+        2. 發送執行緒 每次取出 最高等級 佇列中最早的一筆 (同等級內 依序)
+        3. 取出時已超過期限 → 丟棄 (expired), 不發送
+        4. 佇列已滿 → 丟棄該等級最舊的一筆 (overflow)
+        5. PREEMPTING_COMMANDS (zoom_stop, reset) 放入時 清除已排隊的 移動 & 背景指令
+           (避免停止後 又執行停止前排隊的移動), 並在下一次發送時 最先送出
+        6. 同時只有 1 個指令在途 → 停止指令最多等待 1 次往返
+
+    args:
+        • controller (GCUController)    - 已連線的 GCU 控制器
+        • queue_limits (tuple)          - 各等級 佇列上限 (default: DEFAULT_QUEUE_LIMITS)
+        • deadlines (tuple)             - 各等級 預設期限 (秒) (default: DEFAULT_DEADLINES)
+        • priorities (dict)             - 指令名稱 → 等級 (default: DEFAULT_PRIORITIES)
+        • merge_angles (bool)           - control_gimbal 累加 (True) / 取代 (False, default)
+    """
+
+    def __init__(
+        self,
+        controller: GCUController,
+        queue_limits: tuple = DEFAULT_QUEUE_LIMITS,
+        deadlines: tuple = DEFAULT_DEADLINES,
+        priorities: Dict[str, int] = None,
+        merge_angles: bool = False,
+    ) -> None:
+
+        classes = len(PRIORITY_NAMES)
+        if len(queue_limits) != classes or len(deadlines) != classes:
+            raise ValueError(f"queue_limits / deadlines 需要 {classes} 個值")
+
+        # 接收參數
+        self.controller   = controller
+        self.deadlines    = tuple(deadlines)
+        self.priorities   = DEFAULT_PRIORITIES if priorities is None else priorities
+        self.merge_angles = merge_angles
+
+        # 各等級 佇列 & 統計
+        self._queues = [collections.deque(maxlen=limit) for limit in queue_limits]
+        self._stats  = [_ClassStats() for _ in PRIORITY_NAMES]
+        self._cond   = threading.Condition()
+
+        # 執行緒
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    # ----------------------------------- 啟動 / 停止 --------------------------------- #
+    def start(self) -> None:
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name="gcu-command-scheduler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = None) -> None:
+        """
+        - 說明 [stop] 停止發送執行緒 (佇列中尚未過期的指令 仍會先送出)
+        """
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def __enter__(self) -> "PriorityCommandScheduler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    # ---------------------------------- 放入 指令 ----------------------------------- #
+    def submit(
+        self,
+        command: Union[Callable[..., None], str, int],
+        *args,
+        priority: int = None,
+        deadline: float = None,
+    ) -> None:
+        """
+        - 說明 [submit] 放入 1 個指令
+
+        args:
+            • command (Callable | str | int)    - camera_command 中的指令函式,
+                                                  或 指令名稱 / 指令代碼
+            • *args                             - 除 controller 以外的參數
+            • priority (int)                    - 優先等級 (default: 依 priorities)
+            • deadline (float)                  - 期限 (秒, 從現在起算)
+                                                  (default: 依等級的 deadlines)
+        """
+        if callable(command):
+            spec = getattr(command, 'spec', None)
+            name = spec.name if spec is not None else command.__name__
+            function = command
+        else:
+            name = lookup(command, arity=len(args)).name
+            function = cm.COMMAND_FUNCTIONS[name]
+
+        if priority is None:
+            priority = self.priorities.get(name, PRIORITY_CONTROL)
+        entry = _Entry(name, function, list(args), self._deadline(priority, deadline))
+        self._put(priority, entry)
+
+    def control_gimbal(self, pitch: float, yaw: float, merge: bool = None) -> None:
+        """
+        - 說明 [control_gimbal] 放入 1 個角度指令
+            • 移動佇列 尾端是尚未發送的角度指令時 直接取代 (或累加) 該筆, 並延長期限
+
+        args:
+            • pitch, yaw (float)    - 角度值 (°)
+            • merge (bool)          - 本次是否累加 (default: None → 依 merge_angles)
+        """
+        if merge is None:
+            merge = self.merge_angles
+
+        priority = self.priorities.get('control_gimbal', PRIORITY_MOTION)
+        deadline = self._deadline(priority, None)
+        with self._cond:
+            queue = self._queues[priority]
+            tail = queue[-1] if queue else None
+            if tail is not None and tail.name == 'control_gimbal':
+                if merge:
+                    tail.args[0] += pitch
+                    tail.args[1] += yaw
+                else:
+                    tail.args[:] = [pitch, yaw]
+                tail.deadline = deadline
+                self._stats[priority].coalesced += 1
+                return
+        entry = _Entry('control_gimbal', cm.control_gimbal, [pitch, yaw], deadline)
+        self._put(priority, entry)
+
+    def _deadline(self, priority: int, deadline: Optional[float]) -> Optional[float]:
+        if deadline is None:
+            deadline = self.deadlines[priority]
+        return None if deadline is None else time.monotonic() + deadline
+
+    def _put(self, priority: int, entry: _Entry) -> None:
+        with self._cond:
+            stats = self._stats[priority]
+            stats.submitted += 1
+
+            # 停止 / 回中: 清除已排隊的 移動 & 背景指令
+            if entry.name in PREEMPTING_COMMANDS:
+                for lower in range(PRIORITY_MOTION, len(self._queues)):
+                    queue = self._queues[lower]
+                    if queue:
+                        self._stats[lower].preempted += len(queue)
+                        queue.clear()
+
+            queue = self._queues[priority]
+            if len(queue) == queue.maxlen:
+                stats.overflow += 1
+                # 移動 / 背景指令 本來就可丟棄, 只有 停止 / 控制指令 需要警告
+                level = logging.WARNING if priority <= PRIORITY_CONTROL else logging.DEBUG
+                log_event(
+                    _log, level, 'command_overflow',
+                    "[%s] 佇列已滿, 丟棄最舊的指令: %s",
+                    PRIORITY_NAMES[priority], queue[0].name,
+                    priority=PRIORITY_NAMES[priority], name=queue[0].name,
+                )
+            queue.append(entry)
+            stats.max_depth = max(stats.max_depth, len(queue))
+            self._cond.notify()
+
+    # ---------------------------------- 監控 ----------------------------------------- #
+    def pending(self) -> int:
+        with self._cond:
+            return sum(len(queue) for queue in self._queues)
+
+    def depths(self) -> Dict[str, int]:
+        """各等級 目前的佇列深度"""
+        with self._cond:
+            return {
+                name: len(queue) for name, queue in zip(PRIORITY_NAMES, self._queues)
+            }
+
+    def stats(self) -> Dict[str, dict]:
+        """
+        - 說明 [stats] 各等級的統計快照
+
+        returns:
+            • stats (dict)  - {'safety': {'depth', 'submitted', 'sent', 'expired',
+                               'overflow', 'preempted', 'coalesced', 'max_depth',
+                               'queue_wait'}, ...}
+        """
+        with self._cond:
+            return {
+                name: {
+                    'depth':      len(queue),
+                    'submitted':  stats.submitted,
+                    'sent':       stats.sent,
+                    'expired':    stats.expired,
+                    'overflow':   stats.overflow,
+                    'preempted':  stats.preempted,
+                    'coalesced':  stats.coalesced,
+                    'max_depth':  stats.max_depth,
+                    'queue_wait': stats.queue_wait.snapshot(),
+                }
+                for name, queue, stats in zip(PRIORITY_NAMES, self._queues, self._stats)
+            }
+
+    @property
+    def sent_count(self) -> int:
+        return sum(stats.sent for stats in self._stats)
+
+    @property
+    def dropped_count(self) -> int:
+        return sum(
+            stats.expired + stats.overflow + stats.preempted for stats in self._stats
+        )
+
+    # ---------------------------------- 發送執行緒 ----------------------------------- #
+    def _next(self):
+        # 最高等級 佇列中最早的一筆 (呼叫端持有 self._cond)
+        for priority, queue in enumerate(self._queues):
+            if queue:
+                return priority, queue.popleft()
+        return None, None
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._running and not any(self._queues):
+                    self._cond.wait()
+                priority, entry = self._next()
+                if entry is None:
+                    return
+
+                # 取出後即不可再被合併; 過期 → 丟棄
+                now = time.monotonic()
+                stats = self._stats[priority]
+                if entry.deadline is not None and now > entry.deadline:
+                    stats.expired += 1
+                    log_event(
+                        _log, logging.DEBUG, 'command_expired',
+                        "[%s] 指令已過期 丟棄: %s (排隊 %.3fs)",
+                        PRIORITY_NAMES[priority], entry.name, now - entry.queued_at,
+                        priority=PRIORITY_NAMES[priority], name=entry.name,
+                    )
+                    continue
+                stats.queue_wait.observe(now - entry.queued_at)
+
+            entry.function(self.controller, *entry.args)
+            stats.sent += 1
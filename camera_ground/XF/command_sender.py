@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+File   : command_sender.py
+Author : FantasyWilly
+Email  : bc697522h04@gmail.com
+SPDX-License-Identifier: Apache-2.0
+
+開發公司:
+    • 先飛科技 (XF)
+
+功能總覽:
+    • 背景執行緒 依序發送控制命令 (輸入執行緒不再被阻塞)
+    • 雲台角度指令 (command = 0x00) 尚未發送前 以最新一筆取代 (或累加合併)
+    • 離散指令 (拍照, 錄影, 雷射...) 保證依序 且只發送一次
+
+遵循:
+    • Google Python Style Guide (含區段標題)
+    • PEP 8 (行寬 ≤ 88, snake_case, 2 空行區段分隔)
+"""
+
+# ------------------------------------------------------------------------------------ #
+# Imports
+# ------------------------------------------------------------------------------------ #
+# 標準庫
+import collections
+import threading
+from typing import Callable, Optional
+
+# 專案內部模組
+import camera_command as cm
+from gcu_controller import GCUController
+
+
+# ------------------------------------------------------------------------------------ #
+# 佇列項目種類
+# ------------------------------------------------------------------------------------ #
+_ANGLE    = 'angle'         # 雲台角度 [pitch, yaw] (可合併)
+_DISCRETE = 'discrete'      # 離散指令 (callable, args)
+
+
+# ------------------------------------------------------------------------------------ #
+# [CoalescingCommandSender] 角度指令合併 的發送執行緒
+# ------------------------------------------------------------------------------------ #
+class CoalescingCommandSender:
+    """
+    - 說明 [CoalescingCommandSender]
+        1. 呼叫端只將指令放入佇列 立即返回
+        2. 佇列尾端是尚未發送的角度指令時, 新的角度指令直接取代 (或累加) 該筆
+        3. 離散指令 不合併, 與角度指令之間的先後順序不變
+
+    args:
+        • controller (GCUController)    - 已連線的 GCU 控制器
+        • merge_angles (bool)           - True: 角度累加 (增量移動)
+                                          False: 最新一筆取代 (default)
+    """
+
+    def __init__(
+        self,
+        controller: GCUController,
+        merge_angles: bool = False,
+    ) -> None:
+
+        # 接收參數
+        self.controller   = controller
+        self.merge_angles = merge_angles
+
+        # 待發送佇列: [種類, 內容]
+        self._queue: collections.deque = collections.deque()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+        # 統計
+        self.sent_count      = 0
+        self.coalesced_count = 0
+
+    # ----------------------------------- 啟動 / 停止 --------------------------------- #
+    def start(self) -> None:
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name="gcu-command-sender", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = None) -> None:
+        """
+        - 說明 [stop] 停止發送執行緒 (佇列中剩餘的指令 仍會先送出)
+        """
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def __enter__(self) -> "CoalescingCommandSender":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    # ---------------------------------- 放入 角度指令 -------------------------------- #
+    def control_gimbal(self, pitch: float, yaw: float, merge: bool = None) -> None:
+        """
+        - 說明 [control_gimbal] 放入 1 個角度指令
+
+        args:
+            • pitch, yaw (float)    - 角度值 (°)
+            • merge (bool)          - 本次是否累加 (default: None → 依 merge_angles)
+        """
+        if merge is None:
+            merge = self.merge_angles
+
+        with self._cond:
+            tail = self._queue[-1] if self._queue else None
+            if tail is not None and tail[0] == _ANGLE:
+                if merge:
+                    tail[1][0] += pitch
+                    tail[1][1] += yaw
+                else:
+                    tail[1][0] = pitch
+                    tail[1][1] = yaw
+                self.coalesced_count += 1
+            else:
+                self._queue.append([_ANGLE, [pitch, yaw]])
+                self._cond.notify()
+
+    # ---------------------------------- 放入 離散指令 -------------------------------- #
+    def submit(self, command: Callable[..., None], *args) -> None:
+        """
+        - 說明 [submit] 放入 1 個離散指令 (例如 cm.photo), 依序只發送一次
+
+        args:
+            • command (Callable)    - camera_command 中的指令函式
+            • *args                 - 除 controller 以外的參數
+        """
+        with self._cond:
+            self._queue.append([_DISCRETE, (command, args)])
+            self._cond.notify()
+
+    # ---------------------------------- 佇列長度 ------------------------------------- #
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._queue)
+
+    # ---------------------------------- 發送執行緒 ----------------------------------- #
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._running and not self._queue:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                # 取出後即不可再被合併
+                kind, payload = self._queue.popleft()
+
+            if kind == _ANGLE:
+                pitch, yaw = payload
+                cm.control_gimbal(self.controller, pitch=pitch, yaw=yaw)
+            else:
+                command, args = payload
+                command(self.controller, *args)
+            self.sent_count += 1
@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+File   : gcu_capture.py
+Author : FantasyWilly
+Email  : bc697522h04@gmail.com
+SPDX-License-Identifier: Apache-2.0
+
+開發公司:
+    • 先飛科技 (XF)
+
+功能總覽:
+    • 記錄 GCU 收發封包 (時間戳 + 方向 + 原始封包) 為只追加的二進位檔
+    • 稀疏時間索引 (獨立 .idx 檔), 長時間紀錄可直接跳到任一時間點
+    • 以 mmap 讀取紀錄 (不需整個載入記憶體)
+    • 重播: 依原始時間 / 最快速度 將紀錄送給 本機伺服器 或 客戶端
+
+檔案格式 (little-endian):
+    • 紀錄檔:  檔頭 '<8sdd' (MAGIC, 開始時的 time.time, 開始時的 time.monotonic)
+               + 多筆紀錄 '<dBH' (time.monotonic, 方向, 長度) + 封包
+    • 方向:    TX (寫入 socket 之前記錄) / RX / TX_FAILED (前一筆相同的 TX 發送失敗)
+    • 索引檔:  多筆 '<dQ' (time.monotonic, 紀錄檔位移), 每隔 index_interval 秒 1 筆
+
+使用方式:
+    python3 gcu_capture.py info  flight.gcap
+    python3 gcu_capture.py dump  flight.gcap --start 60 --end 65
+    python3 gcu_capture.py send  flight.gcap --host 127.0.0.1 --port 9999
+    python3 gcu_capture.py serve flight.gcap --port 9999 --speed 0
+
+遵循:
+    • Google Python Style Guide (含區段標題)
+    • PEP 8 (行寬 ≤ 88, snake_case, 2 空行區段分隔)
+"""
+
+# ------------------------------------------------------------------------------------ #
+# Imports
+# ------------------------------------------------------------------------------------ #
+# 標準庫
+import argparse
+import mmap
+import os
+import socket
+import struct
+import threading
+import time
+from typing import Iterator, NamedTuple, Optional, Tuple
+
+# 專案內部模組
+from camera_protocol import HEADER, PREFIX_SIZE
+from gcu_stream import GcuFrameBuffer, GcuStreamReader
+
+
+# ------------------------------------------------------------------------------------ #
+# 檔案格式
+# ------------------------------------------------------------------------------------ #
+MAGIC = b'GCUCAP01'
+
+FILE_HEADER  = struct.Struct('<8sdd')
+RECORD_HEAD  = struct.Struct('<dBH')
+INDEX_ENTRY  = struct.Struct('<dQ')
+
+TX = 0                      # 地面站 → GCU (控制封包)
+RX = 1                      # GCU → 地面站 (返回封包)
+TX_FAILED = 2               # 前一筆相同的 TX 發送失敗 (寫入 socket 時拋出例外)
+
+INDEX_SUFFIX = '.idx'
+
+
+class CaptureFormatError(ValueError):
+    """不是 GCU 紀錄檔 或 檔頭損毀"""
+
+
+class CaptureRecord(NamedTuple):
+    """
+    - 說明 [CaptureRecord] 紀錄檔中的 1 筆封包
+
+    args:
+        • timestamp (float) - 收發時間 (time.monotonic)
+        • direction (int)   - TX / RX
+        • payload (bytes)   - 原始封包 (含 CRC)
+    """
+    timestamp: float
+    direction: int
+    payload: bytes
+
+
+# ------------------------------------------------------------------------------------ #
+# [GcuRecorder] 寫入紀錄檔
+# ------------------------------------------------------------------------------------ #
+class GcuRecorder:
+    """
+    - 說明 [GcuRecorder]
+        1. 只追加寫入 (程式中斷時 最多遺失緩衝區中的最後幾筆)
+        2. 距離上一筆索引超過 index_interval 秒 → 在 .idx 檔追加 1 筆索引
+        3. 可同時由 發送端 & 接收執行緒 呼叫 (內部加鎖)
+
+    args:
+        • path (str)                - 紀錄檔路徑 (已存在則覆寫)
+        • index_interval (float)    - 索引間隔 (default: 1s)
+    """
+
+    def __init__(self, path: str, index_interval: float = 1.0) -> None:
+        self.path = path
+        self.index_interval = index_interval
+
+        self._lock = threading.Lock()
+        self._file = open(path, 'wb')
+        self._index = open(path + INDEX_SUFFIX, 'wb')
+        self._file.write(FILE_HEADER.pack(MAGIC, time.time(), time.monotonic()))
+        self._offset = FILE_HEADER.size
+        self._next_index = float('-inf')
+
+        # 統計
+        self.records = 0
+
+    # ----------------------------------- 寫入 1 筆 ----------------------------------- #
+    def record(self, direction: int, payload: bytes, timestamp: float = None) -> None:
+        with self._lock:
+            if self._file.closed:
+                return
+            # 在鎖內取時間, 紀錄順序 = 時間順序 (索引二分搜尋的前提)
+            if timestamp is None:
+                timestamp = time.monotonic()
+            head = RECORD_HEAD.pack(timestamp, direction, len(payload))
+            if timestamp >= self._next_index:
+                self._index.write(INDEX_ENTRY.pack(timestamp, self._offset))
+                self._next_index = timestamp + self.index_interval
+            self._file.write(head)
+            self._file.write(payload)
+            self._offset += len(head) + len(payload)
+            self.records += 1
+
+    def record_tx(self, packet: bytes) -> None:
+        self.record(TX, packet)
+
+    def record_rx(self, response: bytes) -> None:
+        self.record(RX, response)
+
+    def record_tx_failed(self, packet: bytes) -> None:
+        self.record(TX_FAILED, packet)
+
+    # ----------------------------------- 寫入磁碟 / 關閉 ----------------------------- #
+    def flush(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+                self._index.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+                self._index.close()
+
+    def __enter__(self) -> "GcuRecorder":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+# ------------------------------------------------------------------------------------ #
+# [GcuCapture] 以 mmap 讀取紀錄檔
+# ------------------------------------------------------------------------------------ #
+class GcuCapture:
+    """
+    - 說明 [GcuCapture]
+        1. 紀錄檔 & 索引檔 皆以 mmap 開啟 (唯讀)
+        2. [seek] 在索引檔上二分搜尋, 只需從最近的索引點 往後掃描 1 個間隔
+        3. 沒有索引檔時 從檔頭開始掃描
+        4. 最後一筆不完整 (寫入中斷) → 忽略
+
+    args:
+        • path (str)    - 紀錄檔路徑
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+        with open(path, 'rb') as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._data) < FILE_HEADER.size:
+            raise CaptureFormatError(f"檔案太短: {path}")
+        magic, self.wall_start, self.start = FILE_HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC:
+            raise CaptureFormatError(f"不是 GCU 紀錄檔: {path}")
+
+        self._index: Optional[mmap.mmap] = None
+        index_path = path + INDEX_SUFFIX
+        if os.path.exists(index_path) and os.path.getsize(index_path) >= INDEX_ENTRY.size:
+            with open(index_path, 'rb') as f:
+                self._index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self) -> None:
+        self._data.close()
+        if self._index is not None:
+            self._index.close()
+
+    def __enter__(self) -> "GcuCapture":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # ----------------------------------- 時間定位 ----------------------------------- #
+    def _index_count(self) -> int:
+        return len(self._index) // INDEX_ENTRY.size if self._index is not None else 0
+
+    def seek(self, timestamp: float) -> int:
+        """
+        - 說明 [seek] 回傳 最後一個時間 ≤ timestamp 的索引點 在紀錄檔中的位移
+
+        args:
+            • timestamp (float) - time.monotonic 時間 (相對時間請加上 self.start)
+        """
+        low, high = 0, self._index_count()
+        while low < high:
+            mid = (low + high) // 2
+            if INDEX_ENTRY.unpack_from(self._index, mid * INDEX_ENTRY.size)[0] <= timestamp:
+                low = mid + 1
+            else:
+                high = mid
+        if low == 0:
+            return FILE_HEADER.size
+        return INDEX_ENTRY.unpack_from(self._index, (low - 1) * INDEX_ENTRY.size)[1]
+
+    # ----------------------------------- 讀取紀錄 ----------------------------------- #
+    @property
+    def buffer(self) -> mmap.mmap:
+        """整個紀錄檔 (唯讀 mmap), 配合 [offsets] 可不複製地存取封包"""
+        return self._data
+
+    def offsets(
+        self,
+        start: float = None,
+        end: float = None,
+        direction: int = None,
+    ) -> Iterator[Tuple[float, int, int, int]]:
+        """
+        - 說明 [offsets] 依時間順序 列出紀錄位置 (不複製封包)
+
+        args:
+            • start, end (float)    - 相對於紀錄開始的秒數 (default: None → 不限)
+            • direction (int)       - 只取 TX / RX (default: None → 全部)
+
+        returns:
+            • (timestamp, direction, offset, length) - offset 為封包在 [buffer] 中的位置
+        """
+        data = self._data
+        size = len(data)
+        head_size = RECORD_HEAD.size
+        start_ts = self.start + start if start is not None else None
+        end_ts = self.start + end if end is not None else None
+
+        offset = self.seek(start_ts) if start_ts is not None else FILE_HEADER.size
+        while offset + head_size <= size:
+            timestamp, record_dir, length = RECORD_HEAD.unpack_from(data, offset)
+            payload_at = offset + head_size
+            offset = payload_at + length
+            if offset > size:
+                return
+            if start_ts is not None and timestamp < start_ts:
+                continue
+            if end_ts is not None and timestamp > end_ts:
+                return
+            if direction is None or record_dir == direction:
+                yield timestamp, record_dir, payload_at, length
+
+    def records(
+        self,
+        start: float = None,
+        end: float = None,
+        direction: int = None,
+    ) -> Iterator[CaptureRecord]:
+        """
+        - 說明 [records] 依時間順序 讀取紀錄 (參數同 [offsets])
+        """
+        data = self._data
+        for timestamp, record_dir, offset, length in self.offsets(start, end, direction):
+            yield CaptureRecord(timestamp, record_dir, data[offset:offset + length])
+
+    def __iter__(self) -> Iterator[CaptureRecord]:
+        return self.records()
+
+    def summary(self) -> dict:
+        counts = {TX: 0, RX: 0, TX_FAILED: 0}
+        first = last = None
+        for record in self.records():
+            counts[record.direction] = counts.get(record.direction, 0) + 1
+            if first is None:
+                first = record.timestamp
+            last = record.timestamp
+        return {
+            'path': self.path,
+            'started': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.wall_start)),
+            'duration_s': (last - first) if first is not None else 0.0,
+            'tx': counts[TX],
+            'rx': counts[RX],
+            'tx_failed': counts[TX_FAILED],
+            'index_entries': self._index_count(),
+        }
+
+
+# ------------------------------------------------------------------------------------ #
+# 重播
+# ------------------------------------------------------------------------------------ #
+def paced(records: Iterator[CaptureRecord], speed: float = 1.0) -> Iterator[CaptureRecord]:
+    """
+    - 說明 [paced] 依原始時間間隔 (÷ speed) 逐筆產出紀錄; speed ≤ 0 → 不等待
+    """
+    origin = None
+    for record in records:
+        if speed > 0:
+            if origin is None:
+                origin = (record.timestamp, time.monotonic())
+            due = origin[1] + (record.timestamp - origin[0]) / speed
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        yield record
+
+
+def send_capture(
+    capture: GcuCapture,
+    host: str,
+    port: int,
+    speed: float = 1.0,
+    start: float = None,
+    end: float = None,
+) -> int:
+    """
+    - 說明 [send_capture] 扮演地面站: 將紀錄中的控制封包 (TX) 送給 GCU / 模擬器
+
+    returns:
+        • replies (int) - 收到的完整回覆數量
+    """
+    sock = socket.create_connection((host, port))
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    reader = GcuStreamReader(sock)
+    replies = 0
+
+    def drain() -> None:
+        nonlocal replies
+        try:
+            for _ in reader.frames():
+                replies += 1
+        except (ConnectionError, OSError):
+            pass
+
+    thread = threading.Thread(target=drain, name="gcu-capture-drain", daemon=True)
+    thread.start()
+    try:
+        for record in paced(capture.records(start, end, TX), speed):
+            sock.sendall(record.payload)
+        # 等待最後幾筆回覆
+        time.sleep(0.5)
+    finally:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        sock.close()
+        thread.join(1.0)
+    return replies
+
+
+def serve_capture(
+    capture: GcuCapture,
+    host: str = '127.0.0.1',
+    port: int = 9999,
+    speed: float = 1.0,
+    start: float = None,
+    end: float = None,
+) -> int:
+    """
+    - 說明 [serve_capture] 扮演 GCU: 等待 1 個客戶端連線, 將紀錄中的返回封包 (RX) 送出
+        • speed > 0  → 依原始時間間隔送出 (÷ speed)
+        • speed ≤ 0  → 每收到 1 個控制封包 回覆下一筆 (GCUController 可直接連線)
+
+    returns:
+        • sent (int)    - 送出的回覆數量
+    """
+    server = socket.create_server((host, port))
+    print(f"[gcu_capture] 等待客戶端連線 {host}:{server.getsockname()[1]}")
+    conn, address = server.accept()
+    server.close()
+    conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    print(f"[gcu_capture] 客戶端已連線: {address[0]}:{address[1]}")
+
+    replies = capture.records(start, end, RX)
+    sent = 0
+    try:
+        if speed > 0:
+            for record in paced(replies, speed):
+                conn.sendall(record.payload)
+                sent += 1
+        else:
+            # 控制封包 (0xA8 0xE5) 最短 = 前綴 + 指令 + CRC
+            reader = GcuStreamReader(
+                conn, GcuFrameBuffer(header=HEADER, min_length=PREFIX_SIZE + 3)
+            )
+            for record in replies:
+                reader.read_frame()
+                conn.sendall(record.payload)
+                sent += 1
+    except (ConnectionError, OSError) as e:
+        print("[gcu_capture] 客戶端中斷:", e)
+    finally:
+        conn.close()
+    return sent
+
+
+# ------------------------------------------------------------------------------------ #
+# 主程式
+# ------------------------------------------------------------------------------------ #
+def main() -> None:
+    parser = argparse.ArgumentParser(description="GCU 收發紀錄 檢視 & 重播")
+    parser.add_argument('action', choices=('info', 'dump', 'send', 'serve'))
+    parser.add_argument('path', help="紀錄檔路徑")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9999)
+    parser.add_argument('--speed', type=float, default=1.0, help="重播倍速 (0 = 最快)")
+    parser.add_argument('--start', type=float, default=None, help="開始秒數 (相對)")
+    parser.add_argument('--end', type=float, default=None, help="結束秒數 (相對)")
+    args = parser.parse_args()
+
+    with GcuCapture(args.path) as capture:
+        if args.action == 'info':
+            for key, value in capture.summary().items():
+                print(f"{key:>14}: {value}")
+        elif args.action == 'dump':
+            for record in capture.records(args.start, args.end):
+                mark = {TX: 'TX', RX: 'RX', TX_FAILED: 'TX!'}.get(record.direction, '??')
+                print(
+                    f"{record.timestamp - capture.start:12.6f} {mark}"
+                    f" {record.payload.hex().upper()}"
+                )
+        elif args.action == 'send':
+            replies = send_capture(
+                capture, args.host, args.port, args.speed, args.start, args.end
+            )
+            print(f"[gcu_capture] 收到回覆: {replies}")
+        else:
+            sent = serve_capture(
+                capture, args.host, args.port, args.speed, args.start, args.end
+            )
+            print(f"[gcu_capture] 送出回覆: {sent}")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,7 +13,15 @@ SPDX-License-Identifier: Apache-2.0
 功能總覽:
     • 管理TCP連線
     • 發送控制命令
+    • 多個指令 1 次寫出 & 依序對應回覆 (send_batch)
+    • 依協議頭 & 長度 重組返回封包
+    • 管線模式 (背景接收執行緒 + 每個指令一個 Future)
+    • 斷線自動重連 & 在途指令 重送 / 丟棄
+    • 各指令 耗時 & 錯誤統計 (gcu_metrics)
+    • 收發封包紀錄 (gcu_capture)
+    • 低速電台 頻寬控制 (gcu_shaper, 低優先等級最先降速)
     • 連續發送空命令 & 解碼回傳資訊
+    • 最新雲台資訊快取 (夠新時 不必再發送空命令)
 
 遵循:
     • Google Python Style Guide (含區段標題)
@@ -25,12 +33,44 @@ SPDX-License-Identifier: Apache-2.0
 # Imports
 # ------------------------------------------------------------------------------------ #
 # 標準庫
+import collections
+import logging
 import socket
 import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, NamedTuple, Optional, Sequence
 
 # 專案內部模組
-from camera_protocol import build_packet
-from camera_decoder import decode_gcu_response
+from camera_protocol import PREFIX_SIZE, build_packet, expects_reply
+from camera_decoder import GcuDecodeError, GcuTelemetry, HeaderError, decode_telemetry
+from command_registry import PREBUILT_PACKETS, packet_priority
+from gcu_capture import GcuRecorder
+from gcu_logging import get_logger, log_event
+from gcu_metrics import GcuMetrics
+from gcu_shaper import TokenBucketShaper, frame_cost
+from gcu_stream import GcuStreamReader
+from gcu_transport import (
+    REPLAY, CommandDroppedError, GcuTransport, replay_policy_for
+)
+
+
+_log = get_logger('gcu_controller')
+
+
+# ------------------------------------------------------------------------------------ #
+# [CachedTelemetry] 最新解碼的雲台資訊
+# ------------------------------------------------------------------------------------ #
+class CachedTelemetry(NamedTuple):
+    """
+    - 說明 [CachedTelemetry] 任一指令回覆中 最新解碼的雲台資訊
+
+    args:
+        • timestamp (float)         - 解碼時間 (time.monotonic)
+        • telemetry (GcuTelemetry)  - 解碼後的雲台資訊
+    """
+    timestamp: float
+    telemetry: GcuTelemetry
 
 
 # ------------------------------------------------------------------------------------ #
@@ -42,13 +82,25 @@ class GCUController:
         1. 接收 IP, Port 參數
         2. 管理 TCP 連線
         3. 發送 控制命令
+        4. 管線模式 (pipelined): 背景執行緒依序接收回覆, 同一連線可同時有多個指令在途
+        5. 斷線 / 無回覆 → 自動重連, 未完成的指令 依 replay_policy 重送或丟棄
+        6. 每個回覆都含有雲台資訊 → 保留最新一筆, [get_telemetry] 夠新時不再發送空命令
 
     args:
-        • ip (str)        - 目標主機 IP
-        • port (int)      - 目標主機 Port
-        • width (int)     - 畫面像素 (寬)
-        • height (int)    - 畫面像素 (高)
-        • timeout (float) - Socket 超時時間 (default: 5s)
+        • ip (str)                  - 目標主機 IP
+        • port (int)                - 目標主機 Port
+        • width (int)               - 畫面像素 (寬)
+        • height (int)              - 畫面像素 (高)
+        • timeout (float)           - Socket 超時時間 (default: 5s)
+        • pipelined (bool)          - 是否啟用管線模式 (default: False)
+        • auto_reconnect (bool)     - 斷線後是否自動重連 (default: True)
+        • liveness_timeout (float)  - 有指令在途且超過此秒數沒收到回覆 → 視為斷線
+                                      (default: None → 同 timeout)
+        • replay_policy (dict)      - 指令代碼 → REPLAY / DROP
+                                      (default: gcu_transport.DEFAULT_REPLAY_POLICY)
+        • metrics (GcuMetrics)      - 各指令耗時 & 錯誤統計 (default: 新建)
+        • recorder (GcuRecorder)    - 記錄每個收發封包 (default: None, 不記錄)
+        • shaper (TokenBucketShaper)- 頻寬控制, 發送前取得額度 (default: None, 不限制)
     """
 
     def __init__(
@@ -57,29 +109,95 @@ class GCUController:
         port: int,
         width:int,
         height:int,  
-        timeout: float = 5.0
+        timeout: float = 5.0,
+        pipelined: bool = False,
+        auto_reconnect: bool = True,
+        liveness_timeout: float = None,
+        replay_policy: dict = None,
+        metrics: GcuMetrics = None,
+        recorder: GcuRecorder = None,
+        shaper: TokenBucketShaper = None,
     ) -> None:
 
         # 接收參數
-        self.ip     = ip
-        self.port   = port
-        self.width  = width
-        self.height = height
-        self.sock   = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.sock.settimeout(timeout)
-
-        # 保護整個 send/recv 流程
+        self.ip         = ip
+        self.port       = port
+        self.width      = width
+        self.height     = height
+        self.timeout    = timeout
+        self.pipelined  = pipelined
+
+        # 斷線處理
+        self.auto_reconnect   = auto_reconnect
+        self.liveness_timeout = liveness_timeout if liveness_timeout else timeout
+        self.replay_policy    = replay_policy
+
+        # TCP 連線 (TCP_NODELAY, keepalive, 自動重連, 返回封包重組)
+        self.transport = GcuTransport(ip, port, timeout, recorder=recorder, shaper=shaper)
+
+        # 頻寬控制 (低速電台): 發送前 依優先等級取得額度
+        self.shaper = shaper
+
+        # 非管線模式: 保護整個 send/recv 流程
+        # 管線模式:   只保護 sendall + 登記等待回覆 (確保兩者順序一致)
         self.lock = threading.Lock()
 
+        # 管線模式: 依發送順序 等待回覆的 (Future, 發送時間, 封包)
+        self._pending: collections.deque = collections.deque()
+        self._reader_thread: Optional[threading.Thread] = None
+        self._closing = False
+
+        # 沒有對應指令的回覆數量
+        self.unsolicited_replies = 0
+
+        # 最新雲台資訊 (單一參考替換, 讀取端不需加鎖) & 同時只有 1 個空命令更新
+        self._telemetry: Optional[CachedTelemetry] = None
+        self._refresh_lock = threading.Lock()
+        self.telemetry_hits   = 0
+        self.telemetry_misses = 0
+
+        # 各指令 耗時 & 錯誤統計
+        self.metrics = metrics if metrics is not None else GcuMetrics()
+
+    # ----------------------------------- 連線物件 ----------------------------------- #
+    @property
+    def sock(self) -> socket.socket:
+        return self.transport.sock
+
+    @property
+    def reader(self) -> GcuStreamReader:
+        return self.transport.reader
+
+    def is_alive(self) -> bool:
+        return self.transport.is_alive(self.liveness_timeout)
+
     # ----------------------------------- 開啟 TCP連接 -------------------------------- #
     def connect(self) -> None:
-        self.sock.connect((self.ip, self.port))
-        print(f"已連接到 GCU: {self.ip}:{self.port}")
+        self._closing = False
+        self.transport.connect()
+        log_event(
+            _log, logging.INFO, 'connect', "已連接到 GCU: %s:%s", self.ip, self.port,
+            ip=self.ip, port=self.port,
+        )
+
+        if self.pipelined:
+            self._reader_thread = threading.Thread(
+                target=self._reader_loop, name="gcu-reader", daemon=True
+            )
+            self._reader_thread.start()
 
     # ----------------------------------- 關閉 TCP連接 -------------------------------- #
     def disconnect(self) -> None:
-        self.sock.close()
-        print("連接已關閉")
+        self._closing = True
+        self.transport.close()
+
+        if self._reader_thread is not None:
+            self._reader_thread.join(self.timeout)
+            self._reader_thread = None
+        self._fail_pending(ConnectionError("連接已關閉"))
+        log_event(
+            _log, logging.INFO, 'disconnect', "連接已關閉", ip=self.ip, port=self.port
+        )
 
     # ----------------------------------- 發送 控制命令 -------------------------------- #
     def send_command(
@@ -99,48 +217,162 @@ class GCUController:
             • pitch, yaw (float)    - 控制台角度               (default: None) 
             • x0, y0, x1, y1 (int)  - 框選方框四角點            (default: None)
 
+        returns:
+            • response (bytes)      - 返回 GCU 數據格式 (不要求回覆 → b'')
+        """
+
+        # 1. 構建數據包
+        started = time.perf_counter()
+        packet = build_packet(
+            command,
+            parameters,
+            enable_request,
+            pitch=pitch, yaw=yaw,
+            x0=x0, y0=y0, x1=x1, y1=y1,
+            width=self.width, height=self.height
+        )
+        self.metrics.observe(command, 'build', time.perf_counter() - started)
+
+        # 2. 發送 & 接收本次指令的回覆
+        response = self._exchange(packet)
+
+        # 3. 解碼本次指令回覆
+        self._decode_response(response, command)
+        return response
+
+    # ------------------------------ 發送 預先組好的封包 -------------------------------- #
+    def send_packet(self, packet: bytes) -> bytes:
+        """
+        - 說明 [send_packet] 發送已組好的完整封包 (例如 command_registry.PREBUILT_PACKETS)
+
         returns:
             • response (bytes)      - 返回 GCU 數據格式
         """
+        response = self._exchange(packet)
+        self._decode_response(response, packet[PREFIX_SIZE])
+        return response
 
-        with self.lock:
+    # ------------------------------ 發送 多個封包 (1 次寫出) --------------------------- #
+    def send_batch(self, packets: Sequence[bytes]) -> List[Optional[GcuTelemetry]]:
+        """
+        - 說明 [send_batch] 多個指令 1 次寫出, 再依序接收每個指令的回覆
+            1. 所有封包以 1 次 sendmsg 寫出 (N 次往返 → 約 1 次)
+            2. 回覆依發送順序 對應到每個指令
+            3. 斷線時: 尚未收到回覆的指令 全部為 REPLAY → 重連後重送, 否則拋出
+               CommandDroppedError (非管線模式)
 
-            # 1. 構建數據包並發送
-            packet = build_packet(
-                command,
-                parameters,
-                enable_request,
-                pitch=pitch, yaw=yaw,
-                x0=x0, y0=y0, x1=x1, y1=y1,
-                width=self.width, height=self.height
-            )
-            # print("發送 [數據包] :", packet.hex().upper())
-            self.sock.sendall(packet)
+        args:
+            • packets (Sequence[bytes]) - build_packet 組好的封包
+                                          (例如 command_registry.PREBUILT_PACKETS)
 
-            # 2. 接收本次指令的回覆
-            response = self.sock.recv(256)
-            # print("接收 [返回數據] :", response.hex().upper())
+        returns:
+            • results (list)            - 每個指令的解碼結果 (GcuTelemetry, 解碼失敗 → None)
+        """
+        packets = list(packets)
+        if not packets:
+            return []
 
-        # 3. 解碼本次指令回覆
-        parsed = decode_gcu_response(response)
-        if 'error' in parsed:
-            print("解碼失敗:", parsed['error'])
+        if self.pipelined:
+            futures = self._submit_packets(packets)
+            responses = [future.result(self.timeout) for future in futures]
         else:
-            rollangle   = parsed['rollangle']
-            pitchangle  = parsed['pitchangle']
-            yawangle    = parsed['yawangle']
-            zoom        = parsed['zoom']
-            targetdist  = parsed['targetdist']
-            # print(
-            #     f"接收 [解碼]:"
-            #     f" roll={rollangle:.2f},"
-            #     f" pitch={pitchangle:.2f},"
-            #     f" yaw={yawangle:.2f},"
-            #     f" ratio={zoom:.1f}"
-            #     f" ratio={targetdist:.1f}"
-            # )
+            responses = self._exchange_batch(packets)
 
-        return response
+        return [
+            self._decode_response(response, packet[PREFIX_SIZE])
+            for packet, response in zip(packets, responses)
+        ]
+
+    # ------------------------------ 發送 控制命令 (管線模式) ---------------------------- #
+    def submit_command(
+        self,
+        command: int,
+        parameters: bytes = b'',
+        enable_request: bool = None,
+        pitch: float = None, yaw: float = None,
+        x0: int = None, y0: int = None, x1: int = None, y1: int = None,
+        callback: Callable[[Future], None] = None,
+    ) -> Future:
+
+        """
+        - 說明 [submit_command] 發送後立即返回, 不等待回覆 (須啟用 pipelined)
+
+        args:
+            • (同 send_command)
+            • callback (Callable)   - 收到回覆 / 失敗時呼叫, 參數為 Future (default: None)
+
+        returns:
+            • future (Future)       - 結果為 返回 GCU 數據格式 (bytes)
+                                      (不要求回覆 → 寫出後立即完成, 結果為 b'')
+        """
+
+        started = time.perf_counter()
+        packet = build_packet(
+            command,
+            parameters,
+            enable_request,
+            pitch=pitch, yaw=yaw,
+            x0=x0, y0=y0, x1=x1, y1=y1,
+            width=self.width, height=self.height
+        )
+        self.metrics.observe(command, 'build', time.perf_counter() - started)
+        future = self._submit_packet(packet)
+        if callback is not None:
+            future.add_done_callback(callback)
+        return future
+
+    # ------------------------------ 讀取 雲台資訊 (快取) ------------------------------ #
+    def cached_telemetry(self) -> Optional[CachedTelemetry]:
+        """最新解碼的雲台資訊 (不發送指令), 尚未收到任何回覆 → None"""
+        return self._telemetry
+
+    def telemetry_snapshot(self, max_age: float = 0.1) -> Optional[CachedTelemetry]:
+        """
+        - 說明 [telemetry_snapshot] 取得不超過 max_age 秒的雲台資訊
+            1. 快取夠新 → 直接回傳 (不發送)
+            2. 太舊 → 發送空命令更新 (多個執行緒同時要求時 只發送 1 次, 其餘共用結果)
+
+        args:
+            • max_age (float)   - 可接受的最久資訊 (秒, default: 0.1)
+
+        returns:
+            • cached (CachedTelemetry | None)   - 空命令回覆無法解碼 → None
+
+        raises:
+            • TimeoutError          - 等待回覆 / 頻寬額度逾時
+                                      (管線模式: concurrent.futures.TimeoutError)
+            • CommandDroppedError   - 斷線重連, 空命令已丟棄
+            • OSError               - 連線錯誤 (未啟用自動重連 或 重連失敗)
+        """
+        cached = self._telemetry
+        if cached is not None and time.monotonic() - cached.timestamp <= max_age:
+            self.telemetry_hits += 1
+            return cached
+
+        with self._refresh_lock:
+            # 等待期間 其他執行緒 (或其他指令的回覆) 可能已更新
+            cached = self._telemetry
+            if cached is not None and time.monotonic() - cached.timestamp <= max_age:
+                self.telemetry_hits += 1
+                return cached
+
+            self.telemetry_misses += 1
+            packet = PREBUILT_PACKETS['empty']
+            response = self._exchange(packet)
+            if self._decode_response(response, packet[PREFIX_SIZE]) is None:
+                return None
+            # 接收時已更新快取 (期間若有更新的回覆 則為該筆)
+            return self._telemetry
+
+    def get_telemetry(self, max_age: float = 0.1) -> Optional[GcuTelemetry]:
+        """
+        - 說明 [get_telemetry] 取得不超過 max_age 秒的雲台資訊 (見 telemetry_snapshot)
+
+        returns:
+            • telemetry (GcuTelemetry | None)   - 空命令回覆無法解碼 → None
+        """
+        cached = self.telemetry_snapshot(max_age)
+        return None if cached is None else cached.telemetry
 
     # ---------------------------------  不斷 發送空命令 ------------------------------- #
     def loop_send_command(
@@ -150,38 +382,342 @@ class GCUController:
         enable_request: bool = True,
     ) -> bytes:
         
+        # 1. 構建數據包
+        started = time.perf_counter()
+        packet = build_packet(
+            command, 
+            parameters, 
+            enable_request
+        )
+        self.metrics.observe(command, 'build', time.perf_counter() - started)
+
+        # 2. 發送 & 接收本次指令的回覆
+        response = self._exchange(packet)
+
+        # 3. 解碼本次指令回覆
+        self._decode_response(response, command)
+        return response
+
+    # ------------------------------------------------------------------------------------ #
+    # 內部流程
+    # ------------------------------------------------------------------------------------ #
+    # ---------------------------------- 發送 & 接收 1 包 ------------------------------- #
+    def _exchange(self, packet: bytes) -> bytes:
+        if self.pipelined:
+            return self._submit_packet(packet).result(self.timeout)
+
+        command = packet[PREFIX_SIZE]
+        metrics = self.metrics
+        metrics.count(command, 'requests')
+        self._shape([packet])
+
+        waited = time.perf_counter()
+        with self.lock:
+            locked = time.perf_counter()
+            metrics.observe(command, 'lock_wait', locked - waited)
+            try:
+                # print("發送 [數據包] :", packet.hex().upper())
+                self.transport.sendall(packet)
+                sent = time.perf_counter()
+                metrics.observe(command, 'send', sent - locked)
+
+                # 不要求回覆的封包 GCU 不會回覆 → 不等待
+                if not expects_reply(packet):
+                    return b''
+                response = self._read_frame()
+                metrics.observe(command, 'reply_wait', time.perf_counter() - sent)
+                # print("接收 [返回數據] :", response.hex().upper())
+            except OSError as e:
+                metrics.count(
+                    command, 'timeouts' if isinstance(e, socket.timeout) else 'errors'
+                )
+                if not self.auto_reconnect or self._closing:
+                    raise
+                log_event(
+                    _log, logging.WARNING, 'reconnect',
+                    "[GCUController] 連線中斷, 重新連線: %s", e, code=command,
+                )
+                self.transport.reconnect()
+                if replay_policy_for(packet, self.replay_policy) != REPLAY:
+                    raise CommandDroppedError("斷線重連, 指令已丟棄") from e
+                self.transport.sendall(packet)
+                response = self._read_frame() if expects_reply(packet) else b''
+        return response
+
+    # ---------------------------------- 發送 & 接收 多包 ------------------------------- #
+    def _exchange_batch(self, packets: List[bytes]) -> List[bytes]:
+        commands = [packet[PREFIX_SIZE] for packet in packets]
+        metrics = self.metrics
+        for command in commands:
+            metrics.count(command, 'requests')
+        self._shape(packets)
+
+        responses: List[bytes] = []
+        waited = time.perf_counter()
         with self.lock:
+            locked = time.perf_counter()
+            for command in commands:
+                metrics.observe(command, 'lock_wait', locked - waited)
+
+            remaining = packets
+            while True:
+                try:
+                    self.transport.send_packets(remaining)
+                    sent = time.perf_counter()
+                    for packet in remaining:
+                        metrics.observe(packet[PREFIX_SIZE], 'send', sent - locked)
+
+                    for packet in remaining:
+                        responses.append(
+                            self._read_frame() if expects_reply(packet) else b''
+                        )
+                        metrics.observe(
+                            packet[PREFIX_SIZE], 'reply_wait', time.perf_counter() - sent
+                        )
+                    return responses
+                except OSError as e:
+                    # 尚未收到回覆的指令
+                    remaining = packets[len(responses):]
+                    command = remaining[0][PREFIX_SIZE]
+                    metrics.count(
+                        command, 'timeouts' if isinstance(e, socket.timeout) else 'errors'
+                    )
+                    if not self.auto_reconnect or self._closing:
+                        raise
+                    log_event(
+                        _log, logging.WARNING, 'reconnect',
+                        "[GCUController] 連線中斷, 重新連線: %s", e,
+                        code=command, inflight=len(remaining),
+                    )
+                    self.transport.reconnect()
+                    if any(
+                        replay_policy_for(packet, self.replay_policy) != REPLAY
+                        for packet in remaining
+                    ):
+                        raise CommandDroppedError("斷線重連, 指令已丟棄") from e
+                    locked = time.perf_counter()
+
+    # ---------------------------------- 頻寬控制 ------------------------------------- #
+    def _shape(self, packets: List[bytes]) -> None:
+        """
+        - 說明 [_shape] 發送前取得額度 (以整批中最高的優先等級 一次取得)
+
+        raises:
+            • TimeoutError  - 超過 timeout 仍無足夠額度
+        """
+        shaper = self.shaper
+        if shaper is None:
+            return
+        priority = min(packet_priority(packet) for packet in packets)
+        started = time.perf_counter()
+        granted = shaper.acquire(
+            sum(frame_cost(packet) for packet in packets), priority, self.timeout
+        )
+        waited = time.perf_counter() - started
+        for packet in packets:
+            self.metrics.observe(packet[PREFIX_SIZE], 'shape_wait', waited)
+        if not granted:
+            for packet in packets:
+                self.metrics.count(packet[PREFIX_SIZE], 'timeouts')
+            raise TimeoutError("頻寬額度不足, 等待逾時")
+
+    # ---------------------------------- 管線模式 發送 -------------------------------- #
+    def _submit_packet(self, packet: bytes) -> Future:
+        return self._submit_packets([packet])[0]
 
-            # 1. 構建數據包並發送
-            packet = build_packet(
-                command, 
-                parameters, 
-                enable_request
+    def _submit_packets(self, packets: List[bytes]) -> List[Future]:
+        if not self.pipelined:
+            raise RuntimeError("submit_command 需要啟用 pipelined 模式")
+
+        commands = [packet[PREFIX_SIZE] for packet in packets]
+        metrics = self.metrics
+        for command in commands:
+            metrics.count(command, 'requests')
+        self._shape(packets)
+
+        futures = [Future() for _ in packets]
+        # 不要求回覆的封包 GCU 不會回覆 → 不登記等待者 (否則之後的回覆全部錯配)
+        replies = [expects_reply(packet) for packet in packets]
+        waited = time.perf_counter()
+        with self.lock:
+            locked = time.perf_counter()
+            now = time.monotonic()
+            for future, packet, reply in zip(futures, packets, replies):
+                metrics.observe(packet[PREFIX_SIZE], 'lock_wait', locked - waited)
+                if reply:
+                    self._pending.append((future, now, packet))
+            try:
+                if len(packets) == 1:
+                    self.transport.sendall(packets[0])
+                else:
+                    self.transport.send_packets(packets)
+                sent = time.perf_counter()
+                for command in commands:
+                    metrics.observe(command, 'send', sent - locked)
+            except OSError as e:
+                for command in commands:
+                    metrics.count(command, 'errors')
+                # 自動重連時 由接收執行緒 依策略重送或丟棄 (不要求回覆的封包 無法得知是否送達)
+                give_up = not self.auto_reconnect or self._closing
+                for future, reply in reversed(list(zip(futures, replies))):
+                    if reply and give_up:
+                        self._pending.pop()
+                    if give_up or not reply:
+                        future.set_exception(e)
+                return futures
+
+        # 已寫出 且不要求回覆 → 立即完成 (結果為 b'')
+        for future, reply in zip(futures, replies):
+            if not reply and future.set_running_or_notify_cancel():
+                future.set_result(b'')
+        return futures
+
+    # ---------------------------------- 管線模式 接收 -------------------------------- #
+    def _reader_loop(self) -> None:
+        while not self._closing:
+            try:
+                response = self._read_frame()
+            except socket.timeout as e:
+                # 有指令在途 且太久沒收到任何回覆 → 視為斷線
+                if self._pending and self.transport.silence() >= self.liveness_timeout:
+                    if self._recover(e):
+                        continue
+                    return
+                self._expire_pending()
+                continue
+            except OSError as e:
+                if self._recover(e):
+                    continue
+                return
+
+            # 回覆依發送順序 對應到最早的等待者
+            try:
+                future, sent, packet = self._pending.popleft()
+            except IndexError:
+                self.unsolicited_replies += 1
+                continue
+            self.metrics.observe(
+                packet[PREFIX_SIZE], 'reply_wait', time.monotonic() - sent
             )
-            # print("發送 [數據包] :", packet.hex().upper())
-            self.sock.sendall(packet)
 
-            # 2. 接收本次指令的回覆
-            response = self.sock.recv(256)
-            # print("接收 [返回數據] :", response.hex().upper())
+            # 已逾時的等待者 只消耗這筆遲到的回覆 (不可交給下一個指令)
+            if not future.done() and future.set_running_or_notify_cancel():
+                future.set_result(response)
 
-        # 3. 解碼本次指令回覆
-        parsed = decode_gcu_response(response)
-        if 'error' in parsed:
-            print("解碼失敗:", parsed['error'])
-        else:
-            rollangle   = parsed['rollangle']
-            pitchangle  = parsed['pitchangle']
-            yawangle    = parsed['yawangle']
-            zoom        = parsed['zoom']
-            targetdist  = parsed['targetdist']
+    # ---------------------------------- 管線模式 斷線重連 ------------------------------- #
+    def _recover(self, error: BaseException) -> bool:
+        """
+        - 說明 [_recover] 重連並依策略 重送 / 丟棄 在途指令
+
+        returns:
+            • recovered (bool)  - 是否已重新連線 (False → 接收執行緒結束)
+        """
+        if self._closing or not self.auto_reconnect:
+            if not self._closing:
+                log_event(
+                    _log, logging.ERROR, 'reader_stopped',
+                    "[GCUController] 接收執行緒中止: %s", error,
+                )
+            self._fail_pending(error)
+            return False
+
+        log_event(
+            _log, logging.WARNING, 'reconnect',
+            "[GCUController] 連線中斷, 重新連線: %s", error, inflight=len(self._pending),
+        )
+        with self.lock:
+            # 1. 重連期間 暫停新指令發送
+            try:
+                self.transport.reconnect()
+            except ConnectionError as e:
+                self._fail_pending(e)
+                return False
+
+            # 2. 在途指令 依策略分類
+            inflight = list(self._pending)
+            self._pending.clear()
+            dropped = CommandDroppedError("斷線重連, 指令已丟棄")
+            for future, _, packet in inflight:
+                if future.done():
+                    # 已逾時 / 已取消 → 舊連線的回覆不會再到達, 不必保留
+                    continue
+                if replay_policy_for(packet, self.replay_policy) == REPLAY:
+                    self._pending.append((future, time.monotonic(), packet))
+                elif future.set_running_or_notify_cancel():
+                    future.set_exception(dropped)
+
+            # 3. 依原順序重送 (失敗則留在佇列, 下次重連再送)
+            try:
+                if self._pending:
+                    self.transport.send_packets([packet for _, _, packet in self._pending])
+            except OSError:
+                pass
+        return True
+
+    # ---------------------------------- 清除逾時等待者 -------------------------------- #
+    def _expire_pending(self) -> None:
+        """
+        - 說明 [_expire_pending] 逾時的等待者 設為 TimeoutError, 但仍保留在佇列中
+            • 之後到達的回覆 依序由它消耗 → 不會錯配給下一個指令
+            • 回覆一直沒到達 → 超過 liveness_timeout 後 重連清除
+        """
+        deadline = time.monotonic() - self.timeout
+        with self.lock:
+            for future, sent, packet in self._pending:
+                if sent >= deadline:
+                    break
+                if future.done():
+                    continue
+                self.metrics.count(packet[PREFIX_SIZE], 'timeouts')
+                if future.set_running_or_notify_cancel():
+                    future.set_exception(TimeoutError("等待 GCU 回覆逾時"))
+
+    def _fail_pending(self, error: BaseException) -> None:
+        while self._pending:
+            future, _, _ = self._pending.popleft()
+            if not future.done() and future.set_running_or_notify_cancel():
+                future.set_exception(error)
+
+    # ---------------------------------- 接收 1 包 & 更新快取 ---------------------------- #
+    def _read_frame(self) -> bytes:
+        """
+        - 說明 [_read_frame] 讀取 1 個回覆, 並以此回覆更新雲台資訊快取
+            • 只在讀取 socket 的地方更新 (非管線: 持有 lock; 管線: 接收執行緒)
+              → 快取順序 = 接收順序, 較舊的回覆 不會覆蓋較新的
+            • 解碼失敗 只略過快取更新 (由呼叫端自行解碼 & 記錄錯誤)
+        """
+        response = self.transport.read_frame()
+        try:
+            telemetry = decode_telemetry(response)
+        except GcuDecodeError:
+            return response
+        self._telemetry = CachedTelemetry(time.monotonic(), telemetry)
+        return response
+
+    # ---------------------------------- 解碼本次指令回覆 ------------------------------- #
+    def _decode_response(self, response: bytes, command: int) -> Optional[GcuTelemetry]:
+        # 不要求回覆的封包 沒有回覆可解碼
+        if not response:
+            return None
+        started = time.perf_counter()
+        try:
+            telemetry = decode_telemetry(response)
+            self.metrics.observe(command, 'decode', time.perf_counter() - started)
             # print(
             #     f"接收 [解碼]:"
-            #     f" roll={rollangle:.2f},"
-            #     f" pitch={pitchangle:.2f},"
-            #     f" yaw={yawangle:.2f},"
-            #     f" ratio={zoom:.1f}"
-            #     f" ratio={targetdist:.1f}"
+            #     f" roll={telemetry.rollangle:.2f},"
+            #     f" pitch={telemetry.pitchangle:.2f},"
+            #     f" yaw={telemetry.yawangle:.2f},"
+            #     f" ratio={telemetry.zoom:.1f}"
+            #     f" dist={telemetry.targetdist:.1f}"
             # )
-
-        return response    
\ No newline at end of file
+        except GcuDecodeError as e:
+            self.metrics.count(
+                command,
+                'header_errors' if isinstance(e, HeaderError) else 'decode_failures'
+            )
+            log_event(
+                _log, logging.WARNING, 'decode_error', "解碼失敗: %s", e, code=command
+            )
+            return None
+        return telemetry
@@ -0,0 +1,563 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+File   : gcu_fleet.py
+Author : FantasyWilly
+Email  : bc697522h04@gmail.com
+SPDX-License-Identifier: Apache-2.0
+
+開發公司:
+    • 先飛科技 (XF)
+
+功能總覽:
+    • 多台 GCU 共用 1 個 selectors 事件迴圈 (非阻塞 socket, 不需每台 1 個執行緒)
+    • 每台雲台 獨立的 發送佇列 & 等待回覆佇列 (單台卡住不影響其他台)
+    • 所有雲台的 解碼後雲台資訊 匯集成 1 個佇列
+    • 群組廣播 (例如 拍照 / 回中), 封包預先建好 並在同一輪連續送出
+
+遵循:
+    • Google Python Style Guide (含區段標題)
+    • PEP 8 (行寬 ≤ 88, snake_case, 2 空行區段分隔)
+"""
+
+# ------------------------------------------------------------------------------------ #
+# Imports
+# ------------------------------------------------------------------------------------ #
+# 標準庫
+import collections
+import errno
+import logging
+import queue
+import selectors
+import socket
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+# 專案內部模組
+from camera_protocol import build_packet, expects_reply
+from camera_decoder import GcuDecodeError, GcuTelemetry, decode_telemetry
+from gcu_logging import get_logger, log_event
+from gcu_stream import GcuFrameBuffer
+
+
+_log = get_logger('gcu_fleet')
+
+
+# ------------------------------------------------------------------------------------ #
+# [FleetTelemetry] 匯集後的雲台資訊
+# ------------------------------------------------------------------------------------ #
+class FleetTelemetry(NamedTuple):
+    """
+    - 說明 [FleetTelemetry] 哪一台雲台 在何時回報的雲台資訊
+
+    args:
+        • name (str)                - 雲台名稱
+        • timestamp (float)         - 收到回覆的時間 (time.monotonic)
+        • telemetry (GcuTelemetry)  - 解碼後的雲台資訊
+    """
+    name: str
+    timestamp: float
+    telemetry: GcuTelemetry
+
+
+# ------------------------------------------------------------------------------------ #
+# [_GimbalLink] 單台雲台的連線狀態 (只在事件迴圈執行緒中修改)
+# ------------------------------------------------------------------------------------ #
+class _GimbalLink:
+
+    def __init__(
+        self, name: str, ip: str, port: int, width: int, height: int
+    ) -> None:
+        self.name   = name
+        self.ip     = ip
+        self.port   = port
+        self.width  = width
+        self.height = height
+
+        # 連線
+        self.sock: Optional[socket.socket] = None
+        self.connecting = False
+        self.want_write = False
+        self.retry_at   = 0.0
+        self.backoff    = 0.0
+
+        # 發送佇列 (尚未寫入 socket 的位元組) & 依發送順序 等待回覆的 (Future, 時間)
+        self.out = bytearray()
+        self.pending: collections.deque = collections.deque()
+        self.frame_buffer = GcuFrameBuffer()
+
+        # 最新雲台資訊
+        self.latest: Optional[FleetTelemetry] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.sock is not None and not self.connecting
+
+
+# ------------------------------------------------------------------------------------ #
+# [GcuFleet] 多台 GCU 管理
+# ------------------------------------------------------------------------------------ #
+class GcuFleet:
+    """
+    - 說明 [GcuFleet]
+        1. [add] 登記雲台 (名稱, IP, Port, 畫面大小, 群組)
+        2. 背景執行緒 以 selectors 同時處理所有連線 (非阻塞 connect / send / recv)
+        3. [submit] / [send_command] 指令放入該台佇列, 回覆依發送順序對應
+        4. 等待回覆超過 timeout → 視為斷線, 在途指令失敗, 依指數退避重連
+        5. poll_hz > 0 → 對沒有在途指令的雲台 定時發送空命令, 維持雲台資訊更新
+
+    args:
+        • timeout (float)           - 等待回覆 超時時間 (default: 5s)
+        • poll_hz (float)           - 空命令輪詢頻率 (default: 0, 不輪詢)
+        • telemetry_maxsize (int)   - 匯集佇列長度, 滿了丟棄最舊一筆 (default: 1024)
+        • backoff_max (float)       - 重連等待上限 (default: 10s)
+    """
+
+    def __init__(
+        self,
+        timeout: float = 5.0,
+        poll_hz: float = 0.0,
+        telemetry_maxsize: int = 1024,
+        backoff_max: float = 10.0,
+    ) -> None:
+
+        # 接收參數
+        self.timeout       = timeout
+        self.poll_interval = 1.0 / poll_hz if poll_hz > 0 else 0.0
+        self.backoff_max   = backoff_max
+
+        # 雲台 & 群組
+        self._links: Dict[str, _GimbalLink] = {}
+        self._groups: Dict[str, List[str]] = collections.defaultdict(list)
+
+        # 其他執行緒 → 事件迴圈 的工作 (deque.append 為執行緒安全)
+        self._jobs: collections.deque = collections.deque()
+        self._selector = selectors.DefaultSelector()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ, None)
+
+        # 匯集後的雲台資訊
+        self.telemetry: queue.Queue = queue.Queue(telemetry_maxsize)
+
+        # 執行緒
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # 統計
+        self.replies               = 0
+        self.unsolicited_replies   = 0
+        self.timeouts              = 0
+        self.reconnects            = 0
+        self.last_broadcast_spread = 0.0     # 最近一次廣播 首末封包送出時間差 (s)
+
+    # ----------------------------------- 登記 雲台 ----------------------------------- #
+    def add(
+        self,
+        name: str,
+        ip: str,
+        port: int,
+        width: int,
+        height: int,
+        groups: Iterable[str] = (),
+    ) -> None:
+        if name in self._links:
+            raise ValueError(f"雲台名稱重複: {name}")
+        self._links[name] = _GimbalLink(name, ip, port, width, height)
+        for group in groups:
+            self._groups[group].append(name)
+        self._wake()
+
+    def names(self, group: str = None) -> List[str]:
+        if group is None:
+            return list(self._links)
+        if group not in self._groups:
+            raise KeyError(f"未知的群組: {group}")
+        return list(self._groups[group])
+
+    # ----------------------------------- 啟動 / 停止 --------------------------------- #
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="gcu-fleet", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = None) -> None:
+        self._stop_event.set()
+        self._wake()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def __enter__(self) -> "GcuFleet":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    # ----------------------------------- 發送 控制命令 -------------------------------- #
+    def submit(
+        self,
+        name: str,
+        command: int,
+        parameters: bytes = b'',
+        enable_request: bool = True,
+        pitch: float = None, yaw: float = None,
+        x0: int = None, y0: int = None, x1: int = None, y1: int = None,
+    ) -> Future:
+
+        """
+        - 說明 [submit] 放入該台雲台的發送佇列, 立即返回
+
+        args:
+            • name (str)            - 雲台名稱
+            • (其餘同 GCUController.send_command)
+
+        returns:
+            • future (Future)       - 結果為 返回 GCU 數據格式 (bytes)
+        """
+
+        link = self._links[name]
+        packet = build_packet(
+            command,
+            parameters,
+            enable_request,
+            pitch=pitch, yaw=yaw,
+            x0=x0, y0=y0, x1=x1, y1=y1,
+            width=link.width, height=link.height
+        )
+        future = Future()
+        self._jobs.append((link, packet, future))
+        self._wake()
+        return future
+
+    def send_command(self, name: str, command: int, *args, **kwargs) -> bytes:
+        return self.submit(name, command, *args, **kwargs).result(self.timeout)
+
+    # ----------------------------------- 群組廣播 ----------------------------------- #
+    def broadcast(
+        self,
+        command: int,
+        parameters: bytes = b'',
+        enable_request: bool = True,
+        group: str = None,
+        names: Iterable[str] = None,
+        **kwargs,
+    ) -> Dict[str, Future]:
+
+        """
+        - 說明 [broadcast] 同一指令發送給多台雲台
+            • 所有封包先在呼叫端建好, 事件迴圈在同一輪中連續 send, 不穿插其他工作
+            • 發送佇列仍有殘留資料的雲台 只能排在殘留資料之後 (不計入時間差)
+
+        args:
+            • command, parameters, enable_request  - 同 GCUController.send_command
+            • group (str)           - 群組名稱 (default: None → 全部雲台)
+            • names (Iterable[str]) - 直接指定雲台名稱 (優先於 group)
+
+        returns:
+            • futures (dict)        - 雲台名稱 → Future
+        """
+
+        targets = list(names) if names is not None else self.names(group)
+        entries = []
+        for name in targets:
+            link = self._links[name]
+            packet = build_packet(
+                command, parameters, enable_request,
+                width=link.width, height=link.height, **kwargs
+            )
+            entries.append((link, packet, Future()))
+
+        self._jobs.append(entries)
+        self._wake()
+        return {link.name: future for link, _, future in entries}
+
+    # ----------------------------------- 雲台資訊 ----------------------------------- #
+    def latest(self, name: str) -> Optional[FleetTelemetry]:
+        return self._links[name].latest
+
+    def queued(self, name: str) -> int:
+        """回傳該台雲台 等待回覆的指令數量"""
+        return len(self._links[name].pending)
+
+    # ------------------------------------------------------------------------------------ #
+    # 事件迴圈
+    # ------------------------------------------------------------------------------------ #
+    def _wake(self) -> None:
+        try:
+            self._wake_w.send(b'\x00')
+        except (BlockingIOError, OSError):
+            pass
+
+    def _run(self) -> None:
+        next_poll = time.monotonic()
+        try:
+            while not self._stop_event.is_set():
+                now = time.monotonic()
+                self._connect_due(now)
+
+                # 1. 處理 其他執行緒送來的工作
+                self._drain_jobs()
+
+                # 2. 定時輪詢
+                if self.poll_interval and now >= next_poll:
+                    self._poll_idle()
+                    next_poll = max(next_poll + self.poll_interval, now)
+
+                # 3. 等待 socket 事件 (最久等到下一次輪詢 / 重連 / 逾時檢查)
+                wait = min(self.timeout, 0.1)
+                if self.poll_interval:
+                    wait = max(0.0, min(wait, next_poll - time.monotonic()))
+                for key, mask in self._selector.select(wait):
+                    link = key.data
+                    if link is None:
+                        self._drain_wakeup()
+                    elif link.connecting:
+                        self._finish_connect(link)
+                    else:
+                        if mask & selectors.EVENT_READ:
+                            self._on_readable(link)
+                        if mask & selectors.EVENT_WRITE and link.sock is not None:
+                            self._flush(link)
+
+                # 4. 回覆逾時 → 視為斷線
+                self._check_timeouts(time.monotonic())
+        finally:
+            for link in list(self._links.values()):
+                self._close_link(link, ConnectionError("GcuFleet 已停止"), retry=False)
+            for job in self._drain(self._jobs):
+                for _, _, future in (job if isinstance(job, list) else [job]):
+                    if future.set_running_or_notify_cancel():
+                        future.set_exception(ConnectionError("GcuFleet 已停止"))
+
+    @staticmethod
+    def _drain(jobs: collections.deque):
+        while jobs:
+            yield jobs.popleft()
+
+    def _drain_wakeup(self) -> None:
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+    # ---------------------------------- 工作分派 ------------------------------------ #
+    def _drain_jobs(self) -> None:
+        for job in self._drain(self._jobs):
+            if isinstance(job, list):
+                self._send_broadcast(job)
+                continue
+            link, packet, future = job
+            self._register(link, packet, future, time.monotonic())
+            link.out += packet
+            if link.ready:
+                self._flush(link)
+
+    def _send_broadcast(self, entries: list) -> None:
+        # 1. 先登記等待者 (不影響送出時間)
+        now = time.monotonic()
+        for link, packet, future in entries:
+            self._register(link, packet, future, now)
+
+        # 2. 連續送出 (發送佇列為空的雲台 直接 send)
+        sent_times = []
+        for link, packet, _ in entries:
+            if not link.ready or link.out:
+                link.out += packet
+                continue
+            try:
+                sent = link.sock.send(packet)
+            except BlockingIOError:
+                sent = 0
+            except OSError as e:
+                self._close_link(link, e)
+                continue
+            sent_times.append(time.perf_counter())
+            if sent < len(packet):
+                link.out += packet[sent:]
+                self._update_events(link)
+
+        if len(sent_times) > 1:
+            self.last_broadcast_spread = sent_times[-1] - sent_times[0]
+
+    @staticmethod
+    def _register(link: _GimbalLink, packet: bytes, future: Future, now: float) -> None:
+        # 不要求回覆的封包 GCU 不會回覆 → 不登記等待者 (否則之後的回覆全部錯配)
+        if expects_reply(packet):
+            link.pending.append((future, now))
+        elif future.set_running_or_notify_cancel():
+            future.set_result(b'')
+
+    def _poll_idle(self) -> None:
+        packet = build_packet(0x00, b'', True)
+        now = time.monotonic()
+        # 複製一份: 其他執行緒可能同時 [add] 新的雲台
+        for link in list(self._links.values()):
+            if link.ready and not link.pending and not link.out:
+                link.pending.append((None, now))
+                link.out += packet
+                self._flush(link)
+
+    # ---------------------------------- 連線 ---------------------------------------- #
+    def _connect_due(self, now: float) -> None:
+        for link in list(self._links.values()):
+            if link.sock is None and now >= link.retry_at:
+                self._open(link)
+
+    def _open(self, link: _GimbalLink) -> None:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        sock.setblocking(False)
+
+        err = sock.connect_ex((link.ip, link.port))
+        if err not in (0, errno.EINPROGRESS, errno.EWOULDBLOCK):
+            sock.close()
+            self._schedule_retry(link, OSError(err, "連線失敗"))
+            return
+
+        link.sock = sock
+        link.connecting = True
+        link.want_write = True
+        link.frame_buffer.clear()
+        self._selector.register(sock, selectors.EVENT_WRITE, link)
+
+    def _finish_connect(self, link: _GimbalLink) -> None:
+        err = link.sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+        if err:
+            self._close_link(link, OSError(err, "連線失敗"))
+            return
+
+        link.connecting = False
+        link.backoff = 0.0
+        # 連線期間 累積的指令 由現在開始計算逾時
+        now = time.monotonic()
+        link.pending = collections.deque((f, now) for f, _ in link.pending)
+        log_event(
+            _log, logging.INFO, 'connect', "[GcuFleet] 已連接到 %s: %s:%s",
+            link.name, link.ip, link.port, gimbal=link.name, ip=link.ip, port=link.port,
+        )
+        self._flush(link)
+
+    def _schedule_retry(self, link: _GimbalLink, error: BaseException) -> None:
+        link.backoff = min(self.backoff_max, link.backoff * 2 if link.backoff else 0.5)
+        link.retry_at = time.monotonic() + link.backoff
+        self._fail_pending(link, error)
+
+    def _close_link(
+        self, link: _GimbalLink, error: BaseException, retry: bool = True
+    ) -> None:
+        if link.sock is not None:
+            try:
+                self._selector.unregister(link.sock)
+            except (KeyError, ValueError):
+                pass
+            link.sock.close()
+            link.sock = None
+            if retry:
+                log_event(
+                    _log, logging.WARNING, 'reconnect', "[GcuFleet] %s 連線中斷: %s",
+                    link.name, error, gimbal=link.name,
+                )
+                self.reconnects += 1
+        link.connecting = False
+        if retry:
+            self._schedule_retry(link, error)
+        else:
+            self._fail_pending(link, error)
+
+    def _update_events(self, link: _GimbalLink) -> None:
+        # 發送佇列有殘留資料時 才監聽可寫入事件
+        want_write = bool(link.out)
+        if want_write != link.want_write or link.connecting:
+            events = selectors.EVENT_READ
+            if want_write:
+                events |= selectors.EVENT_WRITE
+            self._selector.modify(link.sock, events, link)
+            link.want_write = want_write
+
+    # ---------------------------------- 讀寫 ---------------------------------------- #
+    def _flush(self, link: _GimbalLink) -> None:
+        try:
+            while link.out:
+                sent = link.sock.send(link.out)
+                del link.out[:sent]
+        except BlockingIOError:
+            pass
+        except OSError as e:
+            self._close_link(link, e)
+            return
+        self._update_events(link)
+
+    def _on_readable(self, link: _GimbalLink) -> None:
+        frame_buffer = link.frame_buffer
+        try:
+            nbytes = link.sock.recv_into(frame_buffer.writable())
+        except BlockingIOError:
+            return
+        except OSError as e:
+            self._close_link(link, e)
+            return
+        if nbytes == 0:
+            self._close_link(link, ConnectionError("GCU 已關閉連線"))
+            return
+        frame_buffer.commit(nbytes)
+
+        for response in frame_buffer:
+            self._dispatch(link, response)
+
+    def _dispatch(self, link: _GimbalLink, response: bytes) -> None:
+        # 1. 依發送順序 對應到最早的等待者
+        if link.pending:
+            future, _ = link.pending.popleft()
+            if future is not None and future.set_running_or_notify_cancel():
+                future.set_result(response)
+        else:
+            self.unsolicited_replies += 1
+        self.replies += 1
+
+        # 2. 匯集雲台資訊
+        try:
+            telemetry = decode_telemetry(response)
+        except GcuDecodeError:
+            return
+        item = FleetTelemetry(link.name, time.monotonic(), telemetry)
+        link.latest = item
+        try:
+            self.telemetry.put_nowait(item)
+        except queue.Full:
+            try:
+                self.telemetry.get_nowait()
+            except queue.Empty:
+                pass
+            self.telemetry.put_nowait(item)
+
+    # ---------------------------------- 逾時 ---------------------------------------- #
+    def _check_timeouts(self, now: float) -> None:
+        deadline = now - self.timeout
+        for link in list(self._links.values()):
+            if link.pending and link.pending[0][1] < deadline:
+                self.timeouts += 1
+                if link.sock is not None:
+                    self._close_link(link, TimeoutError("等待 GCU 回覆逾時"))
+                else:
+                    self._fail_pending(link, TimeoutError("等待 GCU 回覆逾時"))
+
+    @staticmethod
+    def _fail_pending(link: _GimbalLink, error: BaseException) -> None:
+        # 已告知呼叫端失敗的指令 不可在重連後 仍被送出
+        link.out.clear()
+        while link.pending:
+            future, _ = link.pending.popleft()
+            if future is not None and future.set_running_or_notify_cancel():
+                future.set_exception(error)
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+File   : gcu_logging.py
+Author : FantasyWilly
+Email  : bc697522h04@gmail.com
+SPDX-License-Identifier: Apache-2.0
+
+開發公司:
+    • 先飛科技 (XF)
+
+功能總覽:
+    • 結構化記錄 (事件名稱 + 欄位), 取代控制流程中的 print
+    • 發送端只把 LogRecord 放入佇列 (不格式化, 不寫檔), 佇列滿了直接丟棄
+    • 背景執行緒 (QueueListener) 負責格式化 & 輸出: 終端文字 / JSON-lines 檔
+    • 未呼叫 [setup_logging] 時 不輸出 (NullHandler)
+
+使用方式:
+    from gcu_logging import get_logger, log_event, setup_logging
+
+    setup_logging(level='INFO', json_path='gcu.jsonl')
+    log = get_logger('camera_command')
+    log_event(log, logging.INFO, 'command', "發送 [指令] : [photo]", name='photo', code=0x20)
+
+遵循:
+    • Google Python Style Guide (含區段標題)
+    • PEP 8 (行寬 ≤ 88, snake_case, 2 空行區段分隔)
+"""
+
+# ------------------------------------------------------------------------------------ #
+# Imports
+# ------------------------------------------------------------------------------------ #
+# 標準庫
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import time
+from typing import Optional
+
+
+# ------------------------------------------------------------------------------------ #
+# 根記錄器 (所有模組皆在 gcu.* 之下)
+# ------------------------------------------------------------------------------------ #
+ROOT_LOGGER = 'gcu'
+
+logging.getLogger(ROOT_LOGGER).addHandler(logging.NullHandler())
+
+
+def get_logger(name: str) -> logging.Logger:
+    return logging.getLogger(f'{ROOT_LOGGER}.{name}')
+
+
+def log_event(
+    logger: logging.Logger,
+    level: int,
+    event: str,
+    msg: str,
+    *args,
+    exc_info=None,
+    **fields,
+) -> None:
+    """
+    - 說明 [log_event] 記錄 1 個結構化事件
+        • 等級未啟用時 立即返回 (不建立 LogRecord)
+        • msg % args 延後到背景執行緒才格式化
+
+    args:
+        • logger (Logger)   - [get_logger] 取得的記錄器
+        • level (int)       - logging.DEBUG / INFO / WARNING / ERROR
+        • event (str)       - 事件名稱 (機器可讀, 例如 'command', 'reconnect')
+        • msg (str)         - 給人看的訊息 (可含 %s)
+        • exc_info          - 同 logging (True → 附上目前的例外)
+        • **fields          - 事件欄位 (JSON-lines 輸出時 成為最上層欄位)
+    """
+    if logger.isEnabledFor(level):
+        logger.log(
+            level, msg, *args, exc_info=exc_info, extra={'event': event, 'fields': fields}
+        )
+
+
+# ------------------------------------------------------------------------------------ #
+# [QueueHandler] 發送端: 只放入佇列
+# ------------------------------------------------------------------------------------ #
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    - 說明 [NonBlockingQueueHandler]
+        1. prepare 不呼叫 format (原本的 QueueHandler 會在呼叫端格式化訊息 & 例外)
+        2. 佇列已滿 → 丟棄並計數 (絕不阻塞呼叫端)
+    """
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+# ------------------------------------------------------------------------------------ #
+# [QueueListener] 背景執行緒: 格式化 & 輸出
+# ------------------------------------------------------------------------------------ #
+class _DrainingQueueListener(logging.handlers.QueueListener):
+    """結束時 等待佇列有空位再放入結束標記 (原本的 put_nowait 在佇列已滿時會失敗)"""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+# ------------------------------------------------------------------------------------ #
+# 輸出格式
+# ------------------------------------------------------------------------------------ #
+class TextFormatter(logging.Formatter):
+    """終端輸出: 時間 等級 [事件] 訊息 key=value ..."""
+
+    def __init__(self) -> None:
+        super().__init__('%(asctime)s %(levelname)-7s %(message)s', '%H:%M:%S')
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        fields = getattr(record, 'fields', None)
+        if fields:
+            text += '  ' + ' '.join(f'{key}={value}' for key, value in fields.items())
+        return text
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """JSON-lines 輸出: 每筆記錄 1 行 JSON 物件"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': record.created,
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(record.created))
+                    + f'.{int(record.msecs):03d}',
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'event': getattr(record, 'event', None),
+            'msg': record.getMessage(),
+        }
+        fields = getattr(record, 'fields', None)
+        if fields:
+            entry.update(fields)
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+# ------------------------------------------------------------------------------------ #
+# 設定 / 關閉
+# ------------------------------------------------------------------------------------ #
+_listener: Optional[_DrainingQueueListener] = None
+_queue_handler: Optional[NonBlockingQueueHandler] = None
+
+
+def setup_logging(
+    level='INFO',
+    json_path: str = None,
+    console: bool = True,
+    console_json: bool = False,
+    queue_size: int = 10000,
+) -> NonBlockingQueueHandler:
+    """
+    - 說明 [setup_logging] 設定 gcu.* 記錄器 (重複呼叫時 先關閉上一次的設定)
+
+    args:
+        • level (str | int)     - 最低記錄等級 (default: 'INFO')
+        • json_path (str)       - JSON-lines 輸出檔 (default: None, 不寫檔)
+        • console (bool)        - 是否輸出到 stderr (default: True)
+        • console_json (bool)   - stderr 也使用 JSON-lines (default: False)
+        • queue_size (int)      - 佇列長度, 滿了丟棄 (default: 10000)
+
+    returns:
+        • handler (NonBlockingQueueHandler) - 可讀取 handler.dropped
+    """
+    global _listener, _queue_handler
+    shutdown_logging()
+
+    handlers = []
+    if console:
+        stream = logging.StreamHandler(sys.stderr)
+        stream.setFormatter(JsonLinesFormatter() if console_json else TextFormatter())
+        handlers.append(stream)
+    if json_path:
+        file_handler = logging.FileHandler(json_path, encoding='utf-8')
+        file_handler.setFormatter(JsonLinesFormatter())
+        handlers.append(file_handler)
+
+    log_queue: queue.Queue = queue.Queue(queue_size)
+    _queue_handler = NonBlockingQueueHandler(log_queue)
+    _listener = _DrainingQueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(level)
+    root.addHandler(_queue_handler)
+    root.propagate = False
+    _listener.start()
+    return _queue_handler
+
+
+def shutdown_logging() -> None:
+    """
+    - 說明 [shutdown_logging] 輸出佇列中剩餘的記錄 並關閉檔案 (程式結束時自動呼叫)
+    """
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    logging.getLogger(ROOT_LOGGER).removeHandler(_queue_handler)
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+    _queue_handler = None
+
+
+atexit.register(shutdown_logging)
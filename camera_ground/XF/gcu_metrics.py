@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+File   : gcu_metrics.py
+Author : FantasyWilly
+Email  : bc697522h04@gmail.com
+SPDX-License-Identifier: Apache-2.0
+
+開發公司:
+    • 先飛科技 (XF)
+
+功能總覽:
+    • 依指令代碼 記錄各階段耗時 (組包, 等鎖, sendall, 等待回覆, 解碼)
+    • 記錄 解碼失敗, 協議頭錯誤, 逾時 等次數
+    • 匯出 Prometheus 文字格式 / JSON 快照
+
+遵循:
+    • Google Python Style Guide (含區段標題)
+    • PEP 8 (行寬 ≤ 88, snake_case, 2 空行區段分隔)
+"""
+
+# ------------------------------------------------------------------------------------ #
+# Imports
+# ------------------------------------------------------------------------------------ #
+# 標準庫
+import bisect
+import json
+import os
+import threading
+from typing import Dict, List
+
+
+# ------------------------------------------------------------------------------------ #
+# 量測階段 & 直方圖區間
+# ------------------------------------------------------------------------------------ #
+STAGES = ('build', 'shape_wait', 'lock_wait', 'send', 'reply_wait', 'decode')
+
+EVENTS = ('requests', 'decode_failures', 'header_errors', 'timeouts', 'errors')
+
+# 區間上限 (秒), 最後一格為 +Inf
+BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+)
+
+
+# ------------------------------------------------------------------------------------ #
+# [LatencyHistogram] 固定區間直方圖
+# ------------------------------------------------------------------------------------ #
+class LatencyHistogram:
+    """
+    - 說明 [LatencyHistogram]
+        • 寫入只做 bisect + 整數累加 (不加鎖, 依賴 GIL; 高併發下快照可能差 1 筆)
+        • 讀取時複製一份 計數
+    """
+
+    __slots__ = ('counts', 'total', 'count')
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total  = 0.0
+        self.count  = 0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    def snapshot(self) -> dict:
+        return {
+            'buckets': list(self.counts),
+            'sum': self.total,
+            'count': self.count,
+        }
+
+
+# ------------------------------------------------------------------------------------ #
+# [CommandMetrics] 單一指令代碼的統計
+# ------------------------------------------------------------------------------------ #
+class CommandMetrics:
+
+    __slots__ = ('stages', 'events')
+
+    def __init__(self) -> None:
+        self.stages = {stage: LatencyHistogram() for stage in STAGES}
+        self.events = dict.fromkeys(EVENTS, 0)
+
+
+# ------------------------------------------------------------------------------------ #
+# [GcuMetrics] GCUController 的統計資料
+# ------------------------------------------------------------------------------------ #
+class GcuMetrics:
+    """
+    - 說明 [GcuMetrics]
+        1. 依指令代碼 (0x00, 0x20, ...) 分開統計
+        2. 只有第一次出現新的指令代碼時 才需要加鎖
+        3. [to_prometheus] / [to_json] 產生快照, [write_prometheus] / [write_json] 寫檔
+    """
+
+    def __init__(self) -> None:
+        self._commands: Dict[int, CommandMetrics] = {}
+        self._lock = threading.Lock()
+
+    # ---------------------------------- 取得 指令統計 -------------------------------- #
+    def command(self, code: int) -> CommandMetrics:
+        metrics = self._commands.get(code)
+        if metrics is None:
+            with self._lock:
+                metrics = self._commands.setdefault(code, CommandMetrics())
+        return metrics
+
+    # ---------------------------------- 寫入 ----------------------------------------- #
+    def observe(self, code: int, stage: str, seconds: float) -> None:
+        self.command(code).stages[stage].observe(seconds)
+
+    def count(self, code: int, event: str, amount: int = 1) -> None:
+        self.command(code).events[event] += amount
+
+    # ---------------------------------- 快照 ----------------------------------------- #
+    def snapshot(self) -> dict:
+        """
+        returns:
+            • snapshot (dict)   - {'buckets': [...], 'commands': {'0x20': {...}, ...}}
+        """
+        # 其他執行緒可能同時加入新的指令代碼 → 加鎖複製後 再於鎖外建立快照
+        with self._lock:
+            items = list(self._commands.items())
+
+        commands = {}
+        for code, metrics in sorted(items):
+            commands[f'0x{code:02X}'] = {
+                'stages': {
+                    stage: histogram.snapshot()
+                    for stage, histogram in metrics.stages.items()
+                },
+                'events': dict(metrics.events),
+            }
+        return {'buckets': list(BUCKETS), 'commands': commands}
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self) -> str:
+        snapshot = self.snapshot()
+        bounds = [str(bound) for bound in BUCKETS] + ['+Inf']
+        lines: List[str] = [
+            '# HELP gcu_command_stage_seconds GCU 指令各階段耗時',
+            '# TYPE gcu_command_stage_seconds histogram',
+        ]
+        for command, metrics in snapshot['commands'].items():
+            for stage, histogram in metrics['stages'].items():
+                labels = f'command="{command}",stage="{stage}"'
+                cumulative = 0
+                for bound, count in zip(bounds, histogram['buckets']):
+                    cumulative += count
+                    lines.append(
+                        f'gcu_command_stage_seconds_bucket{{{labels},le="{bound}"}} '
+                        f'{cumulative}'
+                    )
+                lines.append(f'gcu_command_stage_seconds_sum{{{labels}}} {histogram["sum"]}')
+                lines.append(
+                    f'gcu_command_stage_seconds_count{{{labels}}} {histogram["count"]}'
+                )
+
+        lines += [
+            '# HELP gcu_command_events_total GCU 指令事件次數',
+            '# TYPE gcu_command_events_total counter',
+        ]
+        for command, metrics in snapshot['commands'].items():
+            for event, count in metrics['events'].items():
+                lines.append(
+                    f'gcu_command_events_total{{command="{command}",event="{event}"}} '
+                    f'{count}'
+                )
+        return '\n'.join(lines) + '\n'
+
+    # ---------------------------------- 寫檔 (先寫暫存檔再取代) ------------------------- #
+    @staticmethod
+    def _write_atomic(path: str, text: str) -> None:
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+    def write_json(self, path: str) -> None:
+        self._write_atomic(path, self.to_json())
+
+    def write_prometheus(self, path: str) -> None:
+        self._write_atomic(path, self.to_prometheus())
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+File   : gcu_shaper.py
+Author : FantasyWilly
+Email  : bc697522h04@gmail.com
+SPDX-License-Identifier: Apache-2.0
+
+開發公司:
+    • 先飛科技 (XF)
+
+功能總覽:
+    • 低速數傳電台的頻寬控制 (token bucket: 每秒位元組數 + 突發量)
+    • 每個封包發送前 取得額度 (含預期的回覆位元組), 額度不足 → 等待 而不是塞滿鏈路
+    • 低優先等級 (心跳, 跟蹤框) 必須保留額度給高優先等級 → 額度緊張時 最先降速
+    • 統計實際達到的 收發速率 & 各等級等待時間
+
+遵循:
+    • Google Python Style Guide (含區段標題)
+    • PEP 8 (行寬 ≤ 88, snake_case, 2 空行區段分隔)
+"""
+
+# ------------------------------------------------------------------------------------ #
+# Imports
+# ------------------------------------------------------------------------------------ #
+# 標準庫
+import collections
+import threading
+import time
+from typing import Dict, Sequence
+
+# 專案內部模組
+from camera_decoder import RESPONSE_MIN_LENGTH
+from camera_protocol import expects_reply
+from command_registry import PRIORITY_NAMES
+
+
+# ------------------------------------------------------------------------------------ #
+# 各等級 必須保留的額度 (佔 burst 的比例)
+# ------------------------------------------------------------------------------------ #
+# 停止 / 控制: 可用完所有額度; 移動: 保留 25%; 背景 (心跳): 保留 50%
+DEFAULT_RESERVES = (0.0, 0.0, 0.25, 0.5)
+
+# 無參數控制封包 (72 bytes) + 回覆封包
+_EXCHANGE_SIZE = 72 + RESPONSE_MIN_LENGTH
+
+
+def frame_cost(packet: bytes) -> int:
+    """
+    - 說明 [frame_cost] 1 個封包佔用的鏈路位元組 (封包 + 要求回覆時的 回覆封包)
+    """
+    cost = len(packet)
+    if expects_reply(packet):
+        cost += RESPONSE_MIN_LENGTH
+    return cost
+
+
+# ------------------------------------------------------------------------------------ #
+# [TokenBucketShaper] 頻寬控制
+# ------------------------------------------------------------------------------------ #
+class TokenBucketShaper:
+    """
+    - 說明 [TokenBucketShaper]
+        1. 額度以 rate 位元組/秒 持續補充, 最多累積 burst 位元組
+        2. [acquire] 等級 p 的封包 需要 額度 ≥ 封包位元組 + burst × reserves[p]
+           → 額度緊張時 低優先等級 等待較久 (心跳 / 跟蹤框 的實際頻率自動降低),
+             高優先等級 仍可使用保留的額度
+        3. 等待中的封包 保留額度隨等待時間遞減, aging 秒後降為 0
+           → 鏈路被高優先等級塞滿時 低優先等級 降速但不會完全停止 (心跳至少約 1/aging Hz)
+        4. 單一封包大於 burst 時 只要求 額度滿 (避免永遠等待)
+        5. [record_tx] / [record_rx] 記錄實際收發的位元組 → [throughput] 實測速率
+
+    args:
+        • rate (float)          - 每秒可用位元組 (例如 57600 bps 電台 → 約 7200, 再扣除開銷)
+        • burst (int)           - 最多可累積的位元組 (default: 4 個控制封包 + 回覆)
+        • reserves (Sequence)   - 各等級 必須保留的額度比例 (default: DEFAULT_RESERVES)
+        • aging (float)         - 保留額度 降為 0 所需的等待秒數 (default: 1)
+        • window (float)        - 實測速率的統計區間 (秒, default: 5)
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 4 * _EXCHANGE_SIZE,
+        reserves: Sequence[float] = DEFAULT_RESERVES,
+        aging: float = 1.0,
+        window: float = 5.0,
+    ) -> None:
+
+        if rate <= 0 or burst <= 0:
+            raise ValueError("rate / burst 必須大於 0")
+        if len(reserves) != len(PRIORITY_NAMES):
+            raise ValueError(f"reserves 需要 {len(PRIORITY_NAMES)} 個值")
+
+        # 接收參數
+        self.rate     = float(rate)
+        self.burst    = int(burst)
+        self.reserves = tuple(burst * min(max(r, 0.0), 1.0) for r in reserves)
+        self.aging    = aging
+        self.window   = window
+
+        # 額度 (初始為滿)
+        self._cond    = threading.Condition()
+        self._tokens  = float(self.burst)
+        self._updated = time.monotonic()
+
+        # 實測: (時間, 位元組) 於 window 內
+        self._started = self._updated
+        self._tx: collections.deque = collections.deque()
+        self._rx: collections.deque = collections.deque()
+
+        # 統計 (依等級)
+        classes = len(PRIORITY_NAMES)
+        self.granted  = [0] * classes       # 取得額度的封包數
+        self.bytes    = [0] * classes       # 取得的位元組
+        self.waited   = [0.0] * classes     # 累計等待秒數
+        self.delayed  = [0] * classes       # 需要等待的封包數
+        self.timeouts = [0] * classes       # 等待逾時的封包數
+
+    # ----------------------------------- 額度 --------------------------------------- #
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def tokens(self) -> float:
+        """目前可用額度 (位元組)"""
+        with self._cond:
+            self._refill(time.monotonic())
+            return self._tokens
+
+    def acquire(self, cost: int, priority: int, timeout: float = None) -> bool:
+        """
+        - 說明 [acquire] 取得 cost 位元組的額度 (不足時等待)
+
+        args:
+            • cost (int)        - 位元組 (見 frame_cost)
+            • priority (int)    - 優先等級 (command_registry.PRIORITY_*)
+            • timeout (float)   - 最長等待秒數 (default: None → 不限)
+
+        returns:
+            • granted (bool)    - False → 逾時 (未扣除額度)
+        """
+        reserve = self.reserves[priority]
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+
+        blocked = False
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+
+                # 需要的額度水位 (保留額度隨等待遞減; 封包大於 burst 時 只要求額度滿)
+                held = reserve
+                if reserve and self.aging > 0:
+                    held *= max(0.0, 1.0 - (now - started) / self.aging)
+                need = min(cost + held, self.burst)
+                if self._tokens >= need:
+                    break
+
+                wait = (need - self._tokens) / self.rate
+                if held:
+                    wait = min(wait, self.aging / 10)
+                if deadline is not None:
+                    if now >= deadline:
+                        self.timeouts[priority] += 1
+                        return False
+                    wait = min(wait, deadline - now)
+                blocked = True
+                self._cond.wait(wait)
+
+            self._tokens -= cost
+            self.granted[priority] += 1
+            self.bytes[priority] += cost
+            if blocked:
+                self.waited[priority] += now - started
+                self.delayed[priority] += 1
+        return True
+
+    # ----------------------------------- 實測速率 ----------------------------------- #
+    def record_tx(self, nbytes: int) -> None:
+        self._record(self._tx, nbytes)
+
+    def record_rx(self, nbytes: int) -> None:
+        self._record(self._rx, nbytes)
+
+    def _record(self, samples: collections.deque, nbytes: int) -> None:
+        now = time.monotonic()
+        with self._cond:
+            samples.append((now, nbytes))
+            self._trim(samples, now)
+
+    def _trim(self, samples: collections.deque, now: float) -> None:
+        limit = now - self.window
+        while samples and samples[0][0] < limit:
+            samples.popleft()
+
+    def throughput(self) -> Dict[str, float]:
+        """
+        - 說明 [throughput] 最近 window 秒 實際收發的速率
+
+        returns:
+            • rates (dict)  - {'tx': 位元組/秒, 'rx': 位元組/秒, 'utilization': (tx+rx) / rate}
+        """
+        now = time.monotonic()
+        with self._cond:
+            self._trim(self._tx, now)
+            self._trim(self._rx, now)
+            span = max(min(self.window, now - self._started), 1e-3)
+            tx = sum(n for _, n in self._tx) / span
+            rx = sum(n for _, n in self._rx) / span
+        return {'tx': tx, 'rx': rx, 'utilization': (tx + rx) / self.rate}
+
+    # ----------------------------------- 統計 --------------------------------------- #
+    def stats(self) -> Dict[str, dict]:
+        """各等級 取得額度的封包數, 位元組, 等待次數 & 平均等待秒數, 逾時次數"""
+        with self._cond:
+            return {
+                name: {
+                    'granted':   self.granted[i],
+                    'bytes':     self.bytes[i],
+                    'delayed':   self.delayed[i],
+                    'mean_wait': self.waited[i] / max(self.delayed[i], 1),
+                    'timeouts':  self.timeouts[i],
+                }
+                for i, name in enumerate(PRIORITY_NAMES)
+            }
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+File   : gcu_simulator.py
+Author : FantasyWilly
+Email  : bc697522h04@gmail.com
+SPDX-License-Identifier: Apache-2.0
+
+開發公司:
+    • 先飛科技 (XF)
+
+功能總覽:
+    • 本機 GCU 模擬伺服器 (代替載具端 main_air, 不需要飛機即可測試)
+    • 接收 build_packet 封包 → 檢查 CRC → 回覆 0x8A5E 返回封包
+    • 依 角度 / 變焦 / 回中 / 雷射 指令 更新模擬的雲台狀態
+    • 可設定 延遲, 抖動, 封包切割, 封包合併 (模擬無線電鏈路)
+
+使用方式:
+    python3 gcu_simulator.py --port 9999 --latency 0.05 --jitter 0.02 --fragment 16
+
+遵循:
+    • Google Python Style Guide (含區段標題)
+    • PEP 8 (行寬 ≤ 88, snake_case, 2 空行區段分隔)
+"""
+
+# ------------------------------------------------------------------------------------ #
+# Imports
+# ------------------------------------------------------------------------------------ #
+# 標準庫
+import argparse
+import asyncio
+import collections
+import logging
+import random
+import socket
+import struct
+import threading
+import time
+from typing import Optional
+
+# 專案內部模組
+from camera_protocol import HEADER, PREFIX_SIZE, calculate_crc, expects_reply
+from camera_decoder import RESPONSE_HEADER, RESPONSE_MIN_LENGTH, TELEMETRY_STRUCT
+from gcu_logging import get_logger, log_event, setup_logging
+from gcu_stream import GcuFrameBuffer
+
+
+_log = get_logger('gcu_simulator')
+
+
+# ------------------------------------------------------------------------------------ #
+# 模擬參數
+# ------------------------------------------------------------------------------------ #
+RESPONSE_LENGTH = RESPONSE_MIN_LENGTH     # 返回封包長度 (含 CRC)
+
+PITCH_LIMITS = (-90.0, 30.0)              # 俯仰角範圍 (°)
+ZOOM_LIMITS  = (1.0, 30.0)                # 倍率範圍
+ZOOM_SPEED   = 2.0                        # 連續變焦速度 (倍/s)
+LASER_RANGE  = 250.0                      # 雷射開啟時的模擬測距 (m)
+
+_ANGLE_STRUCT = struct.Struct('<hh')      # pitch, yaw → 封包 [7 ~ 10]
+
+
+# ------------------------------------------------------------------------------------ #
+# [GimbalState] 模擬的雲台狀態
+# ------------------------------------------------------------------------------------ #
+class GimbalState:
+    """
+    - 說明 [GimbalState]
+        1. 角度指令 (0x00) 視為增量移動, 俯仰角限制在 PITCH_LIMITS, 偏航角 ±180°
+        2. 連續變焦 (0x22 / 0x23) 依經過時間累加, 0x24 停止
+        3. 回中 (0x03), 向下 (0x13), 雷射 (0x81) 直接設定狀態
+    """
+
+    def __init__(self) -> None:
+        self.roll       = 0.0
+        self.pitch      = 0.0
+        self.yaw        = 0.0
+        self.zoom       = ZOOM_LIMITS[0]
+        self.zoom_rate  = 0.0
+        self.targetdist = 0.0
+        self._updated   = time.monotonic()
+
+    # ---------------------------------- 依時間更新 ----------------------------------- #
+    def advance(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        if self.zoom_rate:
+            low, high = ZOOM_LIMITS
+            self.zoom = min(high, max(low, self.zoom + self.zoom_rate * elapsed))
+
+    # ---------------------------------- 套用控制命令 --------------------------------- #
+    def apply(self, packet: bytes) -> None:
+        command = packet[PREFIX_SIZE]
+        parameters = packet[PREFIX_SIZE + 1:-2]
+
+        if command == 0x00 and packet[11] == 0x04:
+            pitch_raw, yaw_raw = _ANGLE_STRUCT.unpack_from(packet, 7)
+            low, high = PITCH_LIMITS
+            self.pitch = min(high, max(low, self.pitch + pitch_raw * 0.01))
+            self.yaw = (self.yaw + yaw_raw * 0.01 + 180.0) % 360.0 - 180.0
+        elif command == 0x03:
+            self.pitch = self.yaw = 0.0
+        elif command == 0x13:
+            self.pitch = PITCH_LIMITS[0]
+        elif command == 0x22:
+            self.zoom_rate = ZOOM_SPEED
+        elif command == 0x23:
+            self.zoom_rate = -ZOOM_SPEED
+        elif command == 0x24:
+            self.zoom_rate = 0.0
+        elif command == 0x81 and parameters:
+            self.targetdist = LASER_RANGE if parameters[0] else 0.0
+
+    # ---------------------------------- 組成返回封包 --------------------------------- #
+    def to_response(self) -> bytes:
+        response = bytearray(RESPONSE_LENGTH)
+        TELEMETRY_STRUCT.pack_into(
+            response, 0,
+            int.from_bytes(RESPONSE_HEADER, 'little'),
+            int(round(self.yaw * 100)),
+            int(round(self.roll * 100)),
+            int(round(self.pitch * 100)),
+            int(round(self.targetdist * 10)),
+            int(round(self.zoom * 10)),
+        )
+        response[2:4] = RESPONSE_LENGTH.to_bytes(2, 'little')
+        response[-2:] = calculate_crc(memoryview(response)[:-2]).to_bytes(2, 'big')
+        return bytes(response)
+
+
+# ------------------------------------------------------------------------------------ #
+# [GcuSimulator] asyncio 模擬伺服器
+# ------------------------------------------------------------------------------------ #
+class GcuSimulator:
+    """
+    - 說明 [GcuSimulator]
+        1. 每個客戶端 1 個讀取 Task + 1 個寫入 Task, 共用同一個 [GimbalState]
+        2. 主幀 byte 25 = 0x01 (enable_request) 才回覆
+        3. 回覆送出時間 = 收到時間 + latency ± jitter (不早於前一筆, 保持 TCP 順序)
+        4. fragment_size > 0 → 每筆回覆切成多段送出; coalesce_window > 0 → 合併多筆回覆
+
+    args:
+        • host (str)                - 監聽位址 (default: 127.0.0.1)
+        • port (int)                - 監聽 Port (default: 0, 自動分配)
+        • latency (float)           - 回覆延遲 (default: 0s)
+        • jitter (float)            - 延遲抖動 ± (default: 0s)
+        • fragment_size (int)       - 切割大小 (default: 0, 不切割)
+        • coalesce_window (float)   - 合併時間窗 (default: 0s, 不合併)
+        • seed (int)                - 抖動亂數種子 (default: None)
+    """
+
+    def __init__(
+        self,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        fragment_size: int = 0,
+        coalesce_window: float = 0.0,
+        seed: int = None,
+    ) -> None:
+
+        # 接收參數
+        self.host            = host
+        self.port            = port
+        self.latency         = latency
+        self.jitter          = jitter
+        self.fragment_size   = fragment_size
+        self.coalesce_window = coalesce_window
+        self._random         = random.Random(seed)
+
+        # 模擬狀態
+        self.state = GimbalState()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+        # 背景執行緒模式
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+        # 統計
+        self.clients          = 0
+        self.packets_received = 0
+        self.replies_sent     = 0
+        self.crc_errors       = 0
+
+    # ----------------------------------- 啟動 / 停止 --------------------------------- #
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        log_event(
+            _log, logging.INFO, 'listen', "[GcuSimulator] 監聽 %s:%s", self.host, self.port,
+            host=self.host, port=self.port,
+        )
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    # ----------------------------------- 延遲計算 ----------------------------------- #
+    def _delay(self) -> float:
+        if not self.jitter:
+            return self.latency
+        return max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+
+    # ----------------------------------- 客戶端連線 ---------------------------------- #
+    async def _handle_client(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        self.clients += 1
+        sock = writer.get_extra_info('socket')
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        # 控制封包重組 (協議頭 0xA8 0xE5, CRC 錯誤的封包直接略過)
+        frame_buffer = GcuFrameBuffer(header=HEADER, min_length=PREFIX_SIZE + 3)
+        crc_errors = 0
+
+        # 待送出的回覆: (送出時間, 封包), None 表示結束
+        outbox: collections.deque = collections.deque()
+        wakeup = asyncio.Event()
+        writer_task = asyncio.create_task(self._write_loop(writer, outbox, wakeup))
+
+        # 依序送出的最後時間 (抖動不可讓回覆亂序)
+        last_delivery = 0.0
+        try:
+            while True:
+                data = await reader.read(4096)
+                if not data:
+                    break
+                for packet in frame_buffer.parse(data):
+                    self.packets_received += 1
+
+                    # 1. 更新雲台狀態
+                    now = time.monotonic()
+                    self.state.advance(now)
+                    self.state.apply(packet)
+
+                    # 2. 排定回覆
+                    if expects_reply(packet):
+                        last_delivery = max(last_delivery, now + self._delay())
+                        outbox.append((last_delivery, self.state.to_response()))
+                        wakeup.set()
+
+                self.crc_errors += frame_buffer.crc_errors - crc_errors
+                crc_errors = frame_buffer.crc_errors
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            outbox.append(None)
+            wakeup.set()
+            await writer_task
+            writer.close()
+            self.clients -= 1
+
+    # ----------------------------------- 回覆寫入 ----------------------------------- #
+    async def _write_loop(
+        self,
+        writer: asyncio.StreamWriter,
+        outbox: collections.deque,
+        wakeup: asyncio.Event,
+    ) -> None:
+        try:
+            while True:
+                while not outbox:
+                    wakeup.clear()
+                    await wakeup.wait()
+                item = outbox.popleft()
+                if item is None:
+                    return
+
+                # 1. 等到送出時間
+                deliver_at, payload = item
+                wait = deliver_at - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+
+                # 2. 合併時間窗內 已到期的回覆
+                replies = 1
+                if self.coalesce_window > 0:
+                    await asyncio.sleep(self.coalesce_window)
+                    chunks = [payload]
+                    now = time.monotonic()
+                    while outbox and outbox[0] is not None and outbox[0][0] <= now:
+                        chunks.append(outbox.popleft()[1])
+                    payload = b''.join(chunks)
+                    replies = len(chunks)
+
+                # 3. 切割送出 (每段之間讓出事件迴圈, 成為獨立的 TCP 分段)
+                if self.fragment_size > 0:
+                    for offset in range(0, len(payload), self.fragment_size):
+                        writer.write(payload[offset:offset + self.fragment_size])
+                        await writer.drain()
+                        await asyncio.sleep(0)
+                else:
+                    writer.write(payload)
+                    await writer.drain()
+                self.replies_sent += replies
+        except (ConnectionError, OSError):
+            return
+
+    # ----------------------------------- 背景執行緒 ---------------------------------- #
+    def start_in_thread(self) -> threading.Thread:
+        """
+        - 說明 [start_in_thread] 在背景執行緒中 建立事件迴圈並啟動伺服器
+            • 返回時已在監聽 (self.port 為實際 Port)
+            • 呼叫 [stop_thread] 結束
+        """
+        ready = threading.Event()
+
+        def run() -> None:
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self.start())
+            ready.set()
+            self._loop.run_forever()
+            self._loop.run_until_complete(self._shutdown())
+            self._loop.close()
+
+        thread = threading.Thread(target=run, name="gcu-simulator", daemon=True)
+        thread.start()
+        ready.wait()
+        self._thread = thread
+        return thread
+
+    async def _shutdown(self) -> None:
+        # 停止監聽 → 取消所有客戶端 Task → 等待伺服器關閉
+        # (避免事件迴圈關閉時 仍有 Task 未結束; 3.12+ 的 wait_closed 會等待所有連線)
+        if self._server is not None:
+            self._server.close()
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self.stop()
+
+    def stop_thread(self) -> None:
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+
+# ------------------------------------------------------------------------------------ #
+# 主程式
+# ------------------------------------------------------------------------------------ #
+def main() -> None:
+    parser = argparse.ArgumentParser(description="本機 GCU 模擬伺服器")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9999)
+    parser.add_argument('--latency', type=float, default=0.0, help="回覆延遲 (s)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="延遲抖動 ± (s)")
+    parser.add_argument('--fragment', type=int, default=0, help="切割大小 (bytes)")
+    parser.add_argument('--coalesce', type=float, default=0.0, help="合併時間窗 (s)")
+    parser.add_argument('--log-level', default='INFO', help="DEBUG / INFO / WARNING / ERROR")
+    args = parser.parse_args()
+    setup_logging(args.log_level)
+
+    simulator = GcuSimulator(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        fragment_size=args.fragment,
+        coalesce_window=args.coalesce,
+    )
+    try:
+        asyncio.run(simulator.serve_forever())
+    except KeyboardInterrupt:
+        log_event(_log, logging.INFO, 'stopped', "[GcuSimulator] 結束")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+File   : gcu_stream.py
+Author : FantasyWilly
+Email  : bc697522h04@gmail.com
+SPDX-License-Identifier: Apache-2.0
+
+開發公司:
+    • 先飛科技 (XF)
+
+功能總覽:
+    • TCP 位元組流 → 完整封包 (依 協議頭 & 長度欄位 切割)
+    • CRC 校驗, 遇到雜訊自動重新同步
+    • 可重複使用的接收緩衝區 (recv_into, 不另配置暫存)
+
+遵循:
+    • Google Python Style Guide (含區段標題)
+    • PEP 8 (行寬 ≤ 88, snake_case, 2 空行區段分隔)
+"""
+
+# ------------------------------------------------------------------------------------ #
+# Imports
+# ------------------------------------------------------------------------------------ #
+# 標準庫
+import socket
+from typing import Iterator, Optional
+
+# 專案內部模組
+from camera_decoder import RESPONSE_HEADER, RESPONSE_MIN_LENGTH
+from camera_protocol import verify_crc
+
+
+# ------------------------------------------------------------------------------------ #
+# [GcuFrameBuffer] 封包重組緩衝區
+# ------------------------------------------------------------------------------------ #
+class GcuFrameBuffer:
+    """
+    - 說明 [GcuFrameBuffer]
+        1. 以固定大小的 bytearray 存放尚未解析的位元組
+        2. 依 協議頭 + 長度欄位 (byte 2~3, little-endian, 含 CRC) 切出完整封包
+        3. 長度不合理 / CRC 錯誤 → 丟棄 1 byte 後 搜尋下一個協議頭 (重新同步)
+
+    args:
+        • capacity (int)    - 緩衝區大小 (default: 4096)
+        • header (bytes)    - 協議頭 (default: 0x8A 0x5E, GCU 返回封包)
+        • min_length (int)  - 合法封包最短長度 (default: 72)
+        • max_length (int)  - 合法封包最長長度 (default: 512)
+        • check_crc (bool)  - 是否檢查 CRC (default: True)
+    """
+
+    def __init__(
+        self,
+        capacity: int = 4096,
+        header: bytes = RESPONSE_HEADER,
+        min_length: int = RESPONSE_MIN_LENGTH,
+        max_length: int = 512,
+        check_crc: bool = True,
+    ) -> None:
+
+        if max_length > capacity:
+            raise ValueError("max_length 不可大於 capacity")
+
+        # 接收參數
+        self.header     = header
+        self.min_length = min_length
+        self.max_length = max_length
+        self.check_crc  = check_crc
+
+        # 緩衝區 [start, end) 為尚未解析的資料
+        self._buf   = bytearray(capacity)
+        self._view  = memoryview(self._buf)
+        self._start = 0
+        self._end   = 0
+
+        # 統計
+        self.frames_parsed   = 0
+        self.bytes_discarded = 0
+        self.crc_errors      = 0
+
+    # ---------------------------------- 緩衝區狀態 ----------------------------------- #
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def clear(self) -> None:
+        self._start = self._end = 0
+
+    # ---------------------------------- 取得 可寫入區 -------------------------------- #
+    def writable(self) -> memoryview:
+        """
+        - 說明 [writable] 回傳緩衝區尾端的可寫入區 (供 sock.recv_into 使用)
+            • 寫入後須呼叫 [commit] 告知實際寫入長度
+        """
+        if self._start:
+            # 將尚未解析的資料 移回緩衝區開頭
+            remaining = self._end - self._start
+            self._buf[:remaining] = self._buf[self._start:self._end]
+            self._start = 0
+            self._end   = remaining
+        return self._view[self._end:]
+
+    def commit(self, nbytes: int) -> None:
+        self._end += nbytes
+
+    # ---------------------------------- 複製資料寫入 --------------------------------- #
+    def feed(self, data: bytes) -> None:
+        """
+        - 說明 [feed] 將外部資料寫入緩衝區 (非 socket 來源, 例如 asyncio)
+            • 資料超過可寫入區時 拋出 BufferError; 一次寫入大量資料請改用 [parse]
+        """
+        data = memoryview(data)
+        while data:
+            space = self.writable()
+            if not space:
+                raise BufferError("緩衝區已滿, 請先取出封包")
+            n = min(len(space), len(data))
+            space[:n] = data[:n]
+            self.commit(n)
+            data = data[n:]
+
+    # ---------------------------------- 寫入並取出封包 ------------------------------- #
+    def parse(self, data: bytes) -> Iterator[bytes]:
+        """
+        - 說明 [parse] 寫入外部資料 並依序取出所有完整封包
+            • 資料比可寫入區大時 分段寫入, 每段寫入後先取出封包騰出空間
+        """
+        data = memoryview(data)
+        while data:
+            space = self.writable()
+            n = min(len(space), len(data))
+            if n == 0:
+                raise BufferError("緩衝區已滿, 請先取出封包")
+            space[:n] = data[:n]
+            self.commit(n)
+            data = data[n:]
+            yield from self
+
+    # ---------------------------------- 丟棄 位元組 ---------------------------------- #
+    def _discard(self, nbytes: int) -> None:
+        self._start += nbytes
+        self.bytes_discarded += nbytes
+
+    # ---------------------------------- 取出 完整封包 -------------------------------- #
+    def next_frame(self) -> Optional[bytes]:
+        """
+        - 說明 [next_frame] 取出下一個完整封包
+
+        returns:
+            • frame (bytes | None)  - 完整封包 (含 CRC), 資料不足時回傳 None
+        """
+        buf = self._buf
+        header = self.header
+        h0, h1 = header[0], header[1]
+
+        while True:
+            available = self._end - self._start
+            if available < 4:
+                return None
+
+            # 1. 對齊協議頭 (不對則搜尋下一個協議頭)
+            start = self._start
+            if buf[start] != h0 or buf[start + 1] != h1:
+                index = buf.find(header, start + 1, self._end)
+                if index < 0:
+                    # 保留最後 1 byte (可能是下一個協議頭的前半)
+                    keep = 1 if buf[self._end - 1] == h0 else 0
+                    self._discard(available - keep)
+                    return None
+                self._discard(index - start)
+                continue
+
+            # 2. 檢查長度欄位
+            length = buf[start + 2] | (buf[start + 3] << 8)
+            if length < self.min_length or length > self.max_length:
+                self._discard(1)
+                continue
+            if available < length:
+                return None
+
+            # 3. 檢查 CRC
+            frame = bytes(self._view[start:start + length])
+            if self.check_crc and not verify_crc(frame):
+                self.crc_errors += 1
+                self._discard(1)
+                continue
+
+            self._start += length
+            self.frames_parsed += 1
+            return frame
+
+    def __iter__(self) -> Iterator[bytes]:
+        frame = self.next_frame()
+        while frame is not None:
+            yield frame
+            frame = self.next_frame()
+
+
+# ------------------------------------------------------------------------------------ #
+# [GcuStreamReader] 從 socket 讀取完整封包
+# ------------------------------------------------------------------------------------ #
+class GcuStreamReader:
+    """
+    - 說明 [GcuStreamReader]
+        1. 以 recv_into 將資料直接寫入 [GcuFrameBuffer]
+        2. 每次回傳 1 個完整封包 (TCP 分段 / 黏包 皆可正確處理)
+
+    args:
+        • sock (socket.socket)          - 已連線的 TCP socket
+        • frame_buffer (GcuFrameBuffer) - 封包重組緩衝區 (default: 新建)
+    """
+
+    def __init__(
+        self,
+        sock: socket.socket,
+        frame_buffer: Optional[GcuFrameBuffer] = None,
+    ) -> None:
+        self.sock = sock
+        self.frame_buffer = frame_buffer if frame_buffer is not None else GcuFrameBuffer()
+
+    # ---------------------------------- 讀取 1 個封包 -------------------------------- #
+    def read_frame(self) -> bytes:
+        """
+        - 說明 [read_frame] 阻塞直到取得 1 個完整封包
+
+        returns:
+            • frame (bytes)     - 完整封包 (含 CRC)
+
+        raises:
+            • socket.timeout    - 超過 socket 超時時間
+            • ConnectionError   - 對方已關閉連線
+        """
+        frame_buffer = self.frame_buffer
+        while True:
+            frame = frame_buffer.next_frame()
+            if frame is not None:
+                return frame
+
+            nbytes = self.sock.recv_into(frame_buffer.writable())
+            if nbytes == 0:
+                raise ConnectionError("GCU 已關閉連線")
+            frame_buffer.commit(nbytes)
+
+    # ---------------------------------- 連續讀取封包 --------------------------------- #
+    def frames(self) -> Iterator[bytes]:
+        while True:
+            yield self.read_frame()
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+File   : gcu_transport.py
+Author : FantasyWilly
+Email  : bc697522h04@gmail.com
+SPDX-License-Identifier: Apache-2.0
+
+開發公司:
+    • 先飛科技 (XF)
+
+功能總覽:
+    • 管理 GCU TCP 連線 (TCP_NODELAY, TCP keepalive)
+    • 斷線後 指數退避 + 隨機抖動 自動重連
+    • 以最後收到回覆的時間 判斷連線是否仍存活
+    • 每個指令的 重送 / 丟棄 策略
+    • 多個封包 1 次 sendmsg 寫出 (scatter-gather)
+
+遵循:
+    • Google Python Style Guide (含區段標題)
+    • PEP 8 (行寬 ≤ 88, snake_case, 2 空行區段分隔)
+"""
+
+# ------------------------------------------------------------------------------------ #
+# Imports
+# ------------------------------------------------------------------------------------ #
+# 標準庫
+import logging
+import random
+import socket
+import threading
+import time
+from typing import Optional, Sequence
+
+# 專案內部模組
+from camera_protocol import PREFIX_SIZE
+from command_registry import DROP, REPLAY, replay_policy
+from gcu_logging import get_logger, log_event
+from gcu_stream import GcuFrameBuffer, GcuStreamReader
+
+
+_log = get_logger('gcu_transport')
+
+
+# ------------------------------------------------------------------------------------ #
+# 斷線時 尚未完成的指令 處理策略
+# ------------------------------------------------------------------------------------ #
+# 由 command_registry 的指令表產生 (每個指令的策略 見 COMMAND_SPECS)
+DEFAULT_REPLAY_POLICY = replay_policy()
+
+class CommandDroppedError(ConnectionError):
+    """斷線重連後 依策略丟棄的指令"""
+
+
+# ---------------------------------- 取得 指令處理策略 ---------------------------------- #
+def replay_policy_for(packet: bytes, policy: dict = None) -> str:
+    """
+    - 說明 [replay_policy_for] 依封包中的指令代碼 (byte 69) 查詢處理策略
+
+    args:
+        • packet (bytes)    - build_packet 組好的封包
+        • policy (dict)     - 指令代碼 → REPLAY / DROP (default: DEFAULT_REPLAY_POLICY)
+
+    returns:
+        • policy (str)      - REPLAY 或 DROP (未列出的指令 → DROP)
+    """
+    if policy is None:
+        policy = DEFAULT_REPLAY_POLICY
+    if len(packet) <= PREFIX_SIZE:
+        return DROP
+    return policy.get(packet[PREFIX_SIZE], DROP)
+
+
+# ------------------------------------------------------------------------------------ #
+# [GcuTransport] 可自動重連的 TCP 連線
+# ------------------------------------------------------------------------------------ #
+# sendmsg 單次最多的緩衝區數量 (Linux / macOS 的 IOV_MAX)
+_IOV_MAX = 1024
+
+
+class GcuTransport:
+    """
+    - 說明 [GcuTransport]
+        1. 建立 socket 並設定 TCP_NODELAY (小封包不等待合併) 與 TCP keepalive
+        2. 以 [GcuStreamReader] 讀取完整封包, 並記錄最後收到回覆的時間
+        3. [reconnect] 指數退避 + 隨機抖動 重試, 直到成功 / 超過次數 / 被關閉
+
+    args:
+        • ip (str)                  - 目標主機 IP
+        • port (int)                - 目標主機 Port
+        • timeout (float)           - Socket 超時時間 (default: 5s)
+        • backoff_initial (float)   - 第一次重連前等待 (default: 0.5s)
+        • backoff_max (float)       - 最長重連等待 (default: 10s)
+        • max_attempts (int)        - 最多重連次數 (default: None, 不限)
+        • keepalive_idle (int)      - 閒置多久開始送 keepalive (default: 2s)
+        • keepalive_interval (int)  - keepalive 間隔 (default: 1s)
+        • keepalive_count (int)     - 幾次沒回應 視為斷線 (default: 3)
+        • recorder (GcuRecorder)    - 記錄每個收發封包 (default: None)
+        • shaper (TokenBucketShaper)- 統計實際收發位元組 (default: None)
+    """
+
+    def __init__(
+        self,
+        ip: str,
+        port: int,
+        timeout: float = 5.0,
+        backoff_initial: float = 0.5,
+        backoff_max: float = 10.0,
+        max_attempts: int = None,
+        keepalive_idle: int = 2,
+        keepalive_interval: int = 1,
+        keepalive_count: int = 3,
+        recorder=None,
+        shaper=None,
+    ) -> None:
+
+        # 接收參數
+        self.ip                 = ip
+        self.port               = port
+        self.timeout            = timeout
+        self.backoff_initial    = backoff_initial
+        self.backoff_max        = backoff_max
+        self.max_attempts       = max_attempts
+        self.keepalive_idle     = keepalive_idle
+        self.keepalive_interval = keepalive_interval
+        self.keepalive_count    = keepalive_count
+        self.recorder           = recorder
+        self.shaper             = shaper
+
+        # 連線物件 (重連時替換 socket, 保留重組緩衝區)
+        self.sock: Optional[socket.socket] = None
+        self.frame_buffer = GcuFrameBuffer()
+        self.reader: Optional[GcuStreamReader] = None
+
+        # 狀態
+        self._closed = threading.Event()
+        self.last_rx = time.monotonic()
+        self.generation = 0             # 每次成功連線 +1
+        self.reconnects = 0
+
+    # ----------------------------------- 建立 socket --------------------------------- #
+    def _create_socket(self) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+
+        # ~70 bytes 的小封包 立即送出
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        # TCP keepalive (各平台可設定的選項不同)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        if hasattr(socket, 'TCP_KEEPIDLE'):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, self.keepalive_idle)
+        if hasattr(socket, 'TCP_KEEPINTVL'):
+            sock.setsockopt(
+                socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, self.keepalive_interval
+            )
+        if hasattr(socket, 'TCP_KEEPCNT'):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, self.keepalive_count)
+        if hasattr(socket, 'SIO_KEEPALIVE_VALS'):
+            sock.ioctl(
+                socket.SIO_KEEPALIVE_VALS,
+                (1, self.keepalive_idle * 1000, self.keepalive_interval * 1000),
+            )
+        return sock
+
+    # ----------------------------------- 開啟 TCP連接 -------------------------------- #
+    def connect(self) -> None:
+        self._closed.clear()
+        self._open()
+
+    def _open(self) -> None:
+        sock = self._create_socket()
+        try:
+            sock.connect((self.ip, self.port))
+        except OSError:
+            sock.close()
+            raise
+
+        # 舊連線殘留的半包 不可接到新連線上
+        self.frame_buffer.clear()
+        self.sock = sock
+        self.reader = GcuStreamReader(sock, self.frame_buffer)
+        self.last_rx = time.monotonic()
+        self.generation += 1
+
+    # ----------------------------------- 關閉 TCP連接 -------------------------------- #
+    def _close_socket(self) -> None:
+        if self.sock is None:
+            return
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+    def close(self) -> None:
+        self._closed.set()
+        self._close_socket()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed.is_set()
+
+    # ----------------------------------- 斷線重連 ----------------------------------- #
+    def reconnect(self) -> None:
+        """
+        - 說明 [reconnect] 關閉目前連線, 以 指數退避 + 隨機抖動 重試連線
+
+        raises:
+            • ConnectionError   - 已被 [close] 關閉 或 超過 max_attempts
+        """
+        self._close_socket()
+
+        attempt = 0
+        while not self.closed:
+            # 等待時間: min(上限, 初值 × 2^n) × [0.5, 1.0) 隨機抖動
+            delay = min(self.backoff_max, self.backoff_initial * (2 ** attempt))
+            delay *= random.uniform(0.5, 1.0)
+            if self._closed.wait(delay):
+                break
+
+            attempt += 1
+            try:
+                self._open()
+            except OSError as e:
+                log_event(
+                    _log, logging.WARNING, 'reconnect_failed',
+                    "[GcuTransport] 第 %d 次重連失敗: %s", attempt, e, attempt=attempt,
+                )
+                if self.max_attempts is not None and attempt >= self.max_attempts:
+                    raise ConnectionError(f"重連 {attempt} 次仍失敗") from e
+                continue
+
+            self.reconnects += 1
+            log_event(
+                _log, logging.INFO, 'reconnected',
+                "[GcuTransport] 已重新連接到 GCU: %s:%s", self.ip, self.port,
+                attempt=attempt, reconnects=self.reconnects,
+            )
+            return
+
+        raise ConnectionError("連接已關閉")
+
+    # ----------------------------------- 發送 / 接收 --------------------------------- #
+    def sendall(self, packet: bytes) -> None:
+        if self.sock is None:
+            raise ConnectionError("尚未連接到 GCU")
+        self._record_tx([packet])
+        try:
+            self.sock.sendall(packet)
+        except OSError:
+            self._record_tx_failed([packet])
+            raise
+        if self.shaper is not None:
+            self.shaper.record_tx(len(packet))
+
+    def send_packets(self, packets: Sequence[bytes]) -> None:
+        """
+        - 說明 [send_packets] 多個封包 以 1 次 sendmsg (scatter-gather) 寫出
+            • 不先合併成 1 個 bytes, 核心直接從每個封包的緩衝區讀取
+            • 部分寫出時 從中斷處繼續 (同 sendall)
+            • 沒有 sendmsg 的平台 (Windows) → 合併後 sendall
+        """
+        sock = self.sock
+        if sock is None:
+            raise ConnectionError("尚未連接到 GCU")
+
+        self._record_tx(packets)
+        first = 0
+        try:
+            if not hasattr(sock, 'sendmsg'):
+                sock.sendall(b''.join(packets))
+            else:
+                buffers = [memoryview(packet) for packet in packets]
+                while first < len(buffers):
+                    sent = sock.sendmsg(buffers[first:first + _IOV_MAX])
+                    # 跳過已完整寫出的封包, 中斷處的封包 只保留剩餘部分
+                    while first < len(buffers) and sent >= len(buffers[first]):
+                        sent -= len(buffers[first])
+                        first += 1
+                    if sent:
+                        buffers[first] = buffers[first][sent:]
+        except OSError:
+            # 已完整寫出的封包 不標記失敗
+            self._record_tx_failed(packets[first:])
+            raise
+
+        if self.shaper is not None:
+            self.shaper.record_tx(sum(len(packet) for packet in packets))
+
+    def read_frame(self) -> bytes:
+        if self.reader is None:
+            raise ConnectionError("尚未連接到 GCU")
+        frame = self.reader.read_frame()
+        self.last_rx = time.monotonic()
+        if self.recorder is not None:
+            self.recorder.record_rx(frame)
+        if self.shaper is not None:
+            self.shaper.record_rx(len(frame))
+        return frame
+
+    # ----------------------------------- 收發紀錄 ----------------------------------- #
+    # TX 在寫入 socket 之前記錄 → 紀錄中 TX 必定早於它引發的 RX (接收執行緒可能先收到回覆)
+    def _record_tx(self, packets: Sequence[bytes]) -> None:
+        if self.recorder is not None:
+            for packet in packets:
+                self.recorder.record_tx(packet)
+
+    def _record_tx_failed(self, packets: Sequence[bytes]) -> None:
+        if self.recorder is not None:
+            for packet in packets:
+                self.recorder.record_tx_failed(packet)
+
+    # ----------------------------------- 存活檢查 ----------------------------------- #
+    def silence(self) -> float:
+        """距離最後一次收到回覆的秒數"""
+        return time.monotonic() - self.last_rx
+
+    def is_alive(self, max_silence: float) -> bool:
+        return not self.closed and self.sock is not None and self.silence() < max_silence
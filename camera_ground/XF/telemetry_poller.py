@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+File   : telemetry_poller.py
+Author : FantasyWilly
+Email  : bc697522h04@gmail.com
+SPDX-License-Identifier: Apache-2.0
+
+開發公司:
+    • 先飛科技 (XF)
+
+功能總覽:
+    • 固定頻率 取得雲台資訊 (controller 快取太舊時 才發送空命令)
+    • 以截止時間排程 (不累積誤差), 統計錯過的截止時間
+    • 提供 最新快照 & 固定長度歷史紀錄
+
+遵循:
+    • Google Python Style Guide (含區段標題)
+    • PEP 8 (行寬 ≤ 88, snake_case, 2 空行區段分隔)
+"""
+
+# ------------------------------------------------------------------------------------ #
+# Imports
+# ------------------------------------------------------------------------------------ #
+# 標準庫
+import collections
+import concurrent.futures
+import logging
+import threading
+import time
+from typing import List, NamedTuple, Optional
+
+# 專案內部模組
+from camera_decoder import GcuDecodeError, GcuTelemetry
+from gcu_controller import GCUController
+from gcu_logging import get_logger, log_event
+from gcu_transport import CommandDroppedError
+
+
+_log = get_logger('telemetry_poller')
+
+
+# ------------------------------------------------------------------------------------ #
+# [TelemetrySnapshot] 單次輪詢結果
+# ------------------------------------------------------------------------------------ #
+class TelemetrySnapshot(NamedTuple):
+    """
+    - 說明 [TelemetrySnapshot] 不可變的雲台資訊快照
+
+    args:
+        • timestamp (float)         - 收到回覆的時間 (time.monotonic)
+        • sequence (int)            - 輪詢序號 (由 1 開始)
+        • telemetry (GcuTelemetry)  - 解碼後的雲台資訊
+    """
+    timestamp: float
+    sequence: int
+    telemetry: GcuTelemetry
+
+
+# ------------------------------------------------------------------------------------ #
+# [TelemetryPoller] 背景輪詢雲台資訊
+# ------------------------------------------------------------------------------------ #
+class TelemetryPoller:
+    """
+    - 說明 [TelemetryPoller]
+        1. 背景執行緒 以固定頻率呼叫 controller.telemetry_snapshot
+           (其他指令的回覆 已帶來夠新的雲台資訊時 不發送空命令)
+        2. 下一次截止時間 = 上一次截止時間 + 週期 (不受單次耗時影響)
+        3. 落後超過 1 個週期 → 略過錯過的週期並計入 missed_deadlines
+        4. 最新快照以單一參考替換 (讀取端不需加鎖)
+        5. 逾時 / 丟棄 / 連線錯誤 / 解碼失敗 分別計數並記錄, 輪詢執行緒不會因例外結束
+
+    args:
+        • controller (GCUController)    - 已連線的 GCU 控制器
+        • rate_hz (float)               - 輪詢頻率 (default: 50 Hz)
+        • history_size (int)            - 歷史紀錄長度 (default: 500)
+    """
+
+    def __init__(
+        self,
+        controller: GCUController,
+        rate_hz: float = 50.0,
+        history_size: int = 500,
+    ) -> None:
+
+        if rate_hz <= 0:
+            raise ValueError("rate_hz 必須大於 0")
+
+        # 接收參數
+        self.controller = controller
+        self.period     = 1.0 / rate_hz
+
+        # 最新快照 & 歷史紀錄
+        self._latest: Optional[TelemetrySnapshot] = None
+        self._history: collections.deque = collections.deque(maxlen=history_size)
+        self._history_lock = threading.Lock()
+
+        # 執行緒
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # 統計
+        self.polls            = 0
+        self.missed_deadlines = 0
+        self.decode_errors    = 0
+        self.send_errors      = 0
+        self.timeouts         = 0
+        self.dropped          = 0
+        self.errors           = 0       # 其他未預期的例外
+
+    # ----------------------------------- 啟動 / 停止 --------------------------------- #
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="gcu-telemetry-poller", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = None) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def __enter__(self) -> "TelemetryPoller":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    # ----------------------------------- 讀取 快照 ----------------------------------- #
+    def latest(self) -> Optional[TelemetrySnapshot]:
+        return self._latest
+
+    def history(self) -> List[TelemetrySnapshot]:
+        with self._history_lock:
+            return list(self._history)
+
+    # ----------------------------------- 輪詢 1 次 ----------------------------------- #
+    def poll_once(self) -> Optional[TelemetrySnapshot]:
+        # 其他指令的回覆 在半個週期內已更新過雲台資訊 → 不必再發送空命令
+        try:
+            cached = self.controller.telemetry_snapshot(max_age=self.period / 2)
+        except CommandDroppedError as e:
+            self.dropped += 1
+            self._log_error('poll_dropped', "空命令已丟棄 (斷線重連)", e)
+            return None
+        except (TimeoutError, concurrent.futures.TimeoutError) as e:
+            self.timeouts += 1
+            self._log_error('poll_timeout', "等待回覆逾時", e)
+            return None
+        except OSError as e:
+            self.send_errors += 1
+            self._log_error('poll_error', "發送空命令失敗", e)
+            return None
+        except GcuDecodeError as e:
+            self.decode_errors += 1
+            self._log_error('poll_decode_error', "解碼失敗", e)
+            return None
+
+        if cached is None:
+            self.decode_errors += 1
+            return None
+
+        self.polls += 1
+        snapshot = TelemetrySnapshot(cached.timestamp, self.polls, cached.telemetry)
+        with self._history_lock:
+            self._history.append(snapshot)
+        self._latest = snapshot
+        return snapshot
+
+    def _log_error(self, event: str, message: str, error: BaseException) -> None:
+        log_event(
+            _log, logging.WARNING, event, "[TelemetryPoller] %s: %s", message, error,
+            error=type(error).__name__,
+        )
+
+    # ----------------------------------- 輪詢執行緒 ---------------------------------- #
+    def _run(self) -> None:
+        period = self.period
+        deadline = time.monotonic()
+
+        while not self._stop_event.is_set():
+            # 1. 等到本次截止時間
+            now = time.monotonic()
+            if now < deadline and self._stop_event.wait(deadline - now):
+                break
+
+            # 2. 輪詢 (未預期的例外 只記錄, 不結束執行緒)
+            try:
+                self.poll_once()
+            except Exception as e:
+                self.errors += 1
+                log_event(
+                    _log, logging.ERROR, 'poll_failed',
+                    "[TelemetryPoller] 輪詢失敗: %s", e, exc_info=True,
+                    error=type(e).__name__,
+                )
+
+            # 3. 排定下一次截止時間 (落後則略過錯過的週期)
+            deadline += period
+            now = time.monotonic()
+            if now > deadline:
+                missed = int((now - deadline) // period) + 1
+                self.missed_deadlines += missed
+                deadline += missed * period
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+
+"""
+測試共用設定:
+    • 模組皆以頂層名稱匯入 (同 camera_ground/XF 下的腳本) → 將上一層目錄加入 sys.path
+    • [simulator] 背景執行緒中的 GcuSimulator (測試結束時停止)
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gcu_simulator import GcuSimulator  # noqa: E402
+
+
+@pytest.fixture
+def simulator():
+    sim = GcuSimulator()
+    sim.start_in_thread()
+    yield sim
+    sim.stop_thread()
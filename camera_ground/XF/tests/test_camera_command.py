@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+"""camera_command / async_camera_command: 兩者共用 command_registry 的參數處理, 發送內容必須一致"""
+
+import asyncio
+import inspect
+
+import pytest
+
+import async_camera_command as acm
+import camera_command as cm
+from command_registry import PREBUILT_PACKETS, command_call, lookup
+
+
+class _Recorder:
+    width, height = 1920, 1080
+
+    def __init__(self):
+        self.calls = []
+
+    def send_packet(self, packet):
+        self.calls.append(('packet', packet))
+
+    def send_command(self, **kwargs):
+        self.calls.append(('command', kwargs))
+
+
+class _AsyncRecorder(_Recorder):
+    async def send_packet(self, packet):
+        super().send_packet(packet)
+
+    async def send_command(self, **kwargs):
+        super().send_command(**kwargs)
+
+
+def test_command_call_maps_positional_and_keyword_arguments():
+    spec = lookup('control_gimbal')
+    assert command_call(spec, (1.0, 2.0)) == (0x00, b'', {'pitch': 1.0, 'yaw': 2.0})
+    assert command_call(spec, (1.0,), {'yaw': 2.0}) == (0x00, b'', {'pitch': 1.0, 'yaw': 2.0})
+    with pytest.raises(TypeError):
+        command_call(spec, (1.0,))
+    with pytest.raises(TypeError):
+        command_call(lookup('photo'), (1,))
+
+
+def test_sync_and_async_commands_send_the_same_calls():
+    calls = [
+        ('photo', (), {}),
+        ('control_gimbal', (1.5,), {'yaw': -3.0}),
+        ('track_out', (1, 2, 3, 4), {}),
+    ]
+    sync, asynchronous = _Recorder(), _AsyncRecorder()
+    for name, args, kwargs in calls:
+        cm.COMMAND_FUNCTIONS[name](sync, *args, **kwargs)
+
+    async def run():
+        for name, args, kwargs in calls:
+            await acm.COMMAND_FUNCTIONS[name](asynchronous, *args, **kwargs)
+    asyncio.run(run())
+
+    assert sync.calls == asynchronous.calls
+    assert sync.calls[0] == ('packet', PREBUILT_PACKETS['photo'])
+    assert sync.calls[2] == ('command', dict(
+        command=0x17, parameters=b'\x01\x00', enable_request=True, x0=1, y0=2, x1=3, y1=4,
+    ))
+
+
+def test_command_functions_keep_their_signature():
+    assert str(inspect.signature(cm.track_in)) == '(controller, x0, y0, x1, y1)'
+    assert str(inspect.signature(acm.control_gimbal)) == '(controller, pitch, yaw)'
+    assert cm.photo.spec.name == 'photo'
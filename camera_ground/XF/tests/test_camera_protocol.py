@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+
+"""camera_protocol: 查表 CRC 必須與原本的 4-bit 查表實作 完全一致"""
+
+import random
+
+import pytest
+
+from camera_protocol import (
+    build_packet, calculate_crc, calculate_crc_batch, verify_crc
+)
+
+
+# ------------------------------------------------------------------------------------ #
+# 原本的實作 (4-bit 查表, 每 byte 分高低 4 位元計算) → 作為比對基準
+# ------------------------------------------------------------------------------------ #
+_NIBBLE_TABLE = [
+    0x0000, 0x1021, 0x2042, 0x3063,
+    0x4084, 0x50A5, 0x60C6, 0x70E7,
+    0x8108, 0x9129, 0xA14A, 0xB16B,
+    0xC18C, 0xD1AD, 0xE1CE, 0xF1EF,
+]
+
+
+def reference_crc(data: bytes, crc: int = 0) -> int:
+    for byte in data:
+        crc = ((crc << 4) ^ _NIBBLE_TABLE[(crc >> 12) ^ (byte >> 4)]) & 0xFFFF
+        crc = ((crc << 4) ^ _NIBBLE_TABLE[(crc >> 12) ^ (byte & 0x0F)]) & 0xFFFF
+    return crc
+
+
+def random_frames(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    return [
+        bytes(rng.getrandbits(8) for _ in range(rng.randrange(0, 300)))
+        for _ in range(count)
+    ]
+
+
+# 所有 build_packet 會產生的封包種類
+PACKET_SHAPES = [
+    dict(command=0x00),
+    dict(command=0x00, enable_request=True),
+    dict(command=0x00, enable_request=True, pitch=-45.5, yaw=120.25),
+    dict(command=0x00, enable_request=False, pitch=0.0, yaw=-179.99),
+    dict(command=0x03, parameters=b'\x01'),
+    dict(command=0x20, enable_request=True),
+    dict(command=0x81, parameters=b'\x01', enable_request=True),
+    dict(command=0x17, parameters=b'\x01\x01', enable_request=True,
+         x0=100, y0=200, x1=300, y1=400, width=1920, height=1080),
+    dict(command=0x17, parameters=b'\x01\x00',
+         x0=0, y0=0, x1=1919, y1=1079, width=1920, height=1080),
+    dict(command=0x1A, parameters=b'\x01', enable_request=True,
+         x0=960, y0=540, x1=960, y1=540, width=1920, height=1080),
+]
+
+
+# ------------------------------------------------------------------------------------ #
+# calculate_crc
+# ------------------------------------------------------------------------------------ #
+def test_crc_matches_reference_on_random_data():
+    for frame in random_frames(500):
+        assert calculate_crc(frame) == reference_crc(frame)
+
+
+def test_crc_accepts_bytearray_and_memoryview():
+    frame = random_frames(1, seed=1)[0] + b'\xA8\xE5'
+    expected = reference_crc(frame)
+    assert calculate_crc(bytearray(frame)) == expected
+    assert calculate_crc(memoryview(frame)) == expected
+
+
+@pytest.mark.parametrize('shape', PACKET_SHAPES)
+def test_crc_matches_reference_on_packets(shape):
+    packet = build_packet(**shape)
+    crc = reference_crc(packet[:-2])
+    assert packet[-2:] == crc.to_bytes(2, 'big')
+    assert calculate_crc(packet[:-2]) == crc
+
+
+def test_crc_resumes_from_saved_state():
+    for frame in random_frames(200, seed=2):
+        split = len(frame) // 3
+        state = calculate_crc(frame[:split])
+        assert state == reference_crc(frame[:split])
+        assert calculate_crc(frame[split:], state) == reference_crc(frame)
+
+
+def test_crc_resumes_from_nonzero_initial_state():
+    rng = random.Random(3)
+    for frame in random_frames(200, seed=3):
+        initial = rng.randrange(1, 0x10000)
+        assert calculate_crc(frame, initial) == reference_crc(frame, initial)
+
+
+# ------------------------------------------------------------------------------------ #
+# calculate_crc_batch
+# ------------------------------------------------------------------------------------ #
+def test_crc_batch_matches_single():
+    frames = random_frames(100, seed=4)
+    assert calculate_crc_batch(frames) == [reference_crc(frame) for frame in frames]
+    assert calculate_crc_batch(iter(frames), 0x1D0F) == [
+        reference_crc(frame, 0x1D0F) for frame in frames
+    ]
+    assert calculate_crc_batch([]) == []
+
+
+# ------------------------------------------------------------------------------------ #
+# verify_crc
+# ------------------------------------------------------------------------------------ #
+@pytest.mark.parametrize('shape', PACKET_SHAPES)
+def test_verify_crc_accepts_built_packets(shape):
+    assert verify_crc(build_packet(**shape))
+
+
+def test_verify_crc_rejects_flipped_bit():
+    packet = build_packet(0x00, enable_request=True, pitch=10.0, yaw=20.0)
+    for index in range(len(packet)):
+        for bit in range(8):
+            corrupted = bytearray(packet)
+            corrupted[index] ^= 1 << bit
+            assert not verify_crc(bytes(corrupted))
+
+
+def test_verify_crc_rejects_short_input():
+    assert not verify_crc(b'')
+    assert not verify_crc(b'\x00')
+
+
+# ------------------------------------------------------------------------------------ #
+# build_packet 模板快取: 必須與逐欄組包的結果 逐 byte 相同
+# ------------------------------------------------------------------------------------ #
+def reference_packet(
+    command, parameters=None, enable_request=None,
+    pitch=None, yaw=None, x0=None, y0=None, x1=None, y1=None,
+    width=None, height=None,
+) -> bytes:
+    """原本的 build_packet (每次從頭組包)"""
+    main_frame = bytearray(32)
+    if enable_request:
+        main_frame[25] = 0x01
+    payload = bytearray(b'\xA8\xE5' + b'\x00\x00' + b'\x02' + main_frame + bytes(32))
+    parameters = parameters or b''
+
+    if command == 0x00 and (pitch is not None or yaw is not None):
+        payload[5:7] = (0).to_bytes(2, 'little', signed=True)
+        payload[7:9] = int(pitch * 100).to_bytes(2, 'little', signed=True)
+        payload[9:11] = int(yaw * 100).to_bytes(2, 'little', signed=True)
+        payload[11] = 0x04
+
+    valid_params = {0x17: (b'\x01\x01', b'\x01\x00'), 0x1A: (b'\x01',)}.get(command)
+    if valid_params and parameters in valid_params and None not in (x0, y0, x1, y1):
+        coords = (
+            int(x0 / width * 10000), int(y0 / height * 10000),
+            int(x1 / width * 10000), int(y1 / height * 10000),
+        )
+        parameters = parameters + b''.join(c.to_bytes(2, 'little') for c in coords)
+
+    payload += command.to_bytes(1, 'little') + parameters
+    payload[2:4] = (len(payload) + 2).to_bytes(2, 'little')
+    payload += reference_crc(payload).to_bytes(2, 'big')
+    return bytes(payload)
+
+
+@pytest.mark.parametrize('shape', PACKET_SHAPES)
+def test_build_packet_matches_reference(shape):
+    expected = reference_packet(**shape)
+    # 第 1 次建立模板, 第 2 次使用快取
+    assert build_packet(**shape) == expected
+    assert build_packet(**shape) == expected
+
+
+def test_cached_angle_template_fills_new_values():
+    rng = random.Random(5)
+    for _ in range(200):
+        pitch = round(rng.uniform(-90.0, 30.0), 2)
+        yaw = round(rng.uniform(-180.0, 180.0), 2)
+        for enable_request in (True, False):
+            assert build_packet(
+                0x00, enable_request=enable_request, pitch=pitch, yaw=yaw
+            ) == reference_packet(
+                0x00, enable_request=enable_request, pitch=pitch, yaw=yaw
+            )
+
+
+def test_cached_box_template_fills_new_values():
+    rng = random.Random(6)
+    for _ in range(200):
+        x0, x1 = sorted(rng.randrange(1920) for _ in range(2))
+        y0, y1 = sorted(rng.randrange(1080) for _ in range(2))
+        shape = dict(
+            command=0x17, parameters=b'\x01\x01', enable_request=True,
+            x0=x0, y0=y0, x1=x1, y1=y1, width=1920, height=1080,
+        )
+        assert build_packet(**shape) == reference_packet(**shape)
+
+
+def test_fixed_packet_is_immutable_bytes():
+    packet = build_packet(0x20, enable_request=True)
+    assert isinstance(packet, bytes)
+    assert build_packet(0x20, enable_request=True) is packet
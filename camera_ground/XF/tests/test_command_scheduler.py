@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+"""PriorityCommandScheduler: 退出跟蹤 (模式切換) 不可被移動指令的期限 / 插隊丟棄"""
+
+import time
+
+import camera_command as cm
+from camera_protocol import build_packet
+from command_registry import PRIORITY_CONTROL, PRIORITY_MOTION, packet_priority
+from command_scheduler import PriorityCommandScheduler
+from gcu_controller import GCUController
+
+
+def test_track_out_is_a_control_command():
+    box = dict(x0=10, y0=10, x1=50, y1=50, width=1920, height=1080)
+    assert packet_priority(build_packet(0x17, b'\x01\x00', True, **box)) == PRIORITY_CONTROL
+    assert packet_priority(build_packet(0x17, b'\x01\x01', True, **box)) == PRIORITY_MOTION
+
+
+def test_track_out_survives_slow_link_and_preemption(simulator):
+    simulator.latency = 0.1
+    controller = GCUController('127.0.0.1', simulator.port, 1920, 1080, timeout=1.0)
+    controller.connect()
+    try:
+        with PriorityCommandScheduler(controller) as scheduler:
+            # 前方有 1 個慢速往返 → 移動等級的期限 (0.25s) 已過; 接著 reset 插隊
+            scheduler.submit(cm.photo)
+            time.sleep(0.01)
+            scheduler.submit(cm.track_out, 10, 10, 50, 50)
+            time.sleep(0.3)
+            scheduler.submit(cm.reset)
+
+            deadline = time.monotonic() + 3.0
+            while scheduler.pending() and time.monotonic() < deadline:
+                time.sleep(0.02)
+            time.sleep(0.3)
+
+            stats = scheduler.stats()
+            assert stats['control']['sent'] == 2
+            assert scheduler.dropped_count == 0
+    finally:
+        controller.disconnect()
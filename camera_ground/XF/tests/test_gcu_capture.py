@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+"""gcu_capture: 管線模式下 TX 必定記錄在它引發的 RX 之前"""
+
+import socket
+
+import pytest
+
+from gcu_capture import RX, TX, TX_FAILED, GcuCapture, GcuRecorder
+from gcu_controller import GCUController
+from gcu_transport import GcuTransport
+
+
+def test_tx_precedes_its_reply(simulator, tmp_path):
+    path = str(tmp_path / 'pipelined.gcap')
+    with GcuRecorder(path) as recorder:
+        controller = GCUController(
+            '127.0.0.1', simulator.port, 1920, 1080,
+            timeout=1.0, pipelined=True, recorder=recorder,
+        )
+        controller.connect()
+        try:
+            futures = [
+                controller.submit_command(0x00, enable_request=True, pitch=0.1, yaw=0.0)
+                for _ in range(200)
+            ]
+            for future in futures:
+                future.result(2.0)
+        finally:
+            controller.disconnect()
+
+    with GcuCapture(path) as capture:
+        records = list(capture)
+    outstanding = 0
+    for record in records:
+        outstanding += 1 if record.direction == TX else -1
+        assert outstanding >= 0
+    assert [r.timestamp for r in records] == sorted(r.timestamp for r in records)
+    assert sum(r.direction == RX for r in records) == 200
+
+
+def test_failed_send_is_marked(tmp_path):
+    path = str(tmp_path / 'failed.gcap')
+    with GcuRecorder(path) as recorder:
+        transport = GcuTransport('127.0.0.1', 1, 0.1, recorder=recorder)
+
+        # 對方已關閉的 socket → sendall 拋出 BrokenPipeError
+        transport.sock, peer = socket.socketpair()
+        peer.close()
+        try:
+            with pytest.raises(OSError):
+                transport.sendall(b'\xA8\xE5packet')
+        finally:
+            transport.sock.close()
+
+    with GcuCapture(path) as capture:
+        assert [r.direction for r in capture] == [TX, TX_FAILED]
+        assert capture.summary()['tx_failed'] == 1
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+
+"""GCUController 管線模式: 逾時後 遲到的回覆 不可錯配給下一個指令"""
+
+import time
+
+import pytest
+
+from gcu_controller import GCUController
+from camera_decoder import decode_telemetry
+from camera_protocol import build_packet
+
+
+def test_late_reply_is_not_paired_with_next_command(simulator):
+    simulator.latency = 0.8
+    controller = GCUController(
+        '127.0.0.1', simulator.port, 1920, 1080,
+        timeout=0.3, pipelined=True, liveness_timeout=5.0,
+    )
+    controller.connect()
+    try:
+        # 1. 回覆晚於 timeout → f1 逾時
+        f1 = controller.submit_command(0x00, enable_request=True, pitch=10.0, yaw=0.0)
+        with pytest.raises(TimeoutError):
+            f1.result(2.0)
+
+        # 2. f1 的回覆 (pitch 10) 即將到達時 發送 f2 → f2 必須拿到自己的回覆 (pitch 15)
+        time.sleep(0.4)
+        simulator.latency = 0.0
+        f2 = controller.submit_command(0x00, enable_request=True, pitch=5.0, yaw=0.0)
+        telemetry = decode_telemetry(f2.result(2.0))
+        assert telemetry.pitchangle == pytest.approx(15.0)
+
+        # 3. 遲到的回覆 由 f1 的位置消耗, 不算沒有對應指令的回覆
+        time.sleep(0.1)
+        assert controller.unsolicited_replies == 0
+        assert not controller._pending
+    finally:
+        controller.disconnect()
+
+
+def test_pipelined_replies_refresh_telemetry_cache(simulator):
+    controller = GCUController(
+        '127.0.0.1', simulator.port, 1920, 1080, timeout=1.0, pipelined=True,
+    )
+    controller.connect()
+    try:
+        futures = [
+            controller.submit_command(0x00, enable_request=True, pitch=1.0, yaw=0.0)
+            for _ in range(3)
+        ]
+        for future in futures:
+            future.result(2.0)
+
+        # 管線模式的回覆 已更新快取 → 不必再發送空命令
+        received = simulator.packets_received
+        cached = controller.telemetry_snapshot(max_age=1.0)
+        assert cached is not None
+        assert cached.telemetry.pitchangle == pytest.approx(3.0)
+        assert controller.telemetry_misses == 0
+        assert simulator.packets_received == received
+    finally:
+        controller.disconnect()
+
+
+def test_late_decode_does_not_overwrite_newer_cache(simulator):
+    controller = GCUController(
+        '127.0.0.1', simulator.port, 1920, 1080, timeout=1.0, pipelined=True,
+    )
+    controller.connect()
+    try:
+        f1 = controller.submit_command(0x00, enable_request=True, pitch=1.0, yaw=0.0)
+        f2 = controller.submit_command(0x00, enable_request=True, pitch=2.0, yaw=0.0)
+        first, second = f1.result(2.0), f2.result(2.0)
+
+        # A 的等待者 在 B 到達之後才解碼 (同 send_command 的流程)
+        assert controller._decode_response(first, 0x00).pitchangle == pytest.approx(1.0)
+        cached = controller.telemetry_snapshot(max_age=1.0)
+        assert cached.telemetry.pitchangle == pytest.approx(3.0)
+        assert controller.telemetry_misses == 0
+        assert controller._decode_response(second, 0x00) == cached.telemetry
+    finally:
+        controller.disconnect()
+
+
+@pytest.mark.parametrize('pipelined', [False, True])
+def test_frames_without_reply_request_do_not_wait(simulator, pipelined):
+    controller = GCUController(
+        '127.0.0.1', simulator.port, 1920, 1080, timeout=0.5, pipelined=pipelined,
+    )
+    controller.connect()
+    try:
+        # enable_request 預設為 None → GCU 不回覆
+        started = time.monotonic()
+        assert controller.send_command(0x00, pitch=1.0, yaw=0.0) == b''
+        assert time.monotonic() - started < 0.25
+
+        # 之後的回覆 仍對應到正確的指令
+        response = controller.send_command(0x00, b'', True, pitch=2.0, yaw=0.0)
+        assert decode_telemetry(response).pitchangle == pytest.approx(3.0)
+        results = controller.send_batch([
+            build_packet(0x00, b'', False, pitch=1.0, yaw=0.0),
+            build_packet(0x00, b'', True, pitch=1.0, yaw=0.0),
+        ])
+        assert results[0] is None
+        assert results[1].pitchangle == pytest.approx(5.0)
+        assert controller.unsolicited_replies == 0
+    finally:
+        controller.disconnect()
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+"""GcuFleet: 多台雲台的 發送佇列 / 廣播 / 斷線處理"""
+
+import socket
+import time
+
+import pytest
+
+from camera_decoder import decode_telemetry
+from gcu_fleet import GcuFleet
+from gcu_simulator import GcuSimulator
+
+
+@pytest.fixture
+def simulators():
+    sims = [GcuSimulator(), GcuSimulator()]
+    for sim in sims:
+        sim.start_in_thread()
+    yield sims
+    for sim in sims:
+        sim.stop_thread()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_until(condition, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_each_link_keeps_its_own_command_queue(simulators):
+    with GcuFleet(timeout=1.0) as fleet:
+        for name, sim in zip('ab', simulators):
+            fleet.add(name, '127.0.0.1', sim.port, 1920, 1080, groups=['all'])
+
+        # 每台依序累加角度 → 回覆順序必須與該台的發送順序一致
+        futures = {
+            name: [
+                fleet.submit(name, 0x00, b'', True, pitch=step, yaw=0.0)
+                for _ in range(20)
+            ]
+            for name, step in (('a', 1.0), ('b', -0.5))
+        }
+        for name, step in (('a', 1.0), ('b', -0.5)):
+            pitches = [
+                decode_telemetry(future.result(2.0)).pitchangle
+                for future in futures[name]
+            ]
+            assert pitches == pytest.approx([step * (i + 1) for i in range(20)])
+            assert fleet.latest(name).telemetry.pitchangle == pytest.approx(step * 20)
+            assert fleet.queued(name) == 0
+        assert fleet.unsolicited_replies == 0
+        assert [sim.packets_received for sim in simulators] == [20, 20]
+
+
+def test_broadcast_reaches_every_link_in_group(simulators):
+    with GcuFleet(timeout=1.0) as fleet:
+        fleet.add('a', '127.0.0.1', simulators[0].port, 1920, 1080, groups=['front'])
+        fleet.add('b', '127.0.0.1', simulators[1].port, 1920, 1080)
+        assert wait_until(lambda: all(link.ready for link in fleet._links.values()))
+
+        futures = fleet.broadcast(0x00, b'', True, group='front', pitch=5.0, yaw=0.0)
+        assert set(futures) == {'a'}
+        assert decode_telemetry(futures['a'].result(2.0)).pitchangle == pytest.approx(5.0)
+
+        futures = fleet.broadcast(0x03, b'\x01', True)
+        assert set(futures) == {'a', 'b'}
+        for future in futures.values():
+            telemetry = decode_telemetry(future.result(2.0))
+            assert (telemetry.pitchangle, telemetry.yawangle) == (0.0, 0.0)
+        assert [sim.packets_received for sim in simulators] == [2, 1]
+
+
+def test_failed_commands_are_not_sent_after_reconnect():
+    port = free_port()
+    with GcuFleet(timeout=0.3, backoff_max=0.6) as fleet:
+        fleet.add('a', '127.0.0.1', port, 1920, 1080)
+        link = fleet._links['a']
+
+        # 1. 連線失敗 → 等待重連 (0.5s) 期間送出的指令 逾時失敗
+        assert wait_until(lambda: link.retry_at > 0 and link.sock is None)
+        future = fleet.submit('a', 0x20, b'', True)
+        with pytest.raises(TimeoutError):
+            future.result(2.0)
+
+        # 2. 之後 GCU 恢復 → 重連後 不可再送出已失敗的指令
+        sim = GcuSimulator(port=port)
+        sim.start_in_thread()
+        try:
+            assert wait_until(lambda: link.ready, timeout=3.0)
+            time.sleep(0.2)
+            assert sim.packets_received == 0
+            assert fleet.unsolicited_replies == 0
+
+            # 3. 新指令 正常收到回覆
+            assert fleet.send_command('a', 0x00, b'', True, pitch=1.0, yaw=0.0)
+            assert sim.packets_received == 1
+        finally:
+            sim.stop_thread()
+
+
+
+def test_frames_without_reply_request_resolve_immediately(simulators):
+    with GcuFleet(timeout=1.0) as fleet:
+        fleet.add('a', '127.0.0.1', simulators[0].port, 1920, 1080)
+        assert fleet.submit('a', 0x00, b'', False, pitch=1.0, yaw=0.0).result(1.0) == b''
+        response = fleet.send_command('a', 0x00, b'', True, pitch=1.0, yaw=0.0)
+        assert decode_telemetry(response).pitchangle == pytest.approx(2.0)
+        assert fleet.unsolicited_replies == 0
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+"""gcu_stream: TCP 分段 / 黏包 / 雜訊 皆須重組出相同的封包"""
+
+import random
+import socket
+
+import pytest
+
+from gcu_simulator import GimbalState
+from gcu_stream import GcuFrameBuffer, GcuStreamReader
+
+
+def make_responses(count: int):
+    state = GimbalState()
+    responses = []
+    for i in range(count):
+        state.pitch = -i * 0.5
+        state.yaw = i * 1.25
+        responses.append(state.to_response())
+    return responses
+
+
+def split_randomly(data: bytes, seed: int):
+    rng = random.Random(seed)
+    chunks, offset = [], 0
+    while offset < len(data):
+        size = rng.randrange(1, 100)
+        chunks.append(data[offset:offset + size])
+        offset += size
+    return chunks
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 71, 72, 73, 500])
+def test_fixed_size_fragments(chunk_size):
+    responses = make_responses(20)
+    stream = b''.join(responses)
+    frame_buffer = GcuFrameBuffer()
+    frames = []
+    for offset in range(0, len(stream), chunk_size):
+        frames.extend(frame_buffer.parse(stream[offset:offset + chunk_size]))
+    assert frames == responses
+    assert len(frame_buffer) == 0
+
+
+def test_random_fragments():
+    responses = make_responses(200)
+    frame_buffer = GcuFrameBuffer()
+    frames = []
+    for chunk in split_randomly(b''.join(responses), seed=0):
+        frames.extend(frame_buffer.parse(chunk))
+    assert frames == responses
+
+
+def test_coalesced_frames_larger_than_buffer():
+    responses = make_responses(200)
+    frame_buffer = GcuFrameBuffer(capacity=1024)
+    assert list(frame_buffer.parse(b''.join(responses))) == responses
+
+
+def test_resync_after_noise_and_corrupted_frame():
+    responses = make_responses(3)
+    corrupted = bytearray(responses[1])
+    corrupted[10] ^= 0xFF
+    stream = b'\x00\x8A\x12' + responses[0] + bytes(corrupted) + b'\x8A' + responses[2]
+
+    frame_buffer = GcuFrameBuffer()
+    frames = []
+    for chunk in split_randomly(stream, seed=1):
+        frames.extend(frame_buffer.parse(chunk))
+    assert frames == [responses[0], responses[2]]
+    assert frame_buffer.crc_errors >= 1
+
+
+def test_stream_reader_over_socket():
+    responses = make_responses(50)
+    left, right = socket.socketpair()
+    try:
+        for chunk in split_randomly(b''.join(responses), seed=2):
+            left.sendall(chunk)
+        left.shutdown(socket.SHUT_WR)
+
+        reader = GcuStreamReader(right)
+        assert [reader.read_frame() for _ in responses] == responses
+        with pytest.raises(ConnectionError):
+            reader.read_frame()
+    finally:
+        left.close()
+        right.close()
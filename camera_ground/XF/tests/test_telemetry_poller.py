@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+"""TelemetryPoller: 各種例外分別計數, 輪詢執行緒不可因例外結束"""
+
+import concurrent.futures
+import time
+
+from camera_decoder import GcuDecodeError, GcuTelemetry
+from gcu_controller import CachedTelemetry
+from gcu_transport import CommandDroppedError
+from telemetry_poller import TelemetryPoller
+
+
+class ScriptedController:
+    """依序拋出 / 回傳 script 中的項目, 用完後回傳固定的雲台資訊"""
+
+    def __init__(self, script):
+        self.script = list(script)
+        self.telemetry = CachedTelemetry(0.0, GcuTelemetry(0.0, 1.0, 2.0, 0.0, 1.0))
+
+    def telemetry_snapshot(self, max_age):
+        if self.script:
+            item = self.script.pop(0)
+            if isinstance(item, BaseException):
+                raise item
+            return item
+        return self.telemetry
+
+
+def test_poll_once_counts_each_error_type():
+    poller = TelemetryPoller(ScriptedController([
+        TimeoutError("shaper"),
+        concurrent.futures.TimeoutError(),
+        CommandDroppedError("dropped"),
+        ConnectionError("reconnecting"),
+        GcuDecodeError("bad header"),
+        None,
+    ]))
+    for _ in range(6):
+        assert poller.poll_once() is None
+    assert poller.timeouts == 2
+    assert poller.dropped == 1
+    assert poller.send_errors == 1
+    assert poller.decode_errors == 2
+    assert poller.poll_once() is not None
+    assert poller.polls == 1
+
+
+def test_poller_thread_survives_unexpected_errors():
+    controller = ScriptedController([RuntimeError("boom"), ValueError("bad")])
+    with TelemetryPoller(controller, rate_hz=200.0) as poller:
+        deadline = time.monotonic() + 2.0
+        while poller.latest() is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert poller._thread.is_alive()
+    assert poller.errors == 2
+    assert poller.latest() is not None
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+"""TrackBoxStreamer: 去重 / 取代 / 頻率上限 的統計, 以及發送例外不可讓執行緒結束"""
+
+import time
+
+import pytest
+
+from gcu_controller import GCUController
+from track_streamer import TrackBoxStreamer
+
+
+@pytest.fixture
+def controller(simulator):
+    controller = GCUController('127.0.0.1', simulator.port, 1920, 1080, timeout=1.0)
+    controller.connect()
+    yield controller
+    controller.disconnect()
+
+
+def _wait_idle(streamer, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while streamer._latest is not None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.15)
+
+
+def test_small_changes_are_deduped(simulator, controller):
+    with TrackBoxStreamer(controller, min_change=4, max_rate_hz=100.0) as streamer:
+        for box in [(100, 100, 200, 200), (102, 101, 199, 203), (110, 100, 200, 200)]:
+            streamer.update(*box)
+            _wait_idle(streamer)
+
+    assert streamer.sent == 2
+    assert streamer.deduped == 1
+    assert streamer.last_sent == (110, 100, 200, 200)
+    assert simulator.packets_received == 2
+
+
+def test_rate_cap_supersedes_pending_boxes(simulator, controller):
+    rate, duration = 10.0, 0.5
+    with TrackBoxStreamer(controller, min_change=1, max_rate_hz=rate) as streamer:
+        started = time.monotonic()
+        step = 0
+        while time.monotonic() - started < duration:
+            step += 1
+            streamer.update(step * 10, 0, step * 10 + 50, 50)
+            time.sleep(0.005)
+        _wait_idle(streamer)
+
+    assert streamer.updates == step
+    assert streamer.sent <= rate * duration + 2
+    assert streamer.sent + streamer.superseded + streamer.deduped == streamer.updates
+    assert streamer.superseded > 0
+    assert streamer.last_sent == (step * 10, 0, step * 10 + 50, 50)
+    assert simulator.packets_received == streamer.sent
+
+
+def test_unexpected_errors_are_counted_and_streaming_continues(controller):
+    class _Flaky:
+        calls = 0
+
+        def send_command(self, *args, **kwargs):
+            _Flaky.calls += 1
+            if _Flaky.calls == 1:
+                raise ValueError("unexpected")
+            return controller.send_command(*args, **kwargs)
+
+    with TrackBoxStreamer(_Flaky(), max_rate_hz=100.0) as streamer:
+        streamer.update(0, 0, 50, 50)
+        _wait_idle(streamer)
+        streamer.update(0, 0, 50, 50)
+        _wait_idle(streamer)
+        assert streamer._thread.is_alive()
+
+    assert streamer.errors == 1
+    assert streamer.sent == 1
+    assert streamer.last_sent == (0, 0, 50, 50)
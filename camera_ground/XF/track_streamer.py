@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+File   : track_streamer.py
+Author : FantasyWilly
+Email  : bc697522h04@gmail.com
+SPDX-License-Identifier: Apache-2.0
+
+開發公司:
+    • 先飛科技 (XF)
+
+功能總覽:
+    • 連續更新跟蹤框 (例如 本機目標偵測 每張畫面的結果) → track_in (0x17)
+    • 只保留最新一筆 (送出前被新框取代的舊框 直接丟棄, 不排隊)
+    • 與上次送出的框 差異小於門檻 → 不送
+    • 限制發送頻率, 且同時只有 1 個指令在途 (不超過連線能負擔的速度)
+
+遵循:
+    • Google Python Style Guide (含區段標題)
+    • PEP 8 (行寬 ≤ 88, snake_case, 2 空行區段分隔)
+"""
+
+# ------------------------------------------------------------------------------------ #
+# Imports
+# ------------------------------------------------------------------------------------ #
+# 標準庫
+import logging
+import threading
+import time
+from typing import Iterable, Optional, Tuple
+
+# 專案內部模組
+from command_registry import COMMANDS
+from gcu_controller import GCUController
+from gcu_logging import get_logger, log_event
+
+
+_log = get_logger('track_streamer')
+
+
+Box = Tuple[int, int, int, int]
+
+# 跟蹤框指令 (同 camera_command.track_in / track_out)
+TRACK_COMMAND    = COMMANDS['track_in'].code
+TRACK_IN_PARAMS  = COMMANDS['track_in'].parameters
+TRACK_OUT_PARAMS = COMMANDS['track_out'].parameters
+
+
+# ------------------------------------------------------------------------------------ #
+# [TrackBoxStreamer] 跟蹤框串流發送
+# ------------------------------------------------------------------------------------ #
+class TrackBoxStreamer:
+    """
+    - 說明 [TrackBoxStreamer]
+        1. [update] 只替換 最新待送框 後立即返回 (偵測迴圈不會被阻塞)
+        2. 背景執行緒 取出最新框:
+            • 與上次送出的框 每個座標差異都 < min_change → 丟棄 (deduped)
+            • 距上次發送未滿 1 / max_rate_hz → 等待 (期間的新框繼續取代舊框)
+        3. 每次發送都等待回覆後才送下一筆 → 速度自動受限於連線往返時間
+
+    args:
+        • controller (GCUController)    - 已連線的 GCU 控制器
+        • min_change (int)              - 座標變化門檻 (像素, default: 4)
+        • max_rate_hz (float)           - 最高發送頻率 (default: 20 Hz)
+    """
+
+    def __init__(
+        self,
+        controller: GCUController,
+        min_change: int = 4,
+        max_rate_hz: float = 20.0,
+    ) -> None:
+
+        if max_rate_hz <= 0:
+            raise ValueError("max_rate_hz 必須大於 0")
+
+        # 接收參數
+        self.controller   = controller
+        self.min_change   = min_change
+        self.min_interval = 1.0 / max_rate_hz
+
+        # 最新待送框 (None → 沒有新框) & 上次送出的框
+        self._cond = threading.Condition()
+        self._latest: Optional[Box] = None
+        self._stop_request = False
+        self.last_sent: Optional[Box] = None
+        self._last_send_time = float('-inf')
+
+        # 執行緒
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+        # 統計
+        self.updates    = 0
+        self.sent       = 0
+        self.deduped    = 0
+        self.superseded = 0
+        self.errors     = 0
+
+    # ----------------------------------- 啟動 / 停止 --------------------------------- #
+    def start(self) -> None:
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name="gcu-track-streamer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = None) -> None:
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def __enter__(self) -> "TrackBoxStreamer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    # ----------------------------------- 更新 跟蹤框 --------------------------------- #
+    def update(self, x0: int, y0: int, x1: int, y1: int) -> None:
+        """
+        - 說明 [update] 放入最新的跟蹤框 (像素座標), 取代尚未送出的舊框
+        """
+        with self._cond:
+            if self._latest is not None:
+                self.superseded += 1
+            self._latest = (int(x0), int(y0), int(x1), int(y1))
+            self._stop_request = False
+            self.updates += 1
+            self._cond.notify()
+
+    def stream(self, boxes: Iterable[Optional[Box]]) -> None:
+        """
+        - 說明 [stream] 依序放入一連串跟蹤框 (None → 目標消失, 退出跟蹤)
+        """
+        for box in boxes:
+            if box is None:
+                self.stop_tracking()
+            else:
+                self.update(*box)
+
+    def stop_tracking(self) -> None:
+        """
+        - 說明 [stop_tracking] 丟棄待送框, 並發送 退出跟蹤 (track_out)
+        """
+        with self._cond:
+            if self._latest is not None:
+                self.superseded += 1
+            self._latest = None
+            self._stop_request = True
+            self._cond.notify()
+
+    # ----------------------------------- 是否需要發送 -------------------------------- #
+    def _changed(self, box: Box) -> bool:
+        last = self.last_sent
+        if last is None:
+            return True
+        return max(abs(a - b) for a, b in zip(box, last)) >= self.min_change
+
+    # ----------------------------------- 發送執行緒 ---------------------------------- #
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                # 1. 等待新框 / 退出跟蹤
+                while self._running and self._latest is None and not self._stop_request:
+                    self._cond.wait()
+                if not self._running:
+                    return
+
+                # 2. 頻率限制 (等待期間 新框會直接取代 self._latest)
+                delay = self._last_send_time + self.min_interval - time.monotonic()
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+
+                box, self._latest = self._latest, None
+                stop_request, self._stop_request = self._stop_request, False
+
+            # 3. 退出跟蹤
+            if stop_request and box is None:
+                if self.last_sent is not None:
+                    self._send(TRACK_OUT_PARAMS, self.last_sent)
+                    self.last_sent = None
+                continue
+
+            # 4. 差異太小 → 丟棄
+            if not self._changed(box):
+                self.deduped += 1
+                continue
+
+            if self._send(TRACK_IN_PARAMS, box):
+                self.last_sent = box
+
+    def _send(self, parameters: bytes, box: Box) -> bool:
+        self._last_send_time = time.monotonic()
+        x0, y0, x1, y1 = box
+        try:
+            self.controller.send_command(
+                TRACK_COMMAND, parameters, True, x0=x0, y0=y0, x1=x1, y1=y1
+            )
+        except Exception as e:
+            # 任何例外 (含解碼錯誤 / 指令被丟棄) 都不可讓發送執行緒結束
+            self.errors += 1
+            log_event(
+                _log, logging.WARNING, 'track_box_error',
+                "[TrackBoxStreamer] 發送跟蹤框失敗: %s", e, exc_info=True, box=box,
+            )
+            return False
+        self.sent += 1
+        return True